@@ -27,7 +27,7 @@ target_metadata = Base.metadata
 
 from app.core.config import settings
 
-config.set_main_option("sqlalchemy.url", settings.SQLALCHEMY_DATABASE_URI)
+config.set_main_option("sqlalchemy.url", str(settings.SQLALCHEMY_DATABASE_URI))
 
 
 def run_migrations_offline():
@@ -0,0 +1,50 @@
+"""Add composite indexes for owner listings and keyset pagination
+
+Revision ID: 3b9e1c7d2a4f
+Revises:
+Create Date: 2026-10-17 10:12:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b9e1c7d2a4f'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ("ix_report_owner_type_created", "report", ["owner_id", "type", "created_at", "id"]),
+    ("ix_report_owner_created", "report", ["owner_id", "created_at", "id"]),
+    ("ix_report_project_created", "report", ["research_project_id", "created_at", "id"]),
+    ("ix_researchproject_owner_created", "researchproject", ["owner_id", "created_at", "id"]),
+    ("ix_restaurantprofile_owner_created", "restaurantprofile", ["owner_id", "created_at", "id"]),
+]
+
+
+def indexes_on_existing_tables():
+    # The tables come from database.sql or initialize_database.py, which may
+    # not have run yet; tables created later get these indexes from the models
+    inspector = sa.inspect(op.get_bind())
+    return [index for index in INDEXES if inspector.has_table(index[1])]
+
+
+def upgrade():
+    # Build the indexes without locking the tables against writes on Postgres;
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns in indexes_on_existing_tables():
+            op.create_index(
+                name, table, columns, if_not_exists=True, postgresql_concurrently=True
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(indexes_on_existing_tables()):
+            op.drop_index(
+                name, table_name=table, if_exists=True, postgresql_concurrently=True
+            )
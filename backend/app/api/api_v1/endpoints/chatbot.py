@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI
 from app.core.config import settings
 from app.api import deps
 from app.models.user import User
+from app.services.chat_cache import chat_completion_cache
+from app.services.chat_stub import StubChatClient
 import logging
 import json
 import os
@@ -12,8 +15,21 @@ from fastapi.responses import StreamingResponse
 
 router = APIRouter()
 
-# Configure OpenAI
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY", settings.OPENAI_API_KEY))
+# Configure OpenAI with one pooled async HTTP client shared by all requests
+if settings.CHATBOT_PROVIDER == "stub":
+    client = StubChatClient(latency=settings.CHATBOT_STUB_LATENCY)
+else:
+    client = AsyncOpenAI(
+        api_key=os.getenv("OPENAI_API_KEY", settings.OPENAI_API_KEY),
+        timeout=settings.CHATBOT_REQUEST_TIMEOUT,
+        http_client=httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.CHATBOT_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.CHATBOT_MAX_KEEPALIVE_CONNECTIONS,
+            ),
+            timeout=settings.CHATBOT_REQUEST_TIMEOUT,
+        ),
+    )
 
 # Models
 class ChatMessage(BaseModel):
@@ -35,6 +51,51 @@ You have access to restaurant data, market trends, and location intelligence.
 Be concise, professional, and helpful. If you don't know something, say so and suggest how the user might find that information.
 """
 
+COMPLETION_PARAMS = {
+    "model": "gpt-4",  # or another appropriate model
+    "temperature": 0.7,
+    "max_tokens": 500,
+}
+
+def _build_messages(request: ChatRequest, current_user: Optional[User]) -> List[Dict[str, str]]:
+    """Build the OpenAI message list for a chat request"""
+    messages = [{"role": "system", "content": SYSTEM_PROMPT}]
+
+    # Add user context if available
+    if current_user:
+        user_context = f"The user is {current_user.full_name} with email {current_user.email}."
+        if current_user.subscription_tier:
+            user_context += f" They are on the {current_user.subscription_tier} tier."
+        messages.append({"role": "system", "content": user_context})
+
+    # Add restaurant context if available
+    if request.restaurant_profile_id:
+        # In a real implementation, you would fetch restaurant data here
+        restaurant_context = f"The user is asking about restaurant with ID {request.restaurant_profile_id}."
+        messages.append({"role": "system", "content": restaurant_context})
+
+    # Add user messages
+    for msg in request.messages:
+        messages.append({"role": msg.role, "content": msg.content})
+
+    return messages
+
+
+def _sse(content: str) -> str:
+    return f"data: {json.dumps({'content': content})}\n\n"
+
+
+def _get_cached_completion(messages: List[Dict[str, str]]) -> Optional[List[str]]:
+    if not settings.CHATBOT_CACHE_ENABLED:
+        return None
+    return chat_completion_cache.get(messages, COMPLETION_PARAMS)
+
+
+def _cache_completion(messages: List[Dict[str, str]], chunks: List[str]) -> None:
+    if settings.CHATBOT_CACHE_ENABLED and chunks:
+        chat_completion_cache.set(messages, COMPLETION_PARAMS, chunks)
+
+
 @router.post("/chat", response_model=ChatResponse)
 async def chat(
     request: ChatRequest,
@@ -45,35 +106,23 @@ async def chat(
     """
     try:
         # Prepare messages for OpenAI
-        messages = [{"role": "system", "content": SYSTEM_PROMPT}]
-
-        # Add user context if available
-        if current_user:
-            user_context = f"The user is {current_user.full_name} with email {current_user.email}."
-            if current_user.subscription_tier:
-                user_context += f" They are on the {current_user.subscription_tier} tier."
-            messages.append({"role": "system", "content": user_context})
+        messages = _build_messages(request, current_user)
 
-        # Add restaurant context if available
-        if request.restaurant_profile_id:
-            # In a real implementation, you would fetch restaurant data here
-            restaurant_context = f"The user is asking about restaurant with ID {request.restaurant_profile_id}."
-            messages.append({"role": "system", "content": restaurant_context})
-
-        # Add user messages
-        for msg in request.messages:
-            messages.append({"role": msg.role, "content": msg.content})
+        # Serve repeated questions from the completion cache
+        cached = _get_cached_completion(messages)
+        if cached is not None:
+            return ChatResponse(response="".join(cached), sources=None)
 
         # Call OpenAI API
-        response = client.chat.completions.create(
-            model="gpt-4",  # or another appropriate model
+        response = await client.chat.completions.create(
             messages=messages,
-            temperature=0.7,
-            max_tokens=500,
+            timeout=settings.CHATBOT_REQUEST_TIMEOUT,
+            **COMPLETION_PARAMS,
         )
 
         # Extract response
         ai_response = response.choices[0].message.content
+        _cache_completion(messages, [ai_response] if ai_response else [])
 
         return ChatResponse(
             response=ai_response,
@@ -88,6 +137,7 @@ async def chat(
 @router.post("/chat/stream", response_model=None)
 async def chat_stream(
     request: ChatRequest,
+    http_request: Request,
     current_user: User = Depends(deps.get_current_active_user_or_mock),
 ):
     """
@@ -95,45 +145,57 @@ async def chat_stream(
     """
     try:
         # Prepare messages for OpenAI
-        messages = [{"role": "system", "content": SYSTEM_PROMPT}]
-
-        # Add user context if available
-        if current_user:
-            user_context = f"The user is {current_user.full_name} with email {current_user.email}."
-            if current_user.subscription_tier:
-                user_context += f" They are on the {current_user.subscription_tier} tier."
-            messages.append({"role": "system", "content": user_context})
+        messages = _build_messages(request, current_user)
 
-        # Add restaurant context if available
-        if request.restaurant_profile_id:
-            # In a real implementation, you would fetch restaurant data here
-            restaurant_context = f"The user is asking about restaurant with ID {request.restaurant_profile_id}."
-            messages.append({"role": "system", "content": restaurant_context})
+        # Replay cached completions chunk by chunk
+        cached = _get_cached_completion(messages)
+        if cached is not None:
+            async def replay():
+                for content in cached:
+                    yield _sse(content)
+                yield _sse("[DONE]")
 
-        # Add user messages
-        for msg in request.messages:
-            messages.append({"role": msg.role, "content": msg.content})
+            return StreamingResponse(replay(), media_type="text/event-stream")
 
         # Call OpenAI API with streaming
-        response = client.chat.completions.create(
-            model="gpt-4",  # or another appropriate model
+        response = await client.chat.completions.create(
             messages=messages,
-            temperature=0.7,
-            max_tokens=500,
             stream=True,
+            timeout=settings.CHATBOT_REQUEST_TIMEOUT,
+            **COMPLETION_PARAMS,
         )
 
         # Return streaming response
         async def generate():
-            for chunk in response:
-                if hasattr(chunk.choices[0].delta, 'content') and chunk.choices[0].delta.content is not None:
-                    content = chunk.choices[0].delta.content
-                    if content:
-                        yield f"data: {json.dumps({'content': content})}\n\n"
-            yield f"data: {json.dumps({'content': '[DONE]'})}\n\n"
+            chunks = []
+            try:
+                async for chunk in response:
+                    # Stop paying for tokens nobody will read
+                    if await http_request.is_disconnected():
+                        return
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        content = chunk.choices[0].delta.content
+                        chunks.append(content)
+                        yield _sse(content)
+                # Only complete completions are cached
+                _cache_completion(messages, chunks)
+                yield _sse("[DONE]")
+            finally:
+                # Closes the upstream connection on completion, disconnect or cancellation
+                await response.close()
 
         return StreamingResponse(generate(), media_type="text/event-stream")
 
     except Exception as e:
         logging.error(f"Error in chatbot streaming: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error processing chat request: {str(e)}")
+
+
+@router.get("/cache/stats", response_model=Dict[str, Any])
+def read_cache_stats(
+    current_user: User = Depends(deps.get_current_active_superuser),
+):
+    """
+    Get hit/miss counters for the chat completion cache
+    """
+    return chat_completion_cache.stats()
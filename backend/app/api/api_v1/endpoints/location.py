@@ -4,11 +4,15 @@ from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
 from app.api import deps
+from app.core.cache import get_cache_stats
+from app.core.config import settings
+from app.services.location_cache import cached_location_call
 from app.services.location_intelligence import (
     get_location_data,
     get_nearby_competitors,
     get_foot_traffic,
-    get_demographic_data
+    get_demographic_data,
+    score_locations,
 )
 
 router = APIRouter()
@@ -26,12 +30,38 @@ def analyze_location(
     Analyze a location based on coordinates.
     """
     try:
-        location_data = get_location_data(latitude, longitude, radius)
+        location_data = cached_location_call("analyze", get_location_data, latitude, longitude, radius)
         return location_data
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error analyzing location: {str(e)}")
 
 
+@router.post("/analyze/batch", response_model=Dict[str, Any])
+def analyze_locations_batch(
+    *,
+    batch_in: schemas.LocationBatchRequest,
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Score many candidate locations in one call.
+    """
+    if not batch_in.locations:
+        raise HTTPException(status_code=400, detail="At least one location is required")
+    if len(batch_in.locations) > settings.LOCATION_BATCH_MAX_SITES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"A batch can contain at most {settings.LOCATION_BATCH_MAX_SITES} locations",
+        )
+
+    try:
+        results = score_locations(
+            [(point.latitude, point.longitude) for point in batch_in.locations], batch_in.radius
+        )
+        return {"radius": batch_in.radius, "results": results}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error analyzing locations: {str(e)}")
+
+
 @router.get("/competitors", response_model=Dict[str, Any])
 def get_competitors(
     latitude: float = Query(..., description="Latitude of the location"),
@@ -45,7 +75,9 @@ def get_competitors(
     Get nearby competitors for a location.
     """
     try:
-        competitors = get_nearby_competitors(latitude, longitude, radius, cuisine_type)
+        competitors = cached_location_call(
+            "competitors", get_nearby_competitors, latitude, longitude, radius, cuisine_type
+        )
         return competitors
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting competitors: {str(e)}")
@@ -69,7 +101,7 @@ def analyze_foot_traffic(
         )
     
     try:
-        traffic_data = get_foot_traffic(latitude, longitude)
+        traffic_data = cached_location_call("foot_traffic", get_foot_traffic, latitude, longitude)
         return traffic_data
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error analyzing foot traffic: {str(e)}")
@@ -87,7 +119,17 @@ def get_demographics(
     Get demographic data for a location.
     """
     try:
-        demographic_data = get_demographic_data(latitude, longitude, radius)
+        demographic_data = cached_location_call("demographics", get_demographic_data, latitude, longitude, radius)
         return demographic_data
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting demographic data: {str(e)}")
+
+
+@router.get("/cache/stats", response_model=Dict[str, Any])
+def read_cache_stats(
+    current_user: models.User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Get hit/miss counters for the location response caches.
+    """
+    return get_cache_stats()
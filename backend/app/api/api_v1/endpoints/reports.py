@@ -1,38 +1,67 @@
-from typing import Any, List
+import os
+from typing import Any, Dict, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query, Header, Request
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
 from app.api import deps
+from app.api.downloads import artifact_response
+from app.api.listing import listing_columns, read_page_async
 from app.models.report import ReportType, ReportFormat
-from app.services.report_generator import generate_report, get_report_file_path
+from app.services.report_generator import (
+    REPORT_EXTENSIONS,
+    STREAMABLE_FORMATS,
+    build_report_document,
+    generate_report,
+    iter_report,
+)
+from app.services.artifact_store import get_artifact_store
+from app.services.report_rendering import get_render_stats
 from app.api.api_v1.endpoints.mock_data import MOCK_REPORTS
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[schemas.Report])
-def read_reports(
+@router.get("/", response_model=List[schemas.ReportListItem], response_model_exclude_unset=True)
+async def read_reports(
     request: Request,
-    db: Session = Depends(deps.get_db),
+    response: Response,
+    db: AsyncSession = Depends(deps.get_async_db),
     skip: int = 0,
-    limit: int = 100,
-    current_user: models.User = Depends(deps.get_current_active_user_or_mock),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    include: Optional[str] = None,
+    current_user: models.User = Depends(deps.get_current_active_user_or_mock_async),
     x_mock_data: str = Header(None)
 ) -> Any:
     """
-    Retrieve reports.
+    Retrieve reports, newest first.
+
+    Report data is left out unless asked for with `include=data`. Pass the
+    `X-Next-Cursor` response header back as `cursor` to get the next page.
     """
     # Use mock data if header is present or if we're using a mock user
     if x_mock_data == "true" or current_user.id == "mock-user-id":
         return MOCK_REPORTS
 
     # Otherwise use real data
-    reports = crud.report.get_multi_by_owner(
-        db=db, owner_id=current_user.id, skip=skip, limit=limit
+    columns = listing_columns(schemas.ReportSummary, schemas.ReportListItem, include)
+    return await read_page_async(
+        response, crud.aio.report, db,
+        filters={"owner_id": current_user.id}, columns=columns, cursor=cursor, skip=skip, limit=limit,
     )
-    return reports
+
+
+@router.get("/render-stats", response_model=Dict[str, Dict[str, Any]])
+def read_render_stats(
+    current_user: models.User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Get per-format throughput counters of rendered Excel/PDF reports.
+    """
+    return get_render_stats()
 
 
 @router.post("/", response_model=schemas.Report)
@@ -138,10 +167,13 @@ def download_report(
     *,
     db: Session = Depends(deps.get_db),
     id: str,
+    request: Request,
     current_user: models.User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Download a report file.
+
+    Supports ETag/If-None-Match, Range requests and precompressed JSON/CSV.
     """
     report = crud.report.get(db=db, id=id)
     if not report:
@@ -149,11 +181,6 @@ def download_report(
     if report.owner_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not enough permissions")
 
-    if not report.file_path:
-        raise HTTPException(status_code=404, detail="Report file not found")
-
-    file_path = get_report_file_path(report)
-
     # Determine content type based on format
     content_type = "application/json"
     if report.format == ReportFormat.PDF:
@@ -162,11 +189,38 @@ def download_report(
         content_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
     elif report.format == ReportFormat.CSV:
         content_type = "text/csv"
+    filename = f"{report.name.replace(' ', '_').lower()}.{REPORT_EXTENSIONS[report.format]}"
+
+    if report.file_path:
+        # Don't hold a pooled connection while the file streams
+        db.close()
+        # Reports generated before the artifact store hold an absolute path
+        if os.path.isabs(report.file_path) and os.path.exists(report.file_path):
+            return FileResponse(path=report.file_path, filename=filename, media_type=content_type)
 
-    return FileResponse(
-        path=file_path,
-        filename=f"{report.name.replace(' ', '_').lower()}.{report.format.value}",
-        media_type=content_type
+        store = get_artifact_store()
+        if store.exists(report.file_path):
+            return artifact_response(
+                request,
+                store,
+                report.file_path,
+                media_type=content_type,
+                filename=filename,
+                precompressed=report.format in STREAMABLE_FORMATS,
+            )
+
+    # Not generated yet: stream JSON/CSV straight from the project results
+    if report.format not in STREAMABLE_FORMATS:
+        raise HTTPException(status_code=404, detail="Report file not found")
+    research_project = crud.research_project.get(db=db, id=report.research_project_id)
+    if not research_project:
+        raise HTTPException(status_code=404, detail="Research project not found")
+    document = build_report_document(report, research_project)
+    db.close()
+    return StreamingResponse(
+        iter_report(report.format, document),
+        media_type=content_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
 
 
@@ -193,31 +247,36 @@ def read_reports_by_project(
     return reports
 
 
-@router.get("/by-type/{report_type}", response_model=List[schemas.Report])
-def read_reports_by_type(
+@router.get("/by-type/{report_type}", response_model=List[schemas.ReportListItem], response_model_exclude_unset=True)
+async def read_reports_by_type(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
+    response: Response,
     report_type: ReportType,
     research_project_id: str = Query(None),
-    current_user: models.User = Depends(deps.get_current_active_user),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    include: Optional[str] = None,
+    current_user: models.User = Depends(deps.get_current_active_user_async),
 ) -> Any:
     """
-    Get reports by type and optionally by research project.
+    Get reports by type and optionally by research project, newest first.
     """
     if research_project_id:
         # Check if the research project exists and belongs to the user
-        research_project = crud.research_project.get(db=db, id=research_project_id)
+        research_project = await crud.aio.research_project.get(db=db, id=research_project_id)
         if not research_project:
             raise HTTPException(status_code=404, detail="Research project not found")
         if research_project.owner_id != current_user.id:
             raise HTTPException(status_code=403, detail="Not enough permissions")
 
-        reports = crud.report.get_by_type_and_research_project(
-            db=db, type=report_type, research_project_id=research_project_id
-        )
-    else:
-        # Get all reports of this type owned by the user
-        all_reports = crud.report.get_multi_by_owner(db=db, owner_id=current_user.id)
-        reports = [r for r in all_reports if r.type == report_type]
-
-    return reports
+    filters = {
+        "owner_id": current_user.id,
+        "type": report_type,
+        "research_project_id": research_project_id,
+    }
+    columns = listing_columns(schemas.ReportSummary, schemas.ReportListItem, include)
+    return await read_page_async(
+        response, crud.aio.report, db,
+        filters=filters, columns=columns, cursor=cursor, skip=0, limit=limit,
+    )
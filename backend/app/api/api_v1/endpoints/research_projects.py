@@ -1,38 +1,51 @@
-from typing import Any, List
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Header, Request
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
 from app.api import deps
+from app.api.listing import listing_columns, read_page_async
 from app.models.research_project import ProjectStatus
-from app.services.research_processor import process_research_project
+from app.services import research_processor
+from app.services.progress import get_project_progress, progress_events
+from app.worker import process_research_project
 from app.api.api_v1.endpoints.mock_data import MOCK_RESEARCH_PROJECTS
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[schemas.ResearchProject])
-def read_research_projects(
+@router.get("/", response_model=List[schemas.ResearchProjectListItem], response_model_exclude_unset=True)
+async def read_research_projects(
     request: Request,
-    db: Session = Depends(deps.get_db),
+    response: Response,
+    db: AsyncSession = Depends(deps.get_async_db),
     skip: int = 0,
-    limit: int = 100,
-    current_user: models.User = Depends(deps.get_current_active_user_or_mock),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    include: Optional[str] = None,
+    current_user: models.User = Depends(deps.get_current_active_user_or_mock_async),
     x_mock_data: str = Header(None)
 ) -> Any:
     """
-    Retrieve research projects.
+    Retrieve research projects, newest first.
+
+    Large fields are left out unless asked for, e.g. `include=results`.
+    Pass the `X-Next-Cursor` response header back as `cursor` to get the
+    next page.
     """
     # Use mock data if header is present or if we're using a mock user
     if x_mock_data == "true" or current_user.id == "mock-user-id":
         return MOCK_RESEARCH_PROJECTS
 
     # Otherwise use real data
-    research_projects = crud.research_project.get_multi_by_owner(
-        db=db, owner_id=current_user.id, skip=skip, limit=limit
+    columns = listing_columns(schemas.ResearchProjectSummary, schemas.ResearchProjectListItem, include)
+    return await read_page_async(
+        response, crud.aio.research_project, db,
+        filters={"owner_id": current_user.id}, columns=columns, cursor=cursor, skip=skip, limit=limit,
     )
-    return research_projects
 
 
 @router.post("/", response_model=schemas.ResearchProject)
@@ -100,9 +113,48 @@ def read_research_project(
         raise HTTPException(status_code=404, detail="Research project not found")
     if research_project.owner_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not enough permissions")
+
+    # Running analyses only save their progress to the row when they finish
+    if research_project.status == ProjectStatus.IN_PROGRESS:
+        live = get_project_progress(id)
+        if live:
+            data = {field: getattr(research_project, field) for field in schemas.ResearchProject.__fields__}
+            data["progress"] = live["progress"]
+            return data
     return research_project
 
 
+@router.get("/{id}/events", response_class=StreamingResponse)
+def research_project_events(
+    *,
+    db: Session = Depends(deps.get_db),
+    id: str,
+    request: Request,
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Stream progress and stage-completed events of a research project analysis.
+    """
+    research_project = crud.research_project.get(db=db, id=id)
+    if not research_project:
+        raise HTTPException(status_code=404, detail="Research project not found")
+    if research_project.owner_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+
+    snapshot = {
+        "status": research_project.status.value,
+        "progress": research_project.progress,
+        "stages_completed": list(research_project.results or {}),
+    }
+    # The stream can last minutes; return the connection to the pool first
+    db.close()
+    return StreamingResponse(
+        progress_events(id, snapshot, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.put("/{id}", response_model=schemas.ResearchProject)
 def update_research_project(
     *,
@@ -153,7 +205,6 @@ def delete_research_project(
 def analyze_research_project(
     *,
     db: Session = Depends(deps.get_db),
-    background_tasks: BackgroundTasks,
     id: str,
     current_user: models.User = Depends(deps.get_current_active_user),
 ) -> Any:
@@ -165,6 +216,9 @@ def analyze_research_project(
         raise HTTPException(status_code=404, detail="Research project not found")
     if research_project.owner_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not enough permissions")
+    # Failed runs keep IN_PROGRESS with progress -1 and may be started again
+    if research_project.status == ProjectStatus.IN_PROGRESS and research_project.progress >= 0:
+        raise HTTPException(status_code=409, detail="Research project analysis is already in progress")
 
     # Removed tier restriction for analysis types
     # All users can access all analysis types
@@ -174,12 +228,12 @@ def analyze_research_project(
         db=db, db_obj=research_project, status=ProjectStatus.IN_PROGRESS, progress=10
     )
 
-    # Start background task for analysis
-    background_tasks.add_task(
-        process_research_project,
-        db=db,
-        research_project_id=id,
-        user_id=current_user.id
-    )
+    # Queue the analysis on the research workers; if the broker is
+    # unreachable, don't leave the project looking like it is running
+    try:
+        process_research_project.delay(research_project_id=id, user_id=current_user.id)
+    except Exception as e:
+        research_processor.mark_failed(db, id, current_user.id, f"Could not queue the analysis: {str(e)}")
+        raise
 
     return research_project
@@ -1,37 +1,47 @@
-from typing import Any, List
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Body, Header, Request
+from fastapi import APIRouter, Depends, HTTPException, Body, Header, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
 from app.api import deps
+from app.api.listing import listing_columns, read_page_async
 from app.services.geocoding import geocode_address
 from app.api.api_v1.endpoints.mock_data import MOCK_RESTAURANT_PROFILES
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[schemas.RestaurantProfile])
-def read_restaurant_profiles(
+@router.get("/", response_model=List[schemas.RestaurantProfileListItem], response_model_exclude_unset=True)
+async def read_restaurant_profiles(
     request: Request,
-    db: Session = Depends(deps.get_db),
+    response: Response,
+    db: AsyncSession = Depends(deps.get_async_db),
     skip: int = 0,
-    limit: int = 100,
-    current_user: models.User = Depends(deps.get_current_active_user_or_mock),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    include: Optional[str] = None,
+    current_user: models.User = Depends(deps.get_current_active_user_or_mock_async),
     x_mock_data: str = Header(None)
 ) -> Any:
     """
-    Retrieve restaurant profiles.
+    Retrieve restaurant profiles, newest first.
+
+    Large fields are left out unless asked for, e.g. `include=concept_description,research_goals`.
+    Pass the `X-Next-Cursor` response header back as `cursor` to get the
+    next page.
     """
     # Use mock data if header is present or if we're using a mock user
     if x_mock_data == "true" or current_user.id == "mock-user-id":
         return MOCK_RESTAURANT_PROFILES
 
     # Otherwise use real data
-    restaurant_profiles = crud.restaurant_profile.get_multi_by_owner(
-        db=db, owner_id=current_user.id, skip=skip, limit=limit
+    columns = listing_columns(schemas.RestaurantProfileSummary, schemas.RestaurantProfileListItem, include)
+    return await read_page_async(
+        response, crud.aio.restaurant_profile, db,
+        filters={"owner_id": current_user.id}, columns=columns, cursor=cursor, skip=skip, limit=limit,
     )
-    return restaurant_profiles
 
 
 @router.post("/", response_model=schemas.RestaurantProfile)
@@ -1,4 +1,4 @@
-from typing import Any, List
+from typing import Any, Dict, List
 
 from fastapi import APIRouter, Body, Depends, HTTPException
 from fastapi.encoders import jsonable_encoder
@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 from app import crud, models, schemas
 from app.api import deps
 from app.core.config import settings
+from app.core.principal_cache import principal_cache
 
 router = APIRouter()
 
@@ -35,6 +36,8 @@ def update_user_me(
     """
     Update own user.
     """
+    # The current user may be a cached copy; update the stored row
+    current_user = crud.user.get(db, id=current_user.id)
     current_user_data = jsonable_encoder(current_user)
     user_in = schemas.UserUpdate(**current_user_data)
     if password is not None:
@@ -49,6 +52,16 @@ def update_user_me(
     return user
 
 
+@router.get("/principal-cache/stats", response_model=Dict[str, Any])
+def read_principal_cache_stats(
+    current_user: models.User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Get hit/miss counters of the cache of authenticated users.
+    """
+    return principal_cache.stats()
+
+
 @router.get("/{user_id}", response_model=schemas.User)
 def read_user_by_id(
     user_id: str,
@@ -59,7 +72,7 @@ def read_user_by_id(
     Get a specific user by id.
     """
     user = crud.user.get(db, id=user_id)
-    if user == current_user:
+    if user is not None and user.id == current_user.id:
         return user
     if not crud.user.is_superuser(current_user):
         raise HTTPException(
@@ -4,11 +4,14 @@ from fastapi import Depends, HTTPException, status, Header, Request
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
 from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
 from app.core import security
 from app.core.config import settings
+from app.core.principal_cache import principal_cache
+from app.db.async_session import get_async_db
 from app.db.session import SessionLocal
 
 reusable_oauth2 = OAuth2PasswordBearer(
@@ -17,6 +20,9 @@ reusable_oauth2 = OAuth2PasswordBearer(
 
 
 def get_db() -> Generator:
+    # Cheap when unused: the session takes a pooled connection on its first
+    # query and returns it on close, so branches that never query (mock data,
+    # cached users) never touch the pool
     try:
         db = SessionLocal()
         yield db
@@ -24,9 +30,7 @@ def get_db() -> Generator:
         db.close()
 
 
-def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(reusable_oauth2)
-) -> models.User:
+def _token_subject(token: str) -> str:
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=["HS256"]
@@ -37,9 +41,38 @@ def get_current_user(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-    user = crud.user.get(db, id=token_data.sub)
+    return token_data.sub
+
+
+def get_current_user(
+    db: Session = Depends(get_db), token: str = Depends(reusable_oauth2)
+) -> models.User:
+    user_id = _token_subject(token)
+    if settings.PRINCIPAL_CACHE_ENABLED:
+        user = principal_cache.get(user_id)
+        if user is not None:
+            return user
+    user = crud.user.get(db, id=user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    if settings.PRINCIPAL_CACHE_ENABLED:
+        principal_cache.set(user)
+    return user
+
+
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db), token: str = Depends(reusable_oauth2)
+) -> models.User:
+    user_id = _token_subject(token)
+    if settings.PRINCIPAL_CACHE_ENABLED:
+        user = principal_cache.get(user_id)
+        if user is not None:
+            return user
+    user = await crud.aio.user.get(db, id=user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    if settings.PRINCIPAL_CACHE_ENABLED:
+        principal_cache.set(user)
     return user
 
 
@@ -51,6 +84,12 @@ def get_current_active_user(
     return current_user
 
 
+async def get_current_active_user_async(
+    current_user: models.User = Depends(get_current_user_async),
+) -> models.User:
+    return get_current_active_user(current_user)
+
+
 def get_current_active_superuser(
     current_user: models.User = Depends(get_current_user),
 ) -> models.User:
@@ -92,3 +131,21 @@ def get_current_active_user_or_mock(
         if settings.ENVIRONMENT.lower() != "production":
             return MOCK_USER
         raise
+
+
+async def get_current_active_user_or_mock_async(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(reusable_oauth2),
+    x_mock_user: Optional[str] = Header(None)
+) -> models.User:
+    if x_mock_user == "true":
+        return MOCK_USER
+
+    try:
+        return get_current_active_user(current_user=await get_current_user_async(db=db, token=token))
+    except HTTPException:
+        # Same development fallback as get_current_active_user_or_mock
+        if settings.ENVIRONMENT.lower() != "production":
+            return MOCK_USER
+        raise
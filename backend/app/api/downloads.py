@@ -0,0 +1,131 @@
+import re
+from typing import Any, List, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response, StreamingResponse
+
+# Precompressed variants, in order of preference: (Content-Encoding, key suffix)
+ENCODINGS = [("zstd", ".zst"), ("gzip", ".gz")]
+
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _etag(key: str, encoding: Optional[str] = None) -> str:
+    # Artifact keys are content hashes, so they make strong validators
+    digest = key.split(".", 1)[0]
+    return f'"{digest}-{encoding}"' if encoding else f'"{digest}"'
+
+
+def _accepted_encodings(request: Request) -> List[str]:
+    accepted = []
+    for part in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = part.strip().partition(";")
+        if name and params.replace(" ", "") not in ("q=0", "q=0.0"):
+            accepted.append(name.lower())
+    return accepted
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range `Range` header into inclusive `(start, end)` offsets.
+
+    Returns None for headers we don't handle (e.g. multiple ranges), in which
+    case the whole file is served. Raises ValueError if the range can't be
+    satisfied.
+    """
+    match = _RANGE.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if size == 0:
+        # An empty file has no byte positions to point at
+        raise ValueError("Range not satisfiable")
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError("Empty suffix range")
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError("Range not satisfiable")
+    return start, end
+
+
+def artifact_response(
+    request: Request,
+    store: Any,
+    key: str,
+    media_type: str,
+    filename: str,
+    precompressed: bool = False,
+) -> Response:
+    """
+    Serve a stored artifact with HTTP caching and partial content support.
+
+    - Strong ETags from the artifact's content hash, and 304 responses to
+      matching `If-None-Match` requests.
+    - Single `Range` requests (honouring `If-Range`) answered with 206, so
+      big downloads can resume.
+    - Precompressed zstd/gzip variants when `precompressed` and the client
+      accepts them. Compressed variants are only served whole.
+    """
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "private, no-cache",
+        "Content-Disposition": f'attachment; filename="{filename}"',
+    }
+    range_header = request.headers.get("range")
+
+    encoding = None
+    variant_key = key
+    if precompressed:
+        headers["Vary"] = "Accept-Encoding"
+        if not range_header:
+            accepted = _accepted_encodings(request)
+            for name, suffix in ENCODINGS:
+                if name in accepted and store.exists(key + suffix):
+                    encoding, variant_key = name, key + suffix
+                    break
+
+    etag = _etag(key, encoding)
+    headers["ETag"] = etag
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    size = store.size(variant_key)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+
+    byte_range = None
+    if range_header:
+        if_range = request.headers.get("if-range")
+        if not if_range or if_range.strip() == etag:
+            try:
+                byte_range = parse_range(range_header, size)
+            except ValueError:
+                headers["Content-Range"] = f"bytes */{size}"
+                return Response(status_code=416, headers=headers)
+
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(store.iter_bytes(variant_key), media_type=media_type, headers=headers)
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        store.iter_bytes(variant_key, start=start, end=end),
+        status_code=206,
+        media_type=media_type,
+        headers=headers,
+    )
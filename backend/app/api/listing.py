@@ -0,0 +1,49 @@
+from typing import Any, Dict, List, Optional, Type
+
+from fastapi import HTTPException, Response
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def listing_columns(
+    summary_schema: Type[BaseModel], item_schema: Type[BaseModel], include: Optional[str]
+) -> List[str]:
+    """
+    Columns to select for a listing.
+
+    Listings load only the fields of their summary schema. `include` is a
+    comma-separated list of the extra fields of the item schema (large JSON
+    or text columns) the client wants as well, e.g. `include=results`.
+    """
+    extra = [name.strip() for name in (include or "").split(",") if name.strip()]
+    includable = [name for name in item_schema.__fields__ if name not in summary_schema.__fields__]
+    unknown = [name for name in extra if name not in includable]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Cannot include {', '.join(unknown)}; choose from {', '.join(includable)}",
+        )
+    return list(summary_schema.__fields__) + extra
+
+
+async def read_page_async(
+    response: Response,
+    crud_obj: Any,
+    db: AsyncSession,
+    *,
+    filters: Dict[str, Any],
+    columns: List[str],
+    cursor: Optional[str],
+    skip: int,
+    limit: int,
+) -> List[Any]:
+    """Read a page of a listing, passing the next page's cursor in the `X-Next-Cursor` header"""
+    try:
+        rows, next_cursor = await crud_obj.get_page(
+            db, filters=filters, columns=columns, cursor=cursor, skip=skip, limit=limit
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return rows
@@ -0,0 +1,182 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+from app.core.config import settings
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Thread-safe in-process cache with per-entry TTL and LRU eviction.
+
+    Keeps hit/miss/eviction counters so the cache can be sized from
+    production traffic.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING or entry[0] < now:
+                if entry is not _MISSING:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": "memory",
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class RedisCache:
+    """
+    Cache backed by Redis, shared by every API process.
+
+    Values are stored as JSON under `{prefix}:{key}` with a TTL. LRU eviction
+    is left to the Redis server (`maxmemory-policy allkeys-lru`), so `maxsize`
+    is not enforced here. Redis errors are logged and treated as misses so a
+    Redis outage degrades to recomputing responses.
+    """
+
+    def __init__(self, prefix: str, ttl: float = 300, client: Any = None):
+        self.prefix = prefix
+        self.ttl = ttl
+        self._client = client
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @property
+    def client(self) -> Any:
+        if self._client is None:
+            import redis
+
+            self._client = redis.Redis(
+                host=settings.REDIS_HOST,
+                port=settings.REDIS_PORT,
+                db=settings.REDIS_CACHE_DB,
+                socket_timeout=settings.REDIS_CACHE_TIMEOUT,
+                socket_connect_timeout=settings.REDIS_CACHE_TIMEOUT,
+            )
+        return self._client
+
+    def _key(self, key: Hashable) -> str:
+        return f"{self.prefix}:{key}"
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        try:
+            raw = self.client.get(self._key(key))
+        except Exception as e:
+            print(f"Redis cache get error: {str(e)}")
+            self.errors += 1
+            raw = None
+        if raw is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return json.loads(raw)
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        try:
+            self.client.set(self._key(key), json.dumps(value), ex=int(self.ttl if ttl is None else ttl))
+        except Exception as e:
+            print(f"Redis cache set error: {str(e)}")
+            self.errors += 1
+
+    def delete(self, key: Hashable) -> None:
+        try:
+            self.client.delete(self._key(key))
+        except Exception as e:
+            print(f"Redis cache delete error: {str(e)}")
+            self.errors += 1
+
+    def clear(self) -> None:
+        try:
+            keys = list(self.client.scan_iter(match=f"{self.prefix}:*"))
+            if keys:
+                self.client.delete(*keys)
+        except Exception as e:
+            print(f"Redis cache clear error: {str(e)}")
+            self.errors += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": "redis",
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+_caches: Dict[str, Any] = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(namespace: str, maxsize: int = 1024, ttl: float = 300) -> Any:
+    """
+    Get the named cache, creating it on first use.
+
+    The backend is chosen by `settings.CACHE_BACKEND` ("memory" or "redis").
+    Both backends expose the same `get`/`set`/`delete`/`clear`/`stats` API.
+    """
+    with _caches_lock:
+        cache = _caches.get(namespace)
+        if cache is None:
+            if settings.CACHE_BACKEND == "redis":
+                cache = RedisCache(prefix=f"bitebase:{namespace}", ttl=ttl)
+            else:
+                cache = TTLCache(maxsize=maxsize, ttl=ttl)
+            _caches[namespace] = cache
+        return cache
+
+
+def get_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Get hit/miss counters for every named cache in this process."""
+    with _caches_lock:
+        return {namespace: cache.stats() for namespace, cache in _caches.items()}
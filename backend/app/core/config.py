@@ -9,12 +9,26 @@ class Settings(BaseSettings):
     SECRET_KEY: str = secrets.token_urlsafe(32)
     # 60 minutes * 24 hours * 8 days = 8 days
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8
+    PRINCIPAL_CACHE_ENABLED: bool = True  # cache the users tokens resolve to
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL: int = 30  # seconds; bounds staleness across API processes
+    PRINCIPAL_CACHE_REDIS: bool = False  # share cached users between processes
 
     # Environment
     ENVIRONMENT: str = "development"  # development, staging, production
 
     # OpenAI
     OPENAI_API_KEY: str = ""
+    CHATBOT_REQUEST_TIMEOUT: float = 60.0  # seconds
+    CHATBOT_MAX_CONNECTIONS: int = 100
+    CHATBOT_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    CHATBOT_PROVIDER: str = "openai"  # openai, stub
+    CHATBOT_STUB_LATENCY: float = 0.0  # seconds
+    CHATBOT_CACHE_ENABLED: bool = True
+    CHATBOT_CACHE_SIZE: int = 5000
+    CHATBOT_CACHE_TTL: int = 60 * 60 * 24  # 1 day
+    CHATBOT_SEMANTIC_CACHE: bool = False
+    CHATBOT_SEMANTIC_THRESHOLD: float = 0.92
 
     # CORS
     CORS_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:8000", "http://localhost:8080", "*"]
@@ -40,6 +54,16 @@ class Settings(BaseSettings):
     POSTGRES_DB: str = "bitebase"
     SQLALCHEMY_DATABASE_URI: Optional[PostgresDsn] = None
 
+    @validator("PROGRESS_BACKEND", pre=True, always=True)
+    def check_progress_backend(cls, v: Optional[str], values: Dict[str, Any]) -> str:
+        eager = values.get("CELERY_TASK_ALWAYS_EAGER", False)
+        if not v:
+            return "memory" if eager else "redis"
+        if v == "memory" and not eager:
+            # Workers run in other processes and their progress would never reach the API
+            raise ValueError("PROGRESS_BACKEND=memory needs CELERY_TASK_ALWAYS_EAGER=true; use redis")
+        return v
+
     @validator("SQLALCHEMY_DATABASE_URI", pre=True)
     def assemble_db_connection(cls, v: Optional[str], values: Dict[str, Any]) -> Any:
         if isinstance(v, str):
@@ -51,14 +75,70 @@ class Settings(BaseSettings):
 
         return f"postgresql://{postgres_user}:{postgres_password}@{postgres_server}/{postgres_db}"
 
+    # Connection pool (per process)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    # The asyncio engine has a pool of its own; these default to the sync pool's size
+    DB_ASYNC_POOL_SIZE: Optional[int] = None
+    DB_ASYNC_MAX_OVERFLOW: Optional[int] = None
+    DB_POOL_TIMEOUT: float = 30.0  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds; replace connections older than this, -1 never
+    DB_POOL_PRE_PING: str = "idle"  # always, idle (only after DB_POOL_PRE_PING_IDLE), never
+    DB_POOL_PRE_PING_IDLE: float = 30.0  # seconds
+    DB_STATEMENT_TIMEOUT: int = 0  # milliseconds, 0 disables
+    DB_PGBOUNCER_TRANSACTION_MODE: bool = False  # connecting through PgBouncer in transaction mode
+
     # External APIs
     GOOGLE_PLACES_API_KEY: Optional[str] = None
     YELP_API_KEY: Optional[str] = None
     CENSUS_API_KEY: Optional[str] = None
 
+    # Google Places details fetching
+    PLACES_HTTP_TIMEOUT: float = 10.0  # seconds
+    PLACES_DETAILS_MAX_WORKERS: int = 8
+    PLACES_DETAILS_CACHE_SIZE: int = 10000
+    PLACES_DETAILS_CACHE_TTL: int = 60 * 60 * 24  # 1 day
+
+    # Local place store (JSON or JSON-lines file of Google Places results)
+    PLACE_STORE_PATH: Optional[str] = None
+    PLACE_INDEX_CELL_SIZE: float = 0.01  # degrees
+    LOCATION_BATCH_MAX_SITES: int = 10000
+
     # Redis
     REDIS_HOST: str = "localhost"
     REDIS_PORT: int = 6379
+    REDIS_CACHE_DB: int = 1
+    REDIS_CACHE_TIMEOUT: float = 0.5  # seconds
+
+    # Celery
+    CELERY_TASK_ALWAYS_EAGER: bool = False  # run tasks inline, e.g. in tests
+    CELERY_TASK_MAX_RETRIES: int = 3
+    CELERY_TASK_RETRY_BACKOFF_MAX: int = 600  # seconds
+
+    # Live research progress
+    PROGRESS_BACKEND: Optional[str] = None  # memory, redis; defaults to memory only when Celery is eager
+    PROGRESS_TTL: int = 60 * 60  # 1 hour
+    PROGRESS_MIN_INTERVAL: float = 0.5  # seconds between coalesced updates
+    PROGRESS_HEARTBEAT_INTERVAL: float = 15.0  # seconds between SSE keep-alives
+
+    # Reports
+    REPORT_STREAM_CHUNK_SIZE: int = 64 * 1024  # characters per streamed chunk
+    REPORT_RENDER_WORKERS: int = 2  # Excel/PDF rendering processes, 0 renders inline
+    REPORT_PRECOMPRESS: bool = True  # store gzip (and zstd, if installed) JSON/CSV variants
+
+    # Report artifact store
+    ARTIFACT_STORE_BACKEND: str = "local"  # local, s3
+    ARTIFACT_STORE_PATH: Optional[str] = None  # defaults to ./reports
+    ARTIFACT_S3_BUCKET: Optional[str] = None
+    ARTIFACT_S3_PREFIX: str = "reports/"
+    ARTIFACT_S3_ENDPOINT_URL: Optional[str] = None  # e.g. a MinIO server
+
+    # Response caches
+    CACHE_BACKEND: str = "memory"  # memory, redis
+    LOCATION_CACHE_SIZE: int = 4096
+    LOCATION_CACHE_TTL: int = 60 * 15  # 15 minutes
+    LOCATION_CACHE_TILE_SIZE: float = 0.001  # degrees, roughly 110 m
+    LOCATION_CACHE_RADIUS_STEP: float = 0.25  # km
 
     # Project
     PROJECT_NAME: str = "BiteBase Intelligence"
@@ -0,0 +1,100 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.core.cache import RedisCache, TTLCache
+from app.core.config import settings
+from app.models.user import User
+
+# Cached user columns: everything the API returns for a user, never the password hash
+PRINCIPAL_FIELDS = (
+    "id",
+    "email",
+    "full_name",
+    "avatar_url",
+    "subscription_tier",
+    "is_active",
+    "is_superuser",
+    "created_at",
+    "updated_at",
+)
+_DATETIME_FIELDS = ("created_at", "updated_at")
+
+
+class PrincipalCache:
+    """
+    Short-lived cache of the users that bearer tokens resolve to.
+
+    Saves the per-request user lookup. The first tier is an in-process LRU;
+    the optional second tier is Redis, shared by every API process, so a
+    user only has to be loaded once per TTL across the deployment.
+
+    `invalidate` must be called whenever a user changes. It clears this
+    process's entry and the Redis entry; other processes' local entries
+    expire within the TTL, which bounds how long a change (e.g. a
+    deactivation) can take to apply everywhere.
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 30, shared: Any = None):
+        self.local = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.shared = shared
+
+    def get(self, user_id: str) -> Optional[User]:
+        """Get a detached copy of the user, or None on a miss"""
+        values = self.local.get(user_id)
+        if values is None and self.shared is not None:
+            values = self.shared.get(user_id)
+            if values is not None:
+                self.local.set(user_id, values)
+        if values is None:
+            return None
+        return _to_user(values)
+
+    def set(self, user: User) -> None:
+        values = {}
+        for field in PRINCIPAL_FIELDS:
+            value = getattr(user, field)
+            values[field] = value.isoformat() if isinstance(value, datetime) else value
+        self.local.set(user.id, values)
+        if self.shared is not None:
+            self.shared.set(user.id, values)
+
+    def invalidate(self, user_id: str) -> None:
+        self.local.delete(user_id)
+        if self.shared is not None:
+            self.shared.delete(user_id)
+
+    def clear(self) -> None:
+        self.local.clear()
+        if self.shared is not None:
+            self.shared.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {"local": self.local.stats()}
+        if self.shared is not None:
+            stats["shared"] = self.shared.stats()
+        return stats
+
+
+def _to_user(values: Dict[str, Any]) -> User:
+    values = dict(values)
+    for field in _DATETIME_FIELDS:
+        if values.get(field):
+            values[field] = datetime.fromisoformat(values[field])
+    user = User(**values)
+    # Detached rather than transient, so the object is never inserted by
+    # accident. Uncached columns raise instead of silently loading.
+    make_transient_to_detached(user)
+    return user
+
+
+principal_cache = PrincipalCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL,
+    shared=(
+        RedisCache(prefix="bitebase:principals", ttl=settings.PRINCIPAL_CACHE_TTL)
+        if settings.PRINCIPAL_CACHE_REDIS
+        else None
+    ),
+)
@@ -3,3 +3,4 @@ from app.crud.crud_restaurant_profile import restaurant_profile
 from app.crud.crud_research_project import research_project
 from app.crud.crud_integration import integration
 from app.crud.crud_report import report
+from app.crud import aio
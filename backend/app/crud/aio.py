@@ -0,0 +1,50 @@
+"""
+Asyncio CRUD objects, used as `crud.aio.<name>` from `async def` endpoints.
+"""
+from typing import Any, Dict, Union
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.principal_cache import principal_cache
+from app.core.security import get_password_hash
+from app.crud.async_base import AsyncCRUDBase
+from app.models.report import Report
+from app.models.research_project import ResearchProject
+from app.models.restaurant_profile import RestaurantProfile
+from app.models.user import User
+from app.schemas.report import ReportCreate, ReportUpdate
+from app.schemas.research_project import ResearchProjectCreate, ResearchProjectUpdate
+from app.schemas.restaurant_profile import RestaurantProfileCreate, RestaurantProfileUpdate
+from app.schemas.user import UserCreate, UserUpdate
+
+
+class AsyncCRUDUser(AsyncCRUDBase[User, UserCreate, UserUpdate]):
+    async def update(
+        self, db: AsyncSession, *, db_obj: User, obj_in: Union[UserUpdate, Dict[str, Any]]
+    ) -> User:
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.dict(exclude_unset=True)
+        if update_data.get("password"):
+            hashed_password = get_password_hash(update_data["password"])
+            del update_data["password"]
+            update_data["hashed_password"] = hashed_password
+        user = await super().update(db, db_obj=db_obj, obj_in=update_data)
+        principal_cache.invalidate(user.id)
+        return user
+
+    async def remove(self, db: AsyncSession, *, id: Any) -> User:
+        user = await super().remove(db, id=id)
+        principal_cache.invalidate(id)
+        return user
+
+
+user = AsyncCRUDUser(User)
+restaurant_profile = AsyncCRUDBase[RestaurantProfile, RestaurantProfileCreate, RestaurantProfileUpdate](
+    RestaurantProfile
+)
+research_project = AsyncCRUDBase[ResearchProject, ResearchProjectCreate, ResearchProjectUpdate](
+    ResearchProject
+)
+report = AsyncCRUDBase[Report, ReportCreate, ReportUpdate](Report)
@@ -0,0 +1,100 @@
+from typing import Any, Dict, Generic, List, Optional, Sequence, Tuple, Type, Union
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.base import (
+    CreateSchemaType,
+    ModelType,
+    UpdateSchemaType,
+    changed_columns,
+    loaded_columns,
+    object_id,
+    onupdate_columns,
+    page_statement,
+    restore_columns,
+    split_page,
+    update_statement,
+)
+
+
+class AsyncCRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    def __init__(self, model: Type[ModelType]):
+        """
+        Asyncio counterpart of `CRUDBase`, for `async def` endpoints.
+
+        Methods mirror `CRUDBase` but take an `AsyncSession` and must be
+        awaited. Relationships are never lazy-loaded on an async session, so
+        only column attributes of the returned objects can be used.
+
+        **Parameters**
+
+        * `model`: A SQLAlchemy model class
+        """
+        self.model = model
+
+    async def get(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
+        return await db.get(self.model, id)
+
+    async def get_multi(
+        self, db: AsyncSession, *, skip: int = 0, limit: int = 100
+    ) -> List[ModelType]:
+        result = await db.execute(select(self.model).offset(skip).limit(limit))
+        return list(result.scalars().all())
+
+    async def get_page(
+        self,
+        db: AsyncSession,
+        *,
+        filters: Optional[Dict[str, Any]] = None,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[Any], Optional[str]]:
+        """See `CRUDBase.get_page`"""
+        statement = page_statement(
+            self.model, filters=filters, cursor=cursor, skip=skip, limit=limit, columns=columns
+        )
+        result = await db.execute(statement)
+        rows = result.all() if columns else result.scalars().all()
+        return split_page(rows, limit)
+
+    async def create(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
+        obj_in_data = jsonable_encoder(obj_in)
+        db_obj = self.model(**obj_in_data)  # type: ignore
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> ModelType:
+        """See `CRUDBase.update`"""
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.dict(exclude_unset=True)
+        values = changed_columns(db_obj, update_data)
+        if not values:
+            return db_obj
+        loaded = loaded_columns(db_obj)
+        generated = onupdate_columns(self.model, values)
+        returning = generated if db.get_bind().dialect.update_returning else []
+        result = await db.execute(update_statement(self.model, object_id(db_obj), values, returning))
+        returned = result.first() if returning else None
+        await db.commit()
+        restore_columns(db_obj, loaded, values, generated, returning, returned)
+        return db_obj
+
+    async def remove(self, db: AsyncSession, *, id: Any) -> ModelType:
+        obj = await db.get(self.model, id)
+        await db.delete(obj)
+        await db.commit()
+        return obj
@@ -1,8 +1,16 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+import base64
+import binascii
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Generic, List, Optional, Sequence, Tuple, Type, TypeVar, Union
 
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, func, insert, inspect, literal, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.sql import Select
 
 from app.db.base_class import Base
 
@@ -31,6 +39,46 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     ) -> List[ModelType]:
         return db.query(self.model).offset(skip).limit(limit).all()
 
+    def filtered_query(self, db: Session, filters: Optional[Dict[str, Any]] = None) -> Query:
+        """
+        Query rows matching `filters`, a mapping of column name to value.
+
+        List/tuple/set values match any of their items (`IN`), and None values
+        are ignored, so optional query parameters can be passed straight through.
+        """
+        return db.query(self.model).filter(*filter_clauses(self.model, filters))
+
+    def get_page(
+        self,
+        db: Session,
+        *,
+        filters: Optional[Dict[str, Any]] = None,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[Any], Optional[str]]:
+        """
+        Get a page of rows matching `filters`, newest first, and the cursor of the next page.
+
+        Pages are keyset-paginated on `(created_at, id)`: each page starts
+        right after the row its cursor points at, so deep pages cost the same
+        as the first one and rows inserted meanwhile don't shift the pages.
+        The cursor is None on the last page. Raises ValueError for a
+        malformed cursor. `skip` is an offset for clients that don't use
+        cursors yet.
+
+        With `columns`, only those columns are selected and the page holds
+        lightweight rows with just those attributes instead of model objects,
+        so large columns the caller doesn't need never leave the database.
+        """
+        statement = page_statement(
+            self.model, filters=filters, cursor=cursor, skip=skip, limit=limit, columns=columns
+        )
+        result = db.execute(statement)
+        rows = result.all() if columns else result.scalars().all()
+        return split_page(rows, limit)
+
     def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
         obj_in_data = jsonable_encoder(obj_in)
         db_obj = self.model(**obj_in_data)  # type: ignore
@@ -39,28 +87,329 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db.refresh(db_obj)
         return db_obj
 
+    def create_many(
+        self, db: Session, *, objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]]
+    ) -> List[ModelType]:
+        """
+        Insert many rows with multi-row INSERT ... RETURNING and commit once.
+
+        `objs_in` are schemas or mappings of column name to value; rows
+        without an `id` get a new UUID. The inserted objects come back in
+        the same order, fully loaded, so reading them doesn't query again.
+        """
+        rows = insert_rows(self.model, objs_in)
+        if not rows:
+            return []
+        objs = list(db.scalars(
+            insert(self.model).returning(self.model, sort_by_parameter_order=True), rows
+        ).all())
+        commit_keeping_loaded(db, objs)
+        return objs
+
+    def upsert_many(
+        self,
+        db: Session,
+        *,
+        objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]],
+        index_elements: Sequence[str] = ("id",),
+        update_columns: Optional[Sequence[str]] = None,
+    ) -> List[ModelType]:
+        """
+        Insert many rows, updating the ones that conflict on `index_elements`.
+
+        Uses INSERT ... ON CONFLICT (PostgreSQL and SQLite). Conflicting rows
+        get the `update_columns` of the new row, by default every column
+        given except the index elements; with an empty `update_columns`
+        they are left alone and not returned. Returns the inserted and
+        updated objects, in no particular order.
+        """
+        rows = insert_rows(self.model, objs_in)
+        if not rows:
+            return []
+        objs = list(db.scalars(
+            upsert_statement(self.model, db.get_bind().dialect, rows, index_elements, update_columns),
+            rows,
+            execution_options={"populate_existing": True},
+        ).all())
+        commit_keeping_loaded(db, objs)
+        return objs
+
     def update(
         self,
         db: Session,
         *,
         db_obj: ModelType,
-        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]],
+        refresh: bool = False,
     ) -> ModelType:
-        obj_data = jsonable_encoder(db_obj)
+        """
+        Update the columns of `db_obj` that `obj_in` changes.
+
+        Issues a single `UPDATE ... WHERE id = ...` for the changed columns,
+        reading server-side `onupdate` values back with RETURNING, and keeps
+        the loaded attributes of `db_obj` instead of reloading the row. Pass
+        `refresh=True` to reload it anyway (e.g. to see trigger changes).
+        """
         if isinstance(obj_in, dict):
             update_data = obj_in
         else:
             update_data = obj_in.dict(exclude_unset=True)
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
-        db.add(db_obj)
+        values = changed_columns(db_obj, update_data)
+        if not values:
+            return db_obj
+        loaded = loaded_columns(db_obj)
+        generated = onupdate_columns(self.model, values)
+        returning = generated if db.get_bind().dialect.update_returning else []
+        result = db.execute(update_statement(self.model, object_id(db_obj), values, returning))
+        returned = result.first() if returning else None
         db.commit()
-        db.refresh(db_obj)
+        # The commit expired db_obj; put back what we know instead of reloading
+        restore_columns(db_obj, loaded, values, generated, returning, returned)
+        if refresh:
+            db.refresh(db_obj)
         return db_obj
 
+    def bulk_update(self, db: Session, *, rows: Sequence[Dict[str, Any]]) -> int:
+        """
+        Update many rows by primary key in one executemany round trip.
+
+        Each row is a mapping of column name to value that includes `id`;
+        rows may set different columns. Objects already loaded in `db` are
+        not updated. Returns the number of rows given.
+        """
+        if not rows:
+            return 0
+        columns = self.model.__table__.columns
+        for row in rows:
+            if "id" not in row:
+                raise ValueError(f"Bulk update rows of {self.model.__name__} need an id")
+            unknown = [name for name in row if name not in columns]
+            if unknown:
+                raise ValueError(f"Unknown columns {unknown} for {self.model.__name__}")
+        db.execute(update(self.model), list(rows))
+        db.commit()
+        return len(rows)
+
     def remove(self, db: Session, *, id: Any) -> ModelType:
         obj = db.query(self.model).get(id)
         db.delete(obj)
         db.commit()
         return obj
+
+
+def insert_rows(model: Any, objs_in: Sequence[Any]) -> List[Dict[str, Any]]:
+    """Column values to insert for each of `objs_in`, see `CRUDBase.create_many`"""
+    columns = model.__table__.columns
+    rows = []
+    for obj_in in objs_in:
+        row = dict(obj_in) if isinstance(obj_in, dict) else obj_in.dict()
+        unknown = [name for name in row if name not in columns]
+        if unknown:
+            raise ValueError(f"Unknown columns {unknown} for {model.__name__}")
+        if row.get("id") is None:
+            row["id"] = str(uuid.uuid4())
+        rows.append(row)
+    return rows
+
+
+def upsert_statement(
+    model: Any,
+    dialect: Any,
+    rows: Sequence[Dict[str, Any]],
+    index_elements: Sequence[str],
+    update_columns: Optional[Sequence[str]] = None,
+) -> Any:
+    """INSERT ... ON CONFLICT ... RETURNING for `CRUDBase.upsert_many`"""
+    if dialect.name == "postgresql":
+        statement = postgresql.insert(model)
+    elif dialect.name == "sqlite":
+        statement = sqlite.insert(model)
+    else:
+        raise NotImplementedError(f"Upserts are not supported on {dialect.name}")
+    if update_columns is None:
+        update_columns = [name for name in rows[0] if name not in index_elements]
+    if not update_columns:
+        statement = statement.on_conflict_do_nothing(index_elements=list(index_elements))
+    else:
+        set_ = {name: getattr(statement.excluded, name) for name in update_columns}
+        # ON CONFLICT DO UPDATE doesn't apply onupdate defaults by itself
+        for column in model.__table__.columns:
+            if column.key not in set_ and column.onupdate is not None and column.onupdate.is_clause_element:
+                set_[column.key] = column.onupdate.arg
+        statement = statement.on_conflict_do_update(index_elements=list(index_elements), set_=set_)
+    return statement.returning(model)
+
+
+def commit_keeping_loaded(db: Session, objs: Sequence[Any]) -> None:
+    """Commit, then mark the columns loaded in `objs` as loaded again rather than expired"""
+    loaded = [loaded_columns(obj) for obj in objs]
+    db.commit()
+    for obj, columns in zip(objs, loaded):
+        for name, value in columns.items():
+            set_committed_value(obj, name, value)
+
+
+def object_id(db_obj: Any) -> Any:
+    """The id of `db_obj`, read from its identity so an expired object isn't reloaded"""
+    identity = inspect(db_obj).identity
+    return identity[0] if identity else db_obj.id
+
+
+def loaded_columns(db_obj: Any) -> Dict[str, Any]:
+    """Column attributes of `db_obj` that are loaded, without triggering any loads"""
+    state = inspect(db_obj)
+    return {name: state.dict[name] for name in state.mapper.column_attrs.keys() if name in state.dict}
+
+
+def changed_columns(db_obj: Any, update_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The column values of `update_data` that differ from `db_obj`.
+
+    Keys that aren't mapped columns are ignored. Unloaded attributes count
+    as changed, and so do JSON containers, which may have been modified in
+    place.
+    """
+    loaded = inspect(db_obj).dict
+    columns = inspect(db_obj).mapper.column_attrs.keys()
+    changed = {}
+    for name, value in update_data.items():
+        if name not in columns:
+            continue
+        if name in loaded and not isinstance(value, (dict, list)) and loaded[name] == value:
+            continue
+        changed[name] = value
+    return changed
+
+
+def onupdate_columns(model: Any, values: Dict[str, Any]) -> List[str]:
+    """Columns that an UPDATE setting `values` changes through their `onupdate` default"""
+    return [
+        column.key
+        for column in model.__table__.columns
+        if (column.onupdate is not None or column.server_onupdate is not None) and column.key not in values
+    ]
+
+
+def update_statement(model: Any, id: Any, values: Dict[str, Any], returning: Sequence[str] = ()) -> Any:
+    """UPDATE of the row with `id`, leaving objects loaded in the session alone"""
+    statement = (
+        update(model)
+        .where(model.id == id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    if returning:
+        statement = statement.returning(*(getattr(model, name) for name in returning))
+    return statement
+
+
+def restore_columns(
+    db_obj: Any,
+    loaded: Dict[str, Any],
+    values: Dict[str, Any],
+    generated: Sequence[str],
+    returning: Sequence[str],
+    returned: Any,
+) -> None:
+    """
+    Mark the columns of `db_obj` known after an update as loaded again.
+
+    `loaded` are the column values before the update. Generated columns
+    that weren't returned are left expired, to be loaded on access.
+    """
+    loaded.update(values)
+    for name in generated:
+        loaded.pop(name, None)
+    if returned is not None:
+        loaded.update(zip(returning, returned))
+    for name, value in loaded.items():
+        set_committed_value(db_obj, name, value)
+
+
+def filter_clauses(model: Any, filters: Optional[Dict[str, Any]]) -> List[Any]:
+    """WHERE clauses for a mapping of column name to value, see `CRUDBase.filtered_query`"""
+    clauses = []
+    for name, value in (filters or {}).items():
+        if value is None:
+            continue
+        if name not in model.__table__.columns:
+            raise ValueError(f"Unknown filter column {name!r} for {model.__name__}")
+        column = getattr(model, name)
+        if isinstance(value, (list, tuple, set)):
+            clauses.append(column.in_(list(value)))
+        else:
+            clauses.append(column == value)
+    return clauses
+
+
+def page_statement(
+    model: Any,
+    *,
+    filters: Optional[Dict[str, Any]] = None,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    columns: Optional[Sequence[str]] = None,
+) -> Select:
+    """
+    SELECT for one page of `CRUDBase.get_page`.
+
+    Fetches one row more than `limit` so `split_page` can tell whether
+    there is a next page.
+    """
+    created_at, id_ = model.created_at, model.id
+    if columns:
+        unknown = [name for name in columns if name not in model.__table__.columns]
+        if unknown:
+            raise ValueError(f"Unknown columns {unknown} for {model.__name__}")
+        # The next page's cursor is built from the last row's id and created_at
+        names = ([] if "id" in columns else ["id"]) + list(columns)
+        names += [] if "created_at" in columns else ["created_at"]
+        statement = select(*(getattr(model, name) for name in names))
+    else:
+        statement = select(model)
+    statement = statement.where(*filter_clauses(model, filters))
+    if cursor:
+        cursor_created_at, after_id = decode_cursor(cursor)
+        # Compare against the stored timestamp rather than a round-tripped one
+        # (SQLite stores them as text in another format), falling back to the
+        # cursor's own timestamp if its row has been deleted since
+        after_created_at = func.coalesce(
+            select(created_at).where(id_ == after_id).correlate(None).scalar_subquery(),
+            literal(cursor_created_at, created_at.type),
+        )
+        statement = statement.where(
+            or_(
+                created_at < after_created_at,
+                and_(created_at == after_created_at, id_ < after_id),
+            )
+        )
+    return statement.order_by(created_at.desc(), id_.desc()).offset(skip).limit(limit + 1)
+
+
+def split_page(rows: Sequence[Any], limit: int) -> Tuple[List[Any], Optional[str]]:
+    """Split the rows fetched by `page_statement` into the page and the next page's cursor"""
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        return list(rows[:limit]), encode_cursor(last.created_at, last.id)
+    return list(rows), None
+
+
+def encode_cursor(created_at: datetime, id: Any) -> str:
+    """Opaque pagination cursor pointing at the row with `created_at` and `id`"""
+    value = f"{created_at.isoformat()}|{id}"
+    return base64.urlsafe_b64encode(value.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        value = base64.b64decode(cursor + "=" * (-len(cursor) % 4), altchars=b"-_", validate=True).decode()
+    except (binascii.Error, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+    created_at, separator, id = value.rpartition("|")
+    if not separator or not created_at or not id:
+        raise ValueError("Invalid cursor")
+    try:
+        return datetime.fromisoformat(created_at), id
+    except ValueError:
+        raise ValueError("Invalid cursor")
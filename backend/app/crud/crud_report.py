@@ -9,17 +9,23 @@ from app.schemas.report import ReportCreate, ReportUpdate
 
 
 class CRUDReport(CRUDBase[Report, ReportCreate, ReportUpdate]):
-    def create_with_owner(
-        self, db: Session, *, obj_in: ReportCreate, owner_id: str, data: Dict[str, Any] = None, file_path: str = None
+    def build_with_owner(
+        self, *, obj_in: ReportCreate, owner_id: str, data: Dict[str, Any] = None, file_path: str = None
     ) -> Report:
+        """Build a report without adding it to a session"""
         report_id = str(uuid.uuid4())
-        db_obj = Report(
+        return Report(
             id=report_id,
             owner_id=owner_id,
             data=data,
             file_path=file_path,
             **obj_in.dict(),
         )
+
+    def create_with_owner(
+        self, db: Session, *, obj_in: ReportCreate, owner_id: str, data: Dict[str, Any] = None, file_path: str = None
+    ) -> Report:
+        db_obj = self.build_with_owner(obj_in=obj_in, owner_id=owner_id, data=data, file_path=file_path)
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
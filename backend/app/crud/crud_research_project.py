@@ -5,6 +5,7 @@ from datetime import datetime
 from sqlalchemy.orm import Session
 
 from app.crud.base import CRUDBase
+from app.models.report import Report
 from app.models.research_project import ResearchProject, ProjectStatus
 from app.schemas.research_project import ResearchProjectCreate, ResearchProjectUpdate
 
@@ -66,5 +67,22 @@ class CRUDResearchProject(CRUDBase[ResearchProject, ResearchProjectCreate, Resea
     ) -> ResearchProject:
         return super().update(db, db_obj=db_obj, obj_in={"results": results})
 
+    def complete_with_reports(
+        self, db: Session, *, db_obj: ResearchProject, results: Dict[str, Any], reports: List[Report]
+    ) -> ResearchProject:
+        """
+        Save the results, mark the project completed and insert its reports
+        in a single transaction.
+        """
+        db.add_all(reports)
+        db_obj.results = results
+        db_obj.status = ProjectStatus.COMPLETED
+        db_obj.progress = 100
+        db_obj.completed_at = datetime.utcnow()
+        db.add(db_obj)
+        db.commit()
+        db.refresh(db_obj)
+        return db_obj
+
 
 research_project = CRUDResearchProject(ResearchProject)
@@ -1,8 +1,9 @@
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, List, Optional, Sequence, Union
 import uuid
 
 from sqlalchemy.orm import Session
 
+from app.core.principal_cache import principal_cache
 from app.core.security import get_password_hash, verify_password
 from app.crud.base import CRUDBase
 from app.models.user import User
@@ -41,7 +42,44 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             hashed_password = get_password_hash(update_data["password"])
             del update_data["password"]
             update_data["hashed_password"] = hashed_password
-        return super().update(db, db_obj=db_obj, obj_in=update_data)
+        user = super().update(db, db_obj=db_obj, obj_in=update_data)
+        principal_cache.invalidate(user.id)
+        return user
+
+    def bulk_update(self, db: Session, *, rows: Sequence[Dict[str, Any]]) -> int:
+        updated = super().bulk_update(db, rows=rows)
+        for row in rows:
+            principal_cache.invalidate(row["id"])
+        return updated
+
+    def create_many(
+        self, db: Session, *, objs_in: Sequence[Union[UserCreate, Dict[str, Any]]]
+    ) -> List[User]:
+        return super().create_many(db, objs_in=self.hash_passwords(objs_in))
+
+    def upsert_many(
+        self, db: Session, *, objs_in: Sequence[Union[UserCreate, Dict[str, Any]]], **kwargs: Any
+    ) -> List[User]:
+        users = super().upsert_many(db, objs_in=self.hash_passwords(objs_in), **kwargs)
+        for user in users:
+            principal_cache.invalidate(user.id)
+        return users
+
+    def remove(self, db: Session, *, id: Any) -> User:
+        user = super().remove(db, id=id)
+        principal_cache.invalidate(id)
+        return user
+
+    def hash_passwords(self, objs_in: Sequence[Union[UserCreate, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Column values for bulk inserts, with `password` replaced by `hashed_password`"""
+        rows = []
+        for obj_in in objs_in:
+            row = dict(obj_in) if isinstance(obj_in, dict) else obj_in.dict()
+            password = row.pop("password", None)
+            if password:
+                row["hashed_password"] = get_password_hash(password)
+            rows.append(row)
+        return rows
 
     def authenticate(self, db: Session, *, email: str, password: str) -> Optional[User]:
         user = self.get_by_email(db, email=email)
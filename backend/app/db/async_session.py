@@ -0,0 +1,69 @@
+import uuid
+from typing import Any, AsyncGenerator, Dict
+
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.db.pool import InstrumentedAsyncQueuePool
+from app.db.session import instrument_engine, pool_options
+
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_database_url(url: Any) -> URL:
+    """The database URL with its driver swapped for an asyncio one"""
+    url = make_url(str(url))
+    return url.set(drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername))
+
+
+def create_async_db_engine(url: Any) -> AsyncEngine:
+    """
+    Create an asyncio engine with the same pool settings as the sync engine.
+
+    Its pool is separate from the sync engine's, so a process can hold up to
+    both pools' connections; `DB_ASYNC_POOL_SIZE` and `DB_ASYNC_MAX_OVERFLOW`
+    size it independently.
+
+    asyncpg prepares every statement, which PgBouncer in transaction mode
+    can't route, so `DB_PGBOUNCER_TRANSACTION_MODE` turns the statement
+    caches off and gives prepared statements unique names.
+    """
+    url = async_database_url(url)
+    connect_args: Dict[str, Any] = {}
+    if url.get_backend_name() == "postgresql":
+        if settings.DB_PGBOUNCER_TRANSACTION_MODE:
+            url = url.update_query_dict({"prepared_statement_cache_size": "0"})
+            connect_args["statement_cache_size"] = 0
+            connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid.uuid4()}__"
+        elif settings.DB_STATEMENT_TIMEOUT:
+            connect_args["server_settings"] = {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT)}
+
+    options = pool_options()
+    if settings.DB_ASYNC_POOL_SIZE is not None:
+        options["pool_size"] = settings.DB_ASYNC_POOL_SIZE
+    if settings.DB_ASYNC_MAX_OVERFLOW is not None:
+        options["max_overflow"] = settings.DB_ASYNC_MAX_OVERFLOW
+    engine = create_async_engine(
+        url, poolclass=InstrumentedAsyncQueuePool, connect_args=connect_args, **options
+    )
+    instrument_engine(engine.sync_engine)
+    return engine
+
+
+async_engine = create_async_db_engine(settings.SQLALCHEMY_DATABASE_URI)
+# Objects stay usable after commit, as there is no implicit IO to reload them
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+
+
+def get_async_pool_stats() -> Dict[str, Any]:
+    """Connection pool usage and checkout wait times of the asyncio engine"""
+    return async_engine.sync_engine.pool.stats()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
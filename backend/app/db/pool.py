@@ -0,0 +1,161 @@
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DisconnectionError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolMetrics:
+    """Counters of connection checkouts from an instrumented pool"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.saturated_checkouts = 0
+        self.peak_in_use = 0
+        self.pings = 0
+        self.ping_failures = 0
+
+    def record_checkout(self, wait: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds += wait
+            self.max_wait_seconds = max(self.max_wait_seconds, wait)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def record_usage(self, in_use: int, size: int) -> None:
+        with self._lock:
+            self.peak_in_use = max(self.peak_in_use, in_use)
+            if in_use > size:
+                self.saturated_checkouts += 1
+
+    def record_ping(self, ok: bool) -> None:
+        with self._lock:
+            self.pings += 1
+            if not ok:
+                self.ping_failures += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds": round(self.wait_seconds, 6),
+                "max_wait_seconds": round(self.max_wait_seconds, 6),
+                "avg_wait_seconds": round(self.wait_seconds / self.checkouts, 6) if self.checkouts else 0.0,
+                "saturated_checkouts": self.saturated_checkouts,
+                "peak_in_use": self.peak_in_use,
+                "pings": self.pings,
+                "ping_failures": self.ping_failures,
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool that measures how long each checkout waits for a connection.
+
+    The wait covers queueing for a free connection and opening a new one,
+    which is what a request feels when the pool is too small.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self) -> Any:
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.record_checkout(time.perf_counter() - started)
+        return connection
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        pool = super().recreate()
+        # Keep counting across pool recreation (e.g. after a disconnect)
+        pool.metrics = self.metrics
+        return pool
+
+    def stats(self) -> Dict[str, Any]:
+        """Current pool usage plus checkout counters"""
+        stats = {
+            "size": self.size(),
+            "in_use": self.checkedout(),
+            "idle": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "max_overflow": self._max_overflow,
+        }
+        stats.update(self.metrics.snapshot())
+        return stats
+
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """`InstrumentedQueuePool` for asyncio engines"""
+
+
+def install_pool_hooks(engine: Engine, idle_ping: Optional[float] = None) -> None:
+    """
+    Register pool event hooks on an engine using `InstrumentedQueuePool`.
+
+    - Saturation: every checkout records the number of connections in use;
+      checkouts beyond `pool_size` (served from overflow) count as saturated.
+    - With `idle_ping`, connections idle for longer than that many seconds
+      are pinged on checkout and replaced if the ping fails. Unlike
+      `pool_pre_ping`, busy connections skip the extra round trip.
+    """
+
+    @event.listens_for(engine, "checkout")
+    def record_usage(dbapi_connection: Any, connection_record: Any, connection_proxy: Any) -> None:
+        # engine.pool may be recreated (e.g. after a disconnect)
+        current = engine.pool
+        current.metrics.record_usage(current.checkedout(), current.size())
+
+    if idle_ping is None:
+        return
+
+    @event.listens_for(engine, "checkin")
+    def mark_idle(dbapi_connection: Any, connection_record: Any) -> None:
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def ping_idle(dbapi_connection: Any, connection_record: Any, connection_proxy: Any) -> None:
+        checked_in_at = connection_record.info.pop("checked_in_at", None)
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_ping:
+            return
+        try:
+            cursor = dbapi_connection.cursor()
+            try:
+                cursor.execute("SELECT 1")
+            finally:
+                cursor.close()
+        except Exception:
+            engine.pool.metrics.record_ping(ok=False)
+            # Makes the pool discard this connection and check out another
+            raise DisconnectionError("Idle connection failed its ping")
+        engine.pool.metrics.record_ping(ok=True)
+
+
+def install_local_statement_timeout(engine: Engine, timeout_ms: int) -> None:
+    """
+    Apply a Postgres statement timeout to every transaction with `SET LOCAL`.
+
+    Needed behind PgBouncer in transaction mode, where session settings
+    (including startup options) would leak between clients sharing a
+    server connection.
+    """
+
+    @event.listens_for(engine, "begin")
+    def set_statement_timeout(connection: Any) -> None:
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
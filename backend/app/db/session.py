@@ -1,14 +1,93 @@
+from typing import Any, Dict
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
+from app.db.pool import InstrumentedQueuePool, install_local_statement_timeout, install_pool_hooks
+
+PRE_PING_STRATEGIES = ("always", "idle", "never")
+
+
+def pool_options() -> Dict[str, Any]:
+    """
+    Connection pool arguments for `create_engine`, from settings.
+
+    - `DB_POOL_SIZE`, `DB_MAX_OVERFLOW`, `DB_POOL_TIMEOUT` and
+      `DB_POOL_RECYCLE` size and age the pool.
+    - `DB_POOL_PRE_PING` is "always" (ping every checkout), "idle" (ping
+      only connections idle for `DB_POOL_PRE_PING_IDLE` seconds, see
+      `install_pool_hooks`) or "never" (rely on recycling and disconnect
+      handling).
+    """
+    if settings.DB_POOL_PRE_PING not in PRE_PING_STRATEGIES:
+        raise ValueError(
+            f"DB_POOL_PRE_PING must be one of {', '.join(PRE_PING_STRATEGIES)}, "
+            f"not {settings.DB_POOL_PRE_PING!r}"
+        )
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING == "always",
+    }
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Install the pool hooks and, for Postgres, the statement timeout.
+
+    `DB_STATEMENT_TIMEOUT` is normally passed when connecting (see
+    `create_db_engine`); with `DB_PGBOUNCER_TRANSACTION_MODE` it is set per
+    transaction instead, since PgBouncer shares server connections between
+    clients.
+    """
+    install_pool_hooks(
+        engine,
+        idle_ping=settings.DB_POOL_PRE_PING_IDLE if settings.DB_POOL_PRE_PING == "idle" else None,
+    )
+    if (
+        engine.dialect.name == "postgresql"
+        and settings.DB_STATEMENT_TIMEOUT
+        and settings.DB_PGBOUNCER_TRANSACTION_MODE
+    ):
+        install_local_statement_timeout(engine, settings.DB_STATEMENT_TIMEOUT)
 
-engine = create_engine(settings.SQLALCHEMY_DATABASE_URI, pool_pre_ping=True)
+
+def create_db_engine(url: Any) -> Engine:
+    """Create an engine with its connection pool configured from settings"""
+    url = make_url(str(url))
+    connect_args = {}
+    if (
+        url.get_backend_name() == "postgresql"
+        and settings.DB_STATEMENT_TIMEOUT
+        and not settings.DB_PGBOUNCER_TRANSACTION_MODE
+    ):
+        connect_args["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT}"
+
+    engine = create_engine(
+        url, poolclass=InstrumentedQueuePool, connect_args=connect_args, **pool_options()
+    )
+    instrument_engine(engine)
+    return engine
+
+
+engine = create_db_engine(settings.SQLALCHEMY_DATABASE_URI)
+# Sessions only check out a connection when they first run a query
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Connection pool usage and checkout wait times of this process"""
+    pool = engine.pool
+    return pool.stats() if isinstance(pool, InstrumentedQueuePool) else {"status": pool.status()}
+
+
 # Dependency
 def get_db():
     db = SessionLocal()
@@ -1,9 +1,13 @@
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
+from app import models
+from app.api import deps
 from app.api.api_v1.api import api_router
 from app.core.config import settings
+from app.db.async_session import get_async_pool_stats
+from app.db.session import get_pool_stats
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -45,6 +49,15 @@ async def health_check():
         }
     )
 
+@app.get("/metrics")
+async def metrics(current_user: models.User = Depends(deps.get_current_active_superuser)):
+    return JSONResponse(
+        content={
+            "db_pool": get_pool_stats(),
+            "async_db_pool": get_async_pool_stats(),
+        }
+    )
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, DateTime, JSON, Enum
+from sqlalchemy import Column, String, ForeignKey, DateTime, JSON, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -22,6 +22,13 @@ class ReportFormat(str, enum.Enum):
 
 
 class Report(Base):
+    __table_args__ = (
+        # Owner listings, optionally by type, paginated on (created_at, id)
+        Index("ix_report_owner_type_created", "owner_id", "type", "created_at", "id"),
+        Index("ix_report_owner_created", "owner_id", "created_at", "id"),
+        Index("ix_report_project_created", "research_project_id", "created_at", "id"),
+    )
+
     id = Column(String, primary_key=True, index=True)
     owner_id = Column(String, ForeignKey("user.id"), nullable=False)
     research_project_id = Column(String, ForeignKey("researchproject.id"), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Float, ForeignKey, DateTime, JSON, Enum, Boolean
+from sqlalchemy import Column, String, Integer, Float, ForeignKey, DateTime, JSON, Enum, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -13,6 +13,10 @@ class ProjectStatus(str, enum.Enum):
 
 
 class ResearchProject(Base):
+    __table_args__ = (
+        Index("ix_researchproject_owner_created", "owner_id", "created_at", "id"),
+    )
+
     id = Column(String, primary_key=True, index=True)
     owner_id = Column(String, ForeignKey("user.id"), nullable=False)
     restaurant_profile_id = Column(String, ForeignKey("restaurantprofile.id"), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, String, Float, ForeignKey, DateTime, JSON
+from sqlalchemy import Boolean, Column, String, Float, ForeignKey, DateTime, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -6,6 +6,10 @@ from app.db.base_class import Base
 
 
 class RestaurantProfile(Base):
+    __table_args__ = (
+        Index("ix_restaurantprofile_owner_created", "owner_id", "created_at", "id"),
+    )
+
     id = Column(String, primary_key=True, index=True)
     owner_id = Column(String, ForeignKey("user.id"), nullable=False)
     
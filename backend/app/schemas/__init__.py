@@ -1,6 +1,7 @@
 from app.schemas.user import User, UserCreate, UserUpdate, UserInDB
-from app.schemas.restaurant_profile import RestaurantProfile, RestaurantProfileCreate, RestaurantProfileUpdate
-from app.schemas.research_project import ResearchProject, ResearchProjectCreate, ResearchProjectUpdate
+from app.schemas.restaurant_profile import RestaurantProfile, RestaurantProfileCreate, RestaurantProfileUpdate, RestaurantProfileSummary, RestaurantProfileListItem
+from app.schemas.research_project import ResearchProject, ResearchProjectCreate, ResearchProjectUpdate, ResearchProjectSummary, ResearchProjectListItem
 from app.schemas.integration import Integration, IntegrationCreate, IntegrationUpdate
-from app.schemas.report import Report, ReportCreate, ReportUpdate
+from app.schemas.report import Report, ReportCreate, ReportUpdate, ReportSummary, ReportListItem
 from app.schemas.token import Token, TokenPayload
+from app.schemas.location import LocationPoint, LocationBatchRequest
@@ -0,0 +1,13 @@
+from typing import List
+from pydantic import BaseModel, Field
+
+
+class LocationPoint(BaseModel):
+    latitude: float = Field(..., ge=-90, le=90)
+    longitude: float = Field(..., ge=-180, le=180)
+
+
+# Properties to receive via API for batch scoring
+class LocationBatchRequest(BaseModel):
+    locations: List[LocationPoint]
+    radius: float = Field(1.0, gt=0, description="Radius in kilometers")
@@ -38,6 +38,23 @@ class ReportInDBBase(ReportBase):
         orm_mode = True
 
 
+# Properties to return in listings, without the report data
+class ReportSummary(ReportBase):
+    id: str
+    owner_id: str
+    file_path: Optional[str] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        orm_mode = True
+
+
+# Listing entry; the report data is only present when requested
+class ReportListItem(ReportSummary):
+    data: Optional[Dict[str, Any]] = None
+
+
 # Additional properties to return via API
 class Report(ReportInDBBase):
     pass
@@ -47,6 +47,25 @@ class ResearchProjectInDBBase(ResearchProjectBase):
         orm_mode = True
 
 
+# Properties to return in listings, without the results
+class ResearchProjectSummary(ResearchProjectBase):
+    id: str
+    owner_id: str
+    status: ProjectStatus
+    progress: int
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+    class Config:
+        orm_mode = True
+
+
+# Listing entry; the results are only present when requested
+class ResearchProjectListItem(ResearchProjectSummary):
+    results: Optional[Dict[str, Any]] = None
+
+
 # Additional properties to return via API
 class ResearchProject(ResearchProjectInDBBase):
     pass
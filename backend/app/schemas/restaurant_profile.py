@@ -51,6 +51,40 @@ class RestaurantProfileInDBBase(RestaurantProfileBase):
         orm_mode = True
 
 
+# Properties to return in listings, without the free-text concept and research goals
+class RestaurantProfileSummary(BaseModel):
+    id: str
+    owner_id: str
+    restaurant_name: Optional[str] = None
+    cuisine_type: Optional[str] = None
+    target_audience: Optional[str] = None
+    price_range: Optional[str] = None
+    business_type: Optional[str] = None
+    is_local_brand: Optional[bool] = True
+    street_address: Optional[str] = None
+    city: Optional[str] = None
+    state: Optional[str] = None
+    zip_code: Optional[str] = None
+    district: Optional[str] = None
+    building_name: Optional[str] = None
+    floor: Optional[str] = None
+    nearest_bts: Optional[str] = None
+    nearest_mrt: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        orm_mode = True
+
+
+# Listing entry; the concept and research goals are only present when requested
+class RestaurantProfileListItem(RestaurantProfileSummary):
+    concept_description: Optional[str] = None
+    research_goals: Optional[List[str]] = None
+
+
 # Additional properties to return via API
 class RestaurantProfile(RestaurantProfileInDBBase):
     pass
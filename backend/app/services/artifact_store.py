@@ -0,0 +1,162 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+from typing import Any, Dict, Iterator, Optional
+
+from app.core.config import settings
+
+# Bump when rendering output changes so old artifacts are not reused
+RENDER_VERSION = 1
+
+_READ_CHUNK_SIZE = 64 * 1024
+
+
+def artifact_key(document: Dict[str, Any], extension: str) -> str:
+    """
+    Content address of a rendered report.
+
+    The key hashes everything the rendered bytes depend on: the report
+    document (project, report type and results) plus the format and the
+    renderer version. Equal inputs therefore map to the same artifact.
+    """
+    payload = json.dumps(
+        [RENDER_VERSION, extension, document], sort_keys=True, separators=(",", ":"), default=str
+    )
+    return f"{hashlib.sha256(payload.encode()).hexdigest()}.{extension}"
+
+
+class LocalArtifactStore:
+    """
+    Artifacts stored as files under `root`, fanned out by key prefix.
+
+    Shareable across API nodes when `root` is on a shared volume.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key)
+
+    def local_path(self, key: str) -> Optional[str]:
+        """Path of the artifact on local disk, if it is stored there"""
+        return self.path(key)
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self.path(key))
+
+    def size(self, key: str) -> int:
+        return os.path.getsize(self.path(key))
+
+    def put_file(self, key: str, file_path: str) -> None:
+        """Store a finished file under `key`, atomically"""
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        shutil.copyfile(file_path, tmp_path)
+        os.replace(tmp_path, path)
+
+    def iter_bytes(self, key: str, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+        """Read the artifact, or the byte range `[start, end]`, in chunks"""
+        with open(self.path(key), "rb") as f:
+            f.seek(start)
+            remaining = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                chunk = f.read(_READ_CHUNK_SIZE if remaining is None else min(_READ_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self.path(key))
+        except FileNotFoundError:
+            pass
+
+
+class S3ArtifactStore:
+    """
+    Artifacts stored in an S3-compatible bucket (AWS S3, MinIO, ...).
+
+    `client` is a boto3 S3 client; by default one is created from settings,
+    with credentials taken from the standard AWS environment variables.
+    """
+
+    def __init__(self, bucket: str, prefix: str = "", client: Any = None):
+        self.bucket = bucket
+        self.prefix = prefix
+        self._client = client
+
+    @property
+    def client(self) -> Any:
+        if self._client is None:
+            import boto3
+
+            self._client = boto3.client("s3", endpoint_url=settings.ARTIFACT_S3_ENDPOINT_URL)
+        return self._client
+
+    def _object_key(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    def local_path(self, key: str) -> Optional[str]:
+        return None
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._object_key(key))
+            return True
+        except Exception as e:
+            response = getattr(e, "response", None) or {}
+            if response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    def size(self, key: str) -> int:
+        response = self.client.head_object(Bucket=self.bucket, Key=self._object_key(key))
+        return response["ContentLength"]
+
+    def put_file(self, key: str, file_path: str) -> None:
+        self.client.upload_file(file_path, self.bucket, self._object_key(key))
+
+    def iter_bytes(self, key: str, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+        kwargs = {"Bucket": self.bucket, "Key": self._object_key(key)}
+        if start or end is not None:
+            kwargs["Range"] = f"bytes={start}-{'' if end is None else end}"
+        body = self.client.get_object(**kwargs)["Body"]
+        try:
+            for chunk in iter(lambda: body.read(_READ_CHUNK_SIZE), b""):
+                yield chunk
+        finally:
+            body.close()
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self._object_key(key))
+
+
+_store: Any = None
+_store_lock = threading.Lock()
+
+
+def get_artifact_store() -> Any:
+    """
+    Get the process-wide report artifact store.
+
+    The backend is chosen by `settings.ARTIFACT_STORE_BACKEND` ("local" or "s3").
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                if settings.ARTIFACT_STORE_BACKEND == "s3":
+                    _store = S3ArtifactStore(
+                        bucket=settings.ARTIFACT_S3_BUCKET, prefix=settings.ARTIFACT_S3_PREFIX
+                    )
+                else:
+                    _store = LocalArtifactStore(
+                        settings.ARTIFACT_STORE_PATH or os.path.join(os.getcwd(), "reports")
+                    )
+    return _store
@@ -0,0 +1,161 @@
+import hashlib
+import json
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.cache import get_cache
+from app.core.config import settings
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_messages(messages: List[Dict[str, str]]) -> List[Tuple[str, str]]:
+    """Normalize a message list so trivially different requests share a key"""
+    return [
+        (message["role"], _WHITESPACE.sub(" ", message["content"]).strip().casefold())
+        for message in messages
+    ]
+
+
+def _hash(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, separators=(",", ":")).encode()).hexdigest()
+
+
+class HashingEmbedder:
+    """
+    Local text embedder using hashed character trigrams.
+
+    Good enough to match rephrasings of short FAQ-style questions, and fast
+    enough (well under a millisecond) to run on every request.
+    """
+
+    def __init__(self, dimensions: int = 512):
+        self.dimensions = dimensions
+
+    def embed(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        text = f"  {text} "
+        for i in range(len(text) - 2):
+            digest = hashlib.blake2b(text[i:i + 3].encode(), digest_size=4).digest()
+            vector[int.from_bytes(digest, "little") % self.dimensions] += 1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+class VectorIndex:
+    """
+    In-process nearest-neighbour index over unit vectors.
+
+    Vectors live in one preallocated matrix, so a search is a single
+    matrix-vector product. When full, the oldest entries are overwritten.
+    """
+
+    def __init__(self, dimensions: int, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self._vectors = np.zeros((maxsize, dimensions), dtype=np.float32)
+        self._scopes: List[Optional[str]] = [None] * maxsize
+        self._keys: List[Optional[str]] = [None] * maxsize
+        self._next = 0
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, scope: str, vector: np.ndarray, key: str) -> None:
+        with self._lock:
+            slot = self._next
+            self._vectors[slot] = vector
+            self._scopes[slot] = scope
+            self._keys[slot] = key
+            self._next = (slot + 1) % self.maxsize
+            self._size = min(self._size + 1, self.maxsize)
+
+    def search(self, scope: str, vector: np.ndarray, threshold: float) -> Optional[str]:
+        """Get the key of the most similar vector in `scope` above `threshold`"""
+        with self._lock:
+            if not self._size:
+                return None
+            scores = self._vectors[:self._size] @ vector
+            for slot in np.argsort(scores)[::-1]:
+                if scores[slot] < threshold:
+                    return None
+                if self._scopes[slot] == scope:
+                    return self._keys[slot]
+        return None
+
+
+class ChatCompletionCache:
+    """
+    Two-tier cache for chat completions.
+
+    The exact tier is keyed on the normalized message list plus the model
+    parameters. The optional similarity tier embeds the latest user message
+    and looks for a close match among earlier requests that had the same
+    context (every message before it), then serves that request's entry from
+    the exact tier.
+
+    Completions are stored as the list of streamed chunks so `/chat/stream`
+    can replay a hit chunk by chunk.
+    """
+
+    def __init__(self, semantic: bool = False, threshold: float = 0.92):
+        self.semantic = semantic
+        self.threshold = threshold
+        self.semantic_hits = 0
+        self._embedder = HashingEmbedder()
+        self._vectors = VectorIndex(self._embedder.dimensions, maxsize=settings.CHATBOT_CACHE_SIZE)
+
+    @property
+    def _store(self) -> Any:
+        return get_cache(
+            "chat_completions",
+            maxsize=settings.CHATBOT_CACHE_SIZE,
+            ttl=settings.CHATBOT_CACHE_TTL,
+        )
+
+    @staticmethod
+    def _keys(messages: List[Dict[str, str]], params: Dict[str, Any]) -> Tuple[str, str, str]:
+        normalized = normalize_messages(messages)
+        key = _hash([normalized, params])
+        scope = _hash([normalized[:-1], params])
+        last_content = normalized[-1][1] if normalized else ""
+        return key, scope, last_content
+
+    def get(self, messages: List[Dict[str, str]], params: Dict[str, Any]) -> Optional[List[str]]:
+        """Get the cached chunks for a request, or None on a miss"""
+        key, scope, last_content = self._keys(messages, params)
+        entry = self._store.get(key)
+        if entry is not None:
+            return entry
+        if not self.semantic or not last_content:
+            return None
+
+        similar_key = self._vectors.search(scope, self._embedder.embed(last_content), self.threshold)
+        if similar_key is None:
+            return None
+        entry = self._store.get(similar_key)
+        if entry is not None:
+            self.semantic_hits += 1
+        return entry
+
+    def set(self, messages: List[Dict[str, str]], params: Dict[str, Any], chunks: List[str]) -> None:
+        key, scope, last_content = self._keys(messages, params)
+        self._store.set(key, chunks)
+        if self.semantic and last_content:
+            self._vectors.add(scope, self._embedder.embed(last_content), key)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = dict(self._store.stats())
+        stats["semantic_hits"] = self.semantic_hits
+        stats["semantic_entries"] = len(self._vectors)
+        return stats
+
+
+chat_completion_cache = ChatCompletionCache(
+    semantic=settings.CHATBOT_SEMANTIC_CACHE,
+    threshold=settings.CHATBOT_SEMANTIC_THRESHOLD,
+)
@@ -0,0 +1,65 @@
+import asyncio
+from collections import deque
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Deque, Dict, List
+
+
+class StubStream:
+    """Async stream of completion chunks shaped like the OpenAI SDK's"""
+
+    def __init__(self, pieces: List[str], delay: float = 0.0):
+        self.pieces = pieces
+        self.delay = delay
+        self.closed = False
+
+    def __aiter__(self) -> AsyncIterator[Any]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[Any]:
+        for piece in self.pieces:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            delta = SimpleNamespace(content=piece)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class StubCompletions:
+    def __init__(self, latency: float = 0.0, chunk_delay: float = 0.0):
+        self.latency = latency
+        self.chunk_delay = chunk_delay
+        self.calls = 0
+        # The latest streams, for tests to inspect; bounded so load tests don't grow it
+        self.streams: Deque[StubStream] = deque(maxlen=16)
+
+    def _reply(self, messages: List[Dict[str, str]]) -> List[str]:
+        question = next(
+            (message["content"] for message in reversed(messages) if message["role"] == "user"), ""
+        )
+        return ["BiteBase AI", " (stub)", f" answering: {question}"]
+
+    async def create(self, *, messages: List[Dict[str, str]], stream: bool = False, **kwargs: Any) -> Any:
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        pieces = self._reply(messages)
+        if stream:
+            stub_stream = StubStream(pieces, delay=self.chunk_delay)
+            self.streams.append(stub_stream)
+            return stub_stream
+        message = SimpleNamespace(content="".join(pieces))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+class StubChatClient:
+    """
+    Local stand-in for `AsyncOpenAI` used in tests and load tests.
+
+    Replies deterministically by echoing the last user message, with optional
+    simulated model latency, and never touches the network.
+    """
+
+    def __init__(self, latency: float = 0.0, chunk_delay: float = 0.0):
+        self.chat = SimpleNamespace(completions=StubCompletions(latency, chunk_delay))
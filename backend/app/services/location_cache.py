@@ -0,0 +1,61 @@
+import math
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.core.cache import get_cache
+from app.core.config import settings
+
+
+def _location_cache() -> Any:
+    return get_cache(
+        "location",
+        maxsize=settings.LOCATION_CACHE_SIZE,
+        ttl=settings.LOCATION_CACHE_TTL,
+    )
+
+
+def quantize_location(
+    latitude: float, longitude: float, radius: Optional[float] = None
+) -> Tuple[float, float, Optional[float]]:
+    """
+    Snap a coordinate to the center of its cache tile and a radius to its bucket.
+
+    Dashboard requests jitter by a few meters; quantizing them first lets those
+    requests share one cached response, which is computed for the tile center.
+    """
+    tile = settings.LOCATION_CACHE_TILE_SIZE
+    latitude = round((math.floor(latitude / tile) + 0.5) * tile, 6)
+    longitude = round((math.floor(longitude / tile) + 0.5) * tile, 6)
+    if radius is not None:
+        step = settings.LOCATION_CACHE_RADIUS_STEP
+        radius = max(step, round(radius / step) * step)
+    return latitude, longitude, radius
+
+
+def cached_location_call(
+    kind: str,
+    func: Callable[..., Dict[str, Any]],
+    latitude: float,
+    longitude: float,
+    radius: Optional[float] = None,
+    *args: Any,
+) -> Dict[str, Any]:
+    """
+    Call a location service function through the tile-keyed response cache.
+
+    `func` is called as `func(latitude, longitude, radius, *args)` (or without
+    `radius` when it is None) using the quantized coordinate and radius.
+    """
+    latitude, longitude, radius = quantize_location(latitude, longitude, radius)
+    key = ":".join(str(part).lower() for part in (kind, latitude, longitude, radius, *args))
+
+    cache = _location_cache()
+    result = cache.get(key)
+    if result is not None:
+        return result
+
+    if radius is None:
+        result = func(latitude, longitude, *args)
+    else:
+        result = func(latitude, longitude, radius, *args)
+    cache.set(key, result)
+    return result
@@ -1,9 +1,34 @@
 import random
-from typing import Dict, Any, List, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
 import json
 
+from app.core.cache import get_cache
 from app.core.config import settings
+from app.services.place_index import get_place_index, haversine_km
+
+# Place types used by the accessibility and visibility scores
+TRANSIT_TYPES = ["bus_station", "subway_station", "train_station"]
+PARKING_TYPES = ["parking"]
+HIGH_TRAFFIC_TYPES = ["store", "shopping_mall", "tourist_attraction"]
+
+# Shared keep-alive session and bounded worker pool for Google Places calls
+_http_session = requests.Session()
+_http_session.mount(
+    "https://",
+    HTTPAdapter(pool_connections=4, pool_maxsize=settings.PLACES_DETAILS_MAX_WORKERS),
+)
+_details_executor = ThreadPoolExecutor(
+    max_workers=settings.PLACES_DETAILS_MAX_WORKERS, thread_name_prefix="places-details"
+)
+_place_details_cache = get_cache(
+    "place_details",
+    maxsize=settings.PLACES_DETAILS_CACHE_SIZE,
+    ttl=settings.PLACES_DETAILS_CACHE_TTL,
+)
 
 
 def get_location_data(latitude: float, longitude: float, radius: float) -> Dict[str, Any]:
@@ -13,6 +38,12 @@ def get_location_data(latitude: float, longitude: float, radius: float) -> Dict[
     In a real implementation, this would integrate with various APIs
     to get real location data. This is a mock implementation.
     """
+    # Serve from the local place store if it covers this area
+    place_index = get_place_index()
+    if place_index.covers(latitude, longitude, radius):
+        places = [place for place, _ in place_index.query_radius(latitude, longitude, radius)]
+        return _build_location_data(latitude, longitude, places)
+
     # Try to get real data if API keys are available
     if settings.GOOGLE_PLACES_API_KEY:
         try:
@@ -47,6 +78,15 @@ def get_nearby_competitors(
     In a real implementation, this would use Google Places API or Yelp API
     to get real competitor data. This is a mock implementation.
     """
+    # Serve from the local place store if it covers this area
+    place_index = get_place_index()
+    if place_index.covers(latitude, longitude, radius):
+        places = _filter_competitors(
+            [place for place, _ in place_index.query_radius(latitude, longitude, radius)],
+            cuisine_type,
+        )
+        return _build_competitors_data(latitude, longitude, places)
+
     # Try to get real data if API keys are available
     if settings.GOOGLE_PLACES_API_KEY:
         try:
@@ -69,6 +109,66 @@ def get_nearby_competitors(
     }
 
 
+def score_locations(coordinates: List[Tuple[float, float]], radius: float) -> List[Dict[str, Any]]:
+    """
+    Score many candidate sites at once against the local place store.
+    
+    Distances and per-type counts are computed as NumPy arrays over the
+    place store's columnar table, using the same formulas as
+    `_calculate_location_score`, `_calculate_accessibility` and
+    `_calculate_visibility`. No external APIs are called, so sites outside
+    the loaded place data score as if they had no nearby places.
+    """
+    count = len(coordinates)
+    if not count:
+        return []
+    
+    table = get_place_index().table()
+    latitudes = np.fromiter((c[0] for c in coordinates), dtype=float, count=count)
+    longitudes = np.fromiter((c[1] for c in coordinates), dtype=float, count=count)
+    site_idx, place_idx, _ = table.pairs_within(latitudes, longitudes, radius)
+    
+    def per_site(weights: Optional[np.ndarray] = None) -> np.ndarray:
+        return np.bincount(site_idx, weights=weights, minlength=count).astype(float)
+    
+    places = per_site()
+    rating_sum = per_site(table.rating[place_idx])
+    reviews_sum = per_site(table.reviews[place_idx])
+    transit = per_site(table.type_mask(TRANSIT_TYPES)[place_idx].astype(float))
+    parking = per_site(table.type_mask(PARKING_TYPES)[place_idx].astype(float))
+    high_traffic = per_site(table.type_mask(HIGH_TRAFFIC_TYPES)[place_idx].astype(float))
+    
+    has_places = places > 0
+    average_rating = np.divide(rating_sum, places, out=np.zeros(count), where=has_places)
+    location_score = np.where(
+        has_places,
+        np.minimum(np.round(50 + places * 2 + average_rating * 5 + np.minimum(reviews_sum / 1000, 10), 1), 95.0),
+        50.0,
+    )
+    rng = np.random.default_rng()
+    public_transport = np.where(transit > 0, np.minimum(np.round(transit / 2, 1), 5.0), rng.uniform(1, 3, count))
+    walking = np.minimum(np.round(places / 10, 1), 5.0)
+    parking_score = np.where(parking > 0, np.minimum(np.round(parking, 1), 5.0), rng.uniform(1, 3, count))
+    visibility = np.where(has_places, np.minimum(np.round(high_traffic / 2, 1), 5.0), 3.0)
+    
+    results = []
+    for i, (latitude, longitude) in enumerate(coordinates):
+        results.append({
+            "latitude": latitude,
+            "longitude": longitude,
+            "location_score": float(location_score[i]),
+            "nearby_places_count": int(places[i]),
+            "accessibility": {
+                "public_transport": float(public_transport[i]),
+                "walking": float(walking[i]),
+                "parking": float(parking_score[i]),
+            },
+            "visibility": float(visibility[i]),
+        })
+    
+    return results
+
+
 def get_foot_traffic(latitude: float, longitude: float) -> Dict[str, Any]:
     """
     Get foot traffic data for a given location.
@@ -246,36 +346,15 @@ def _get_google_places_data(latitude: float, longitude: float, radius: float) ->
         "key": settings.GOOGLE_PLACES_API_KEY
     }
     
-    response = requests.get(url, params=params)
+    response = _http_session.get(url, params=params, timeout=settings.PLACES_HTTP_TIMEOUT)
     data = response.json()
     
     if data["status"] != "OK":
         raise ValueError(f"Google Places API error: {data['status']}")
     
-    # Process the data into our format
-    nearby_places = []
-    for place in data["results"]:
-        nearby_places.append({
-            "name": place["name"],
-            "type": place.get("types", ["unknown"])[0],
-            "distance": _calculate_distance(
-                latitude, longitude, 
-                place["geometry"]["location"]["lat"], 
-                place["geometry"]["location"]["lng"]
-            ),
-            "popularity": place.get("user_ratings_total", 0) / 100 if place.get("user_ratings_total") else 1,
-        })
-    
-    return {
-        "location_score": _calculate_location_score(data["results"]),
-        "nearby_places": nearby_places,
-        "accessibility": _calculate_accessibility(data["results"]),
-        "visibility": _calculate_visibility(data["results"]),
-        # We don't have real foot traffic data from Google Places
-        "foot_traffic": _generate_mock_foot_traffic(),
-        # We'll get competitors separately
-        "competitors": [],
-    }
+    # Score the area from this search only, so the answer doesn't depend on
+    # which earlier searches this process happened to see
+    return _build_location_data(latitude, longitude, data["results"])
 
 
 def _get_google_places_competitors(
@@ -296,25 +375,85 @@ def _get_google_places_competitors(
     if cuisine_type:
         params["keyword"] = cuisine_type
     
-    response = requests.get(url, params=params)
+    response = _http_session.get(url, params=params, timeout=settings.PLACES_HTTP_TIMEOUT)
     data = response.json()
     
     if data["status"] != "OK":
         raise ValueError(f"Google Places API error: {data['status']}")
     
-    # Process the data into our format
+    # Answer from this search only: Google already matched the cuisine keyword
+    places = _filter_competitors(data["results"])
+    
+    # Get place details to get popular dishes
+    place_details = _get_place_details_batch(place["place_id"] for place in places if place.get("place_id"))
+    
+    return _build_competitors_data(latitude, longitude, places, place_details)
+
+
+def _build_location_data(latitude: float, longitude: float, places: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Build the location analysis response from a list of nearby places"""
+    nearby_places = []
+    for place in places:
+        nearby_places.append({
+            "name": place["name"],
+            "type": place.get("types", ["unknown"])[0],
+            "distance": _calculate_distance(
+                latitude, longitude, 
+                place["geometry"]["location"]["lat"], 
+                place["geometry"]["location"]["lng"]
+            ),
+            "popularity": place.get("user_ratings_total", 0) / 100 if place.get("user_ratings_total") else 1,
+        })
+    
+    return {
+        "location_score": _calculate_location_score(places),
+        "nearby_places": nearby_places,
+        "accessibility": _calculate_accessibility(places),
+        "visibility": _calculate_visibility(places),
+        # We don't have real foot traffic data from Google Places
+        "foot_traffic": _generate_mock_foot_traffic(),
+        # We'll get competitors separately
+        "competitors": [],
+    }
+
+
+def _filter_competitors(places: List[Dict[str, Any]], cuisine_type: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Keep only restaurants, optionally matching a cuisine keyword"""
+    competitors = [place for place in places if "restaurant" in place.get("types", [])]
+    if cuisine_type:
+        keyword = cuisine_type.lower()
+        competitors = [
+            place for place in competitors
+            if keyword in place.get("name", "").lower()
+            or any(keyword in t for t in place.get("types", []))
+        ]
+    return competitors
+
+
+def _build_competitors_data(
+    latitude: float,
+    longitude: float,
+    places: List[Dict[str, Any]],
+    place_details: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """
+    Build the competitors response from a list of nearby restaurants.
+    
+    `place_details` maps place_id to a Place Details response. Places without
+    details fall back to any reviews stored on the place itself.
+    """
+    place_details = place_details or {}
     competitors = []
     price_levels = {"$": 0, "$$": 0, "$$$": 0, "$$$$": 0}
     total_rating = 0
     
-    for place in data["results"]:
+    for place in places:
         price_level = "$" * (place.get("price_level", 1) or 1)
         price_levels[price_level] += 1
         total_rating += place.get("rating", 0)
         
-        # Get place details to get popular dishes
-        place_details = _get_place_details(place["place_id"])
-        popular_dishes = _extract_popular_dishes(place_details)
+        details = place_details.get(place.get("place_id"), {"result": place})
+        popular_dishes = _extract_popular_dishes(details)
         
         competitors.append({
             "name": place["name"],
@@ -331,7 +470,7 @@ def _get_google_places_competitors(
         })
     
     # Calculate price level distribution percentages
-    total_places = len(data["results"])
+    total_places = len(places)
     if total_places > 0:
         for level in price_levels:
             price_levels[level] = round((price_levels[level] / total_places) * 100)
@@ -356,10 +495,42 @@ def _get_place_details(place_id: str) -> Dict[str, Any]:
         "key": settings.GOOGLE_PLACES_API_KEY
     }
     
-    response = requests.get(url, params=params)
+    response = _http_session.get(url, params=params, timeout=settings.PLACES_HTTP_TIMEOUT)
     return response.json()
 
 
+def _get_place_details_batch(place_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Get place details for many places at once.
+    
+    Details are served from a per-place_id TTL cache where possible; the rest
+    are fetched concurrently on the shared worker pool. Places whose details
+    could not be fetched are left out of the result.
+    """
+    details = {}
+    missing = []
+    for place_id in dict.fromkeys(place_ids):
+        cached = _place_details_cache.get(place_id)
+        if cached is None:
+            missing.append(place_id)
+        else:
+            details[place_id] = cached
+    
+    futures = {_details_executor.submit(_get_place_details, place_id): place_id for place_id in missing}
+    for future in as_completed(futures):
+        place_id = futures[future]
+        try:
+            place_details = future.result()
+        except Exception as e:
+            print(f"Error getting place details for {place_id}: {str(e)}")
+            continue
+        if place_details.get("status") == "OK":
+            _place_details_cache.set(place_id, place_details)
+        details[place_id] = place_details
+    
+    return details
+
+
 def _extract_popular_dishes(place_details: Dict[str, Any]) -> List[str]:
     """Extract popular dishes from place reviews"""
     popular_dishes = []
@@ -403,9 +574,8 @@ def _extract_cuisine_type(place: Dict[str, Any]) -> str:
 
 
 def _calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    """Calculate distance between two coordinates in km (simplified)"""
-    # This is a simplified calculation - in a real implementation, use haversine formula
-    return round(((lat1 - lat2) ** 2 + (lon1 - lon2) ** 2) ** 0.5 * 111, 1)  # 111 km per degree
+    """Calculate distance between two coordinates in km"""
+    return round(float(haversine_km(lat1, lon1, lat2, lon2)), 1)
 
 
 def _calculate_location_score(places: List[Dict[str, Any]]) -> float:
@@ -425,8 +595,8 @@ def _calculate_location_score(places: List[Dict[str, Any]]) -> float:
 def _calculate_accessibility(places: List[Dict[str, Any]]) -> Dict[str, float]:
     """Calculate accessibility scores based on nearby places"""
     # This is a simplified calculation - in a real implementation, use more factors
-    transit_count = sum(1 for place in places if any(t in ["bus_station", "subway_station", "train_station"] for t in place.get("types", [])))
-    parking_count = sum(1 for place in places if any(t in ["parking"] for t in place.get("types", [])))
+    transit_count = sum(1 for place in places if any(t in TRANSIT_TYPES for t in place.get("types", [])))
+    parking_count = sum(1 for place in places if any(t in PARKING_TYPES for t in place.get("types", [])))
     
     return {
         "public_transport": min(round(transit_count / 2, 1), 5.0) if transit_count else random.uniform(1, 3),
@@ -442,7 +612,7 @@ def _calculate_visibility(places: List[Dict[str, Any]]) -> float:
         return 3.0
     
     # More high-traffic places nearby indicate better visibility
-    high_traffic_places = sum(1 for place in places if any(t in ["store", "shopping_mall", "tourist_attraction"] for t in place.get("types", [])))
+    high_traffic_places = sum(1 for place in places if any(t in HIGH_TRAFFIC_TYPES for t in place.get("types", [])))
     return min(round(high_traffic_places / 2, 1), 5.0)
 
 
@@ -0,0 +1,325 @@
+import json
+import math
+import os
+import threading
+from collections import defaultdict
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = 111.32
+
+
+def haversine_km(
+    lat1: float, lon1: float, lat2: Any, lon2: Any
+) -> Any:
+    """
+    Great-circle distance in km between one point and one or many points.
+
+    `lat2`/`lon2` may be scalars or NumPy arrays, in which case an array of
+    distances is returned.
+    """
+    lat1_r, lon1_r = np.radians(lat1), np.radians(lon1)
+    lat2_r, lon2_r = np.radians(lat2), np.radians(lon2)
+    dlat = lat2_r - lat1_r
+    dlon = lon2_r - lon1_r
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1_r) * np.cos(lat2_r) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+class PlaceTable:
+    """
+    Columnar, read-only snapshot of a PlaceIndex for vectorized scoring.
+
+    Places are sorted by grid cell so each cell is a contiguous slice of the
+    column arrays, which lets candidate pairs for many query points be
+    gathered without touching per-place Python objects.
+    """
+
+    def __init__(self, places: List[Dict[str, Any]], lats: List[float], lngs: List[float], cell_size: float):
+        self.cell_size = cell_size
+        lat_arr = np.asarray(lats, dtype=float)
+        lng_arr = np.asarray(lngs, dtype=float)
+        cell_lat = np.floor(lat_arr / cell_size).astype(np.int64)
+        cell_lng = np.floor(lng_arr / cell_size).astype(np.int64)
+        order = np.lexsort((cell_lng, cell_lat))
+
+        self.lat = lat_arr[order]
+        self.lng = lng_arr[order]
+        self.rating = np.fromiter(
+            (places[i].get("rating", 0) or 0 for i in order), dtype=float, count=len(order)
+        )
+        self.reviews = np.fromiter(
+            (places[i].get("user_ratings_total", 0) or 0 for i in order), dtype=float, count=len(order)
+        )
+        self._types = [places[i].get("types", []) for i in order]
+        self._type_masks: Dict[frozenset, np.ndarray] = {}
+
+        self._cells: Dict[Tuple[int, int], Tuple[int, int]] = {}
+        if len(order):
+            sorted_lat = cell_lat[order]
+            sorted_lng = cell_lng[order]
+            boundaries = np.flatnonzero(
+                (np.diff(sorted_lat) != 0) | (np.diff(sorted_lng) != 0)
+            ) + 1
+            starts = np.concatenate(([0], boundaries))
+            ends = np.concatenate((boundaries, [len(order)]))
+            for start, end in zip(starts.tolist(), ends.tolist()):
+                self._cells[(int(sorted_lat[start]), int(sorted_lng[start]))] = (start, end)
+
+    def __len__(self) -> int:
+        return len(self.lat)
+
+    def type_mask(self, types: Iterable[str]) -> np.ndarray:
+        """Boolean array marking places that have any of the given types."""
+        key = frozenset(types)
+        mask = self._type_masks.get(key)
+        if mask is None:
+            mask = np.fromiter(
+                (not key.isdisjoint(place_types) for place_types in self._types),
+                dtype=bool,
+                count=len(self._types),
+            )
+            self._type_masks[key] = mask
+        return mask
+
+    def pairs_within(
+        self, latitudes: np.ndarray, longitudes: np.ndarray, radius: float
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Find every (query point, place) pair within `radius` km.
+
+        Returns `(point_idx, place_idx, distance_km)` arrays of equal length.
+        """
+        empty = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0, dtype=float))
+        if not len(self) or not len(latitudes):
+            return empty
+
+        point_chunks = []
+        place_chunks = []
+        for point, (latitude, longitude) in enumerate(zip(latitudes.tolist(), longitudes.tolist())):
+            dlat = radius / KM_PER_DEGREE_LAT
+            dlng = radius / (KM_PER_DEGREE_LAT * max(math.cos(math.radians(latitude)), 1e-6))
+            min_lat = int(math.floor((latitude - dlat) / self.cell_size))
+            max_lat = int(math.floor((latitude + dlat) / self.cell_size))
+            min_lng = int(math.floor((longitude - dlng) / self.cell_size))
+            max_lng = int(math.floor((longitude + dlng) / self.cell_size))
+            for cell_lat in range(min_lat, max_lat + 1):
+                for cell_lng in range(min_lng, max_lng + 1):
+                    span = self._cells.get((cell_lat, cell_lng))
+                    if span:
+                        place_chunks.append(np.arange(span[0], span[1]))
+                        point_chunks.append(np.full(span[1] - span[0], point))
+        if not place_chunks:
+            return empty
+
+        point_idx = np.concatenate(point_chunks)
+        place_idx = np.concatenate(place_chunks)
+        distances = haversine_km(
+            latitudes[point_idx], longitudes[point_idx], self.lat[place_idx], self.lng[place_idx]
+        )
+        within = distances <= radius
+        return point_idx[within], place_idx[within], distances[within]
+
+
+class PlaceIndex:
+    """
+    In-memory store of places bucketed into fixed-size lat/lng grid cells.
+
+    Places are stored in the Google Places "nearbysearch" result shape
+    (`place_id`, `name`, `types`, `geometry.location`, ...) so the scoring
+    helpers in `location_intelligence` can run over them unchanged.
+
+    A radius query only visits the cells overlapping the query circle and
+    then filters those candidates with a vectorized haversine, so query cost
+    depends on local density rather than on the total number of places.
+    """
+
+    def __init__(self, cell_size: float = 0.01):
+        # 0.01 degrees is roughly 1.1 km at Bangkok's latitude
+        self.cell_size = cell_size
+        self._version = 0
+        self._table: Optional[PlaceTable] = None
+        self._table_version = -1
+        self._places: List[Dict[str, Any]] = []
+        self._lats: List[float] = []
+        self._lngs: List[float] = []
+        self._ids: Dict[str, int] = {}
+        self._cells: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        self._covered: Set[Tuple[int, int]] = set()
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _cell(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        return (
+            int(math.floor(latitude / self.cell_size)),
+            int(math.floor(longitude / self.cell_size)),
+        )
+
+    def _cell_range(
+        self, latitude: float, longitude: float, radius: float
+    ) -> Iterable[Tuple[int, int]]:
+        """Yield every grid cell overlapping the bounding box of a query circle."""
+        dlat = radius / KM_PER_DEGREE_LAT
+        dlng = radius / (KM_PER_DEGREE_LAT * max(math.cos(math.radians(latitude)), 1e-6))
+        min_cell = self._cell(latitude - dlat, longitude - dlng)
+        max_cell = self._cell(latitude + dlat, longitude + dlng)
+        for cell_lat in range(min_cell[0], max_cell[0] + 1):
+            for cell_lng in range(min_cell[1], max_cell[1] + 1):
+                yield cell_lat, cell_lng
+
+    def add(self, place: Dict[str, Any]) -> None:
+        """Insert or replace a single place, keyed on its `place_id`."""
+        location = place["geometry"]["location"]
+        latitude, longitude = float(location["lat"]), float(location["lng"])
+        place_id = place.get("place_id") or f"{latitude},{longitude},{place.get('name')}"
+
+        with self._lock:
+            idx = self._ids.get(place_id)
+            if idx is not None:
+                old_cell = self._cell(self._lats[idx], self._lngs[idx])
+                new_cell = self._cell(latitude, longitude)
+                if old_cell != new_cell:
+                    self._cells[old_cell].remove(idx)
+                    self._cells[new_cell].append(idx)
+                self._places[idx] = place
+                self._lats[idx] = latitude
+                self._lngs[idx] = longitude
+                self._version += 1
+                return
+
+            idx = len(self._places)
+            self._ids[place_id] = idx
+            self._places.append(place)
+            self._lats.append(latitude)
+            self._lngs.append(longitude)
+            self._cells[self._cell(latitude, longitude)].append(idx)
+            self._version += 1
+
+    def add_many(self, places: Iterable[Dict[str, Any]]) -> int:
+        """Insert or replace many places. Returns the number of places processed."""
+        count = 0
+        with self._lock:
+            for place in places:
+                self.add(place)
+                count += 1
+        return count
+
+    def bulk_load(self, places: Iterable[Dict[str, Any]]) -> int:
+        """
+        Load an authoritative set of places.
+
+        Unlike `add_many`, the grid cells holding the loaded places are
+        recorded so that `covers` can tell callers when a query can be
+        answered locally without falling back to an external API.
+        """
+        with self._lock:
+            start = len(self._places)
+            count = self.add_many(places)
+            self._covered.update(
+                self._cell(latitude, longitude)
+                for latitude, longitude in zip(self._lats[start:], self._lngs[start:])
+            )
+        return count
+
+    def covers(self, latitude: float, longitude: float, radius: float) -> bool:
+        """
+        Return True if every cell the query circle touches holds bulk-loaded data.
+
+        Cells without loaded places count as uncovered, so a gap between two
+        loaded areas (or an empty patch inside one) falls back to the API
+        instead of getting an empty local answer.
+        """
+        with self._lock:
+            if not self._covered:
+                return False
+            return all(cell in self._covered for cell in self._cell_range(latitude, longitude, radius))
+
+    def query_radius(
+        self, latitude: float, longitude: float, radius: float
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Get all places within `radius` km of a coordinate.
+
+        Returns a list of `(place, distance_km)` tuples sorted by distance.
+        """
+        with self._lock:
+            candidates: List[int] = []
+            for cell_key in self._cell_range(latitude, longitude, radius):
+                cell = self._cells.get(cell_key)
+                if cell:
+                    candidates.extend(cell)
+            if not candidates:
+                return []
+
+            lats = np.fromiter((self._lats[i] for i in candidates), dtype=float, count=len(candidates))
+            lngs = np.fromiter((self._lngs[i] for i in candidates), dtype=float, count=len(candidates))
+            distances = haversine_km(latitude, longitude, lats, lngs)
+            within = np.nonzero(distances <= radius)[0]
+            within = within[np.argsort(distances[within], kind="stable")]
+            return [(self._places[candidates[i]], float(distances[i])) for i in within]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._places.clear()
+            self._lats.clear()
+            self._lngs.clear()
+            self._ids.clear()
+            self._cells.clear()
+            self._covered.clear()
+            self._version += 1
+
+    def table(self) -> PlaceTable:
+        """
+        Get a columnar snapshot of the index for vectorized scoring.
+
+        The snapshot is rebuilt lazily after the index changes.
+        """
+        with self._lock:
+            if self._table is None or self._table_version != self._version:
+                self._table = PlaceTable(self._places, self._lats, self._lngs, self.cell_size)
+                self._table_version = self._version
+            return self._table
+
+
+def load_places_file(path: str) -> List[Dict[str, Any]]:
+    """
+    Load places from a JSON array or a JSON-lines file.
+
+    Each record must be in the Google Places result shape.
+    """
+    with open(path) as f:
+        if path.endswith(".jsonl"):
+            return [json.loads(line) for line in f if line.strip()]
+        return json.load(f)
+
+
+_place_index: Optional[PlaceIndex] = None
+_place_index_lock = threading.Lock()
+
+
+def get_place_index() -> PlaceIndex:
+    """
+    Get the process-wide place index.
+
+    On first use the index is bulk-loaded from `settings.PLACE_STORE_PATH`
+    if it is configured.
+    """
+    global _place_index
+    if _place_index is None:
+        with _place_index_lock:
+            if _place_index is None:
+                index = PlaceIndex(cell_size=settings.PLACE_INDEX_CELL_SIZE)
+                if settings.PLACE_STORE_PATH and os.path.exists(settings.PLACE_STORE_PATH):
+                    try:
+                        count = index.bulk_load(load_places_file(settings.PLACE_STORE_PATH))
+                        print(f"Loaded {count} places from {settings.PLACE_STORE_PATH}")
+                    except Exception as e:
+                        print(f"Error loading place store: {str(e)}")
+                _place_index = index
+    return _place_index
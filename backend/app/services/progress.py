@@ -0,0 +1,279 @@
+import asyncio
+import json
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from app.core.config import settings
+
+
+class _MemorySubscription:
+    """Events for one listener, handed from publishing threads to its event loop"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self._queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+
+    def put(self, event: Dict[str, Any]) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, event)
+        except RuntimeError:
+            # The listener's event loop is already closed
+            pass
+
+    async def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class MemoryProgressBroker:
+    """
+    In-process store for the live progress of research projects.
+
+    Only visible to the process that publishes, so it suits eager Celery
+    (tests, single-process deployments). Use the Redis broker when tasks run
+    on separate worker nodes.
+    """
+
+    def __init__(self, ttl: float = 3600):
+        self.ttl = ttl
+        self._states: Dict[str, tuple] = {}
+        self._subscribers: Dict[str, List["_MemorySubscription"]] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, project_id: str, state: Dict[str, Any], event: Dict[str, Any]) -> None:
+        with self._lock:
+            self._states[project_id] = (time.monotonic() + self.ttl, state)
+            subscribers = list(self._subscribers.get(project_id, ()))
+        for subscription in subscribers:
+            subscription.put(event)
+
+    @asynccontextmanager
+    async def subscribe(self, project_id: str) -> AsyncIterator["_MemorySubscription"]:
+        subscription = _MemorySubscription(asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.setdefault(project_id, []).append(subscription)
+        try:
+            yield subscription
+        finally:
+            with self._lock:
+                subscribers = self._subscribers.get(project_id, [])
+                if subscription in subscribers:
+                    subscribers.remove(subscription)
+                if not subscribers:
+                    self._subscribers.pop(project_id, None)
+
+    def get_state(self, project_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._states.get(project_id)
+            if entry is None or entry[0] < time.monotonic():
+                self._states.pop(project_id, None)
+                return None
+            return entry[1]
+
+
+class RedisProgressBroker:
+    """
+    Live progress of research projects shared through Redis.
+
+    The latest state of each project is kept under one key, which is
+    overwritten on every update, and each event is also sent on a pub/sub
+    channel for listeners that want to be pushed updates. Redis errors are
+    logged and ignored so progress reporting never fails an analysis.
+    """
+
+    def __init__(self, prefix: str = "bitebase:progress", ttl: float = 3600, client: Any = None):
+        self.prefix = prefix
+        self.ttl = ttl
+        self._client = client
+
+    @property
+    def client(self) -> Any:
+        if self._client is None:
+            import redis
+
+            self._client = redis.Redis(
+                host=settings.REDIS_HOST,
+                port=settings.REDIS_PORT,
+                db=settings.REDIS_CACHE_DB,
+                socket_connect_timeout=settings.REDIS_CACHE_TIMEOUT,
+            )
+        return self._client
+
+    def state_key(self, project_id: str) -> str:
+        return f"{self.prefix}:{project_id}"
+
+    def channel(self, project_id: str) -> str:
+        return f"{self.prefix}:{project_id}:events"
+
+    def publish(self, project_id: str, state: Dict[str, Any], event: Dict[str, Any]) -> None:
+        try:
+            pipe = self.client.pipeline()
+            pipe.set(self.state_key(project_id), json.dumps(state), ex=int(self.ttl))
+            pipe.publish(self.channel(project_id), json.dumps(event))
+            pipe.execute()
+        except Exception as e:
+            print(f"Redis progress publish error: {str(e)}")
+
+    def get_state(self, project_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            raw = self.client.get(self.state_key(project_id))
+        except Exception as e:
+            print(f"Redis progress get error: {str(e)}")
+            return None
+        return json.loads(raw) if raw is not None else None
+
+    @asynccontextmanager
+    async def subscribe(self, project_id: str) -> AsyncIterator["_RedisSubscription"]:
+        import redis.asyncio
+
+        client = redis.asyncio.Redis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_CACHE_DB,
+            socket_connect_timeout=settings.REDIS_CACHE_TIMEOUT,
+        )
+        pubsub = client.pubsub()
+        try:
+            await pubsub.subscribe(self.channel(project_id))
+            yield _RedisSubscription(pubsub)
+        finally:
+            await pubsub.reset()
+            await client.aclose()
+
+
+class _RedisSubscription:
+    def __init__(self, pubsub: Any):
+        self._pubsub = pubsub
+
+    async def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+        if message is None:
+            return None
+        return json.loads(message["data"])
+
+
+_broker: Any = None
+_broker_lock = threading.Lock()
+
+
+def get_progress_broker() -> Any:
+    """
+    Get the process-wide progress broker.
+
+    The backend is chosen by `settings.PROGRESS_BACKEND` ("memory" or "redis"),
+    which is redis unless Celery runs tasks eagerly in this process.
+    """
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                if settings.PROGRESS_BACKEND == "redis":
+                    _broker = RedisProgressBroker(ttl=settings.PROGRESS_TTL)
+                else:
+                    _broker = MemoryProgressBroker(ttl=settings.PROGRESS_TTL)
+    return _broker
+
+
+def get_project_progress(project_id: str) -> Optional[Dict[str, Any]]:
+    """Get the live progress state of a research project, if it is running."""
+    return get_progress_broker().get_state(project_id)
+
+
+TERMINAL_EVENTS = ("completed", "failed")
+
+
+def _sse(event_type: str, data: Dict[str, Any]) -> str:
+    return f"event: {event_type}\ndata: {json.dumps(data)}\n\n"
+
+
+def _is_finished(state: Dict[str, Any]) -> bool:
+    return state.get("status") == "completed" or state.get("progress") == -1
+
+
+async def progress_events(
+    project_id: str,
+    snapshot: Dict[str, Any],
+    is_disconnected: Callable[[], Awaitable[bool]],
+) -> AsyncIterator[str]:
+    """
+    Server-sent events for a research project run.
+
+    Starts with a `snapshot` event holding the current state (the live state
+    if the run has published any, otherwise `snapshot`), then relays each
+    published event until the run finishes or the client goes away. A
+    comment line is sent when idle so proxies keep the connection open.
+    """
+    broker = get_progress_broker()
+    # Subscribe before reading the state so no event falls in between
+    async with broker.subscribe(project_id) as subscription:
+        state = await asyncio.get_running_loop().run_in_executor(None, broker.get_state, project_id)
+        state = dict(state or snapshot, project_id=project_id)
+        yield _sse("snapshot", state)
+        if _is_finished(state):
+            return
+
+        while not await is_disconnected():
+            event = await subscription.get(timeout=settings.PROGRESS_HEARTBEAT_INTERVAL)
+            if event is None:
+                yield ": keep-alive\n\n"
+                continue
+            yield _sse(event["type"], event)
+            if event["type"] in TERMINAL_EVENTS:
+                return
+
+
+class ProgressReporter:
+    """
+    Publishes the progress of one research project run.
+
+    Progress updates are coalesced: a bare progress change is only sent if
+    `min_interval` seconds have passed since the last one, while stage and
+    completion events are always sent. The project row is not touched.
+    """
+
+    def __init__(self, project_id: str, broker: Any = None, min_interval: Optional[float] = None):
+        self.project_id = project_id
+        self.broker = broker or get_progress_broker()
+        self.min_interval = settings.PROGRESS_MIN_INTERVAL if min_interval is None else min_interval
+        self.status = "in_progress"
+        self.progress = 0
+        self.stages_completed: List[str] = []
+        self._last_sent = 0.0
+
+    def _state(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "progress": self.progress,
+            "stages_completed": list(self.stages_completed),
+        }
+
+    def _send(self, event: Dict[str, Any]) -> None:
+        self._last_sent = time.monotonic()
+        event = dict(event, project_id=self.project_id, progress=self.progress, status=self.status)
+        self.broker.publish(self.project_id, self._state(), event)
+
+    def update(self, progress: int) -> None:
+        if progress == self.progress:
+            return
+        self.progress = progress
+        if time.monotonic() - self._last_sent >= self.min_interval:
+            self._send({"type": "progress"})
+
+    def stage_completed(self, stage: str, progress: int) -> None:
+        self.progress = progress
+        self.stages_completed.append(stage)
+        self._send({"type": "stage_completed", "stage": stage})
+
+    def completed(self) -> None:
+        self.status = "completed"
+        self.progress = 100
+        self._send({"type": "completed"})
+
+    def failed(self, error: str) -> None:
+        # Matches how failures are stored on the project row
+        self.progress = -1
+        self._send({"type": "failed", "error": error})
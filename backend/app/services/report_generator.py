@@ -1,22 +1,27 @@
+import csv
+import gzip
+import io
 import json
 import os
-import time
-from typing import Dict, Any, Optional
-from datetime import datetime
-import random
+import shutil
+import tempfile
+from typing import Dict, Any, Iterable, Iterator, Optional
 
 from sqlalchemy.orm import Session
 
 from app import crud, models
-from app.models.report import Report, ReportFormat
+from app.core.config import settings
+from app.models.report import Report, ReportFormat, ReportType
+from app.services.artifact_store import artifact_key, get_artifact_store
+from app.services.report_rendering import flatten_data, render_report
 
 
 def generate_report(db: Session, report_id: str, user_id: str) -> None:
     """
     Generate a report file.
     
-    In a real implementation, this would generate actual reports in various formats.
-    This is a simplified mock implementation.
+    JSON and CSV reports are rendered incrementally from the project results;
+    Excel and PDF reports are rendered in the report rendering process pool.
     """
     try:
         # Get the report
@@ -31,154 +36,210 @@ def generate_report(db: Session, report_id: str, user_id: str) -> None:
             print(f"Research project {report.research_project_id} not found")
             return
         
-        # Simulate report generation time
-        time.sleep(2)
+        # Render the report, or reuse an identical artifact rendered before
+        document = build_report_document(report, research_project)
+        key = store_report_artifact(report.format, document)
         
-        # Generate the report based on format
-        file_path = None
-        if report.format == ReportFormat.JSON:
-            file_path = _generate_json_report(report, research_project)
-        elif report.format == ReportFormat.CSV:
-            file_path = _generate_csv_report(report, research_project)
-        elif report.format == ReportFormat.EXCEL:
-            file_path = _generate_excel_report(report, research_project)
-        elif report.format == ReportFormat.PDF:
-            file_path = _generate_pdf_report(report, research_project)
-        
-        # Update the report with the file path
-        if file_path:
-            crud.report.update(db=db, db_obj=report, obj_in={"file_path": file_path})
+        # Update the report with the artifact key
+        crud.report.update(db=db, db_obj=report, obj_in={"file_path": key})
         
     except Exception as e:
         print(f"Error generating report {report_id}: {str(e)}")
 
 
-def get_report_file_path(report: Report) -> str:
+def get_report_file_path(report: Report) -> Optional[str]:
     """
-    Get the full file path for a report.
+    Get the local file path of a report's artifact.
+    
+    Returns None if the report has not been generated or its artifact is not
+    on local disk (e.g. in S3).
     """
-    # In a real implementation, this would use a proper file storage system
-    # This is a simplified implementation that assumes local file storage
+    if not report.file_path:
+        return None
     
-    # If the report has a file_path, use it
-    if report.file_path:
+    # Reports generated before the artifact store hold an absolute path
+    if os.path.isabs(report.file_path):
         return report.file_path
     
-    # Otherwise, construct a path based on report properties
-    base_dir = os.path.join(os.getcwd(), "reports")
-    os.makedirs(base_dir, exist_ok=True)
+    return get_artifact_store().local_path(report.file_path)
+
+
+def store_report_artifact(report_format: ReportFormat, document: Dict[str, Any]) -> str:
+    """
+    Render a report document into the artifact store and return its key.
     
-    filename = f"{report.id}.{report.format.value}"
-    return os.path.join(base_dir, filename)
+    Artifacts are content-addressed, so rendering is skipped when an
+    identical report (same project results, type and format) already exists.
+    """
+    extension = REPORT_EXTENSIONS[report_format]
+    key = artifact_key(document, extension)
+    store = get_artifact_store()
+    if store.exists(key):
+        return key
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, f"report.{extension}")
+        if report_format == ReportFormat.JSON:
+            _generate_json_report(document, file_path)
+        elif report_format == ReportFormat.CSV:
+            _generate_csv_report(document, file_path)
+        elif report_format == ReportFormat.EXCEL:
+            _generate_excel_report(document, file_path)
+        elif report_format == ReportFormat.PDF:
+            _generate_pdf_report(document, file_path)
+        store.put_file(key, file_path)
+        if settings.REPORT_PRECOMPRESS and report_format in STREAMABLE_FORMATS:
+            for suffix, compress in _compressors().items():
+                compressed_path = file_path + suffix
+                compress(file_path, compressed_path)
+                store.put_file(key + suffix, compressed_path)
+    return key
 
 
-# Helper functions for report generation
+def _gzip_file(src: str, dst: str) -> None:
+    # mtime=0 keeps the output deterministic for identical content
+    with open(src, "rb") as f_in, open(dst, "wb") as raw:
+        with gzip.GzipFile(filename="", mode="wb", fileobj=raw, compresslevel=9, mtime=0) as f_out:
+            shutil.copyfileobj(f_in, f_out)
 
-def _generate_json_report(report: Report, research_project: models.ResearchProject) -> str:
-    """Generate a JSON report"""
-    # In a real implementation, this would generate a proper JSON report
-    # This is a simplified implementation that creates a basic JSON file
-    
-    # Create reports directory if it doesn't exist
-    reports_dir = os.path.join(os.getcwd(), "reports")
-    os.makedirs(reports_dir, exist_ok=True)
-    
-    # Create a file path
-    file_path = os.path.join(reports_dir, f"{report.id}.json")
-    
-    # Generate report data
-    report_data = {
-        "report_id": report.id,
+
+def _compressors() -> Dict[str, Any]:
+    """Precompressed variants to store, keyed by artifact key suffix"""
+    compressors = {".gz": _gzip_file}
+    try:
+        import zstandard
+    except ImportError:
+        return compressors
+
+    def zstd_file(src: str, dst: str) -> None:
+        with open(src, "rb") as f_in, open(dst, "wb") as f_out:
+            zstandard.ZstdCompressor(level=19).copy_stream(f_in, f_out)
+
+    compressors[".zst"] = zstd_file
+    return compressors
+
+
+# Results section covered by each report type; custom reports cover every section
+REPORT_RESULT_KEYS = {
+    ReportType.MARKET_ANALYSIS: "market_sizing",
+    ReportType.COMPETITIVE_ANALYSIS: "competitors",
+    ReportType.LOCATION_INTELLIGENCE: "location",
+    ReportType.DEMOGRAPHIC_ANALYSIS: "demographics",
+}
+
+# Formats that can be produced incrementally and streamed
+STREAMABLE_FORMATS = (ReportFormat.JSON, ReportFormat.CSV)
+
+REPORT_EXTENSIONS = {
+    ReportFormat.JSON: "json",
+    ReportFormat.CSV: "csv",
+    ReportFormat.EXCEL: "xlsx",
+    ReportFormat.PDF: "pdf",
+}
+
+
+def build_report_document(report: Report, research_project: models.ResearchProject) -> Dict[str, Any]:
+    """
+    Collect everything a report renders into plain Python values.
+
+    The document does not reference ORM objects, so it can be rendered after
+    the session that loaded them is closed. It only depends on the report
+    name and type and on the project and its results, so reports with the
+    same name over the same results share one rendered artifact.
+    """
+    results = research_project.results or {}
+    key = REPORT_RESULT_KEYS.get(report.type)
+    results_as_of = research_project.completed_at or research_project.updated_at or research_project.created_at
+    return {
         "report_name": report.name,
         "report_type": report.type.value,
-        "generated_at": datetime.now().isoformat(),
+        "results_as_of": results_as_of.isoformat() if results_as_of else None,
         "research_project": {
             "id": research_project.id,
             "name": research_project.name,
             "status": research_project.status.value,
         },
-        "data": research_project.results.get(report.type.value.replace("_analysis", ""), {}) if research_project.results else {}
+        "data": results.get(key, {}) if key else results,
     }
-    
-    # Write to file
-    with open(file_path, "w") as f:
-        json.dump(report_data, f, indent=2)
-    
-    return file_path
 
 
-def _generate_csv_report(report: Report, research_project: models.ResearchProject) -> str:
+def _chunked(pieces: Iterable[str], chunk_size: int) -> Iterator[str]:
+    """Join small string pieces into chunks of roughly `chunk_size` characters"""
+    buffer = []
+    size = 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield "".join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def iter_json_report(document: Dict[str, Any], chunk_size: Optional[int] = None) -> Iterator[str]:
+    """Render a report document as indented JSON, one chunk at a time"""
+    pieces = json.JSONEncoder(indent=2).iterencode(document)
+    return _chunked(pieces, chunk_size or settings.REPORT_STREAM_CHUNK_SIZE)
+
+
+def iter_csv_report(document: Dict[str, Any], chunk_size: Optional[int] = None) -> Iterator[str]:
+    """
+    Render a report document as CSV, one chunk at a time.
+
+    Nested report data is flattened to one `Metric,Value` row per leaf value,
+    e.g. `competitors[0].rating`.
+    """
+    chunk_size = chunk_size or settings.REPORT_STREAM_CHUNK_SIZE
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(["Metric", "Value"])
+    for metric, value in flatten_data(document["data"]):
+        writer.writerow([metric, value])
+        if buffer.tell() >= chunk_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def iter_report(report_format: ReportFormat, document: Dict[str, Any]) -> Iterator[str]:
+    """Render a report document in a streamable format"""
+    if report_format == ReportFormat.JSON:
+        return iter_json_report(document)
+    if report_format == ReportFormat.CSV:
+        return iter_csv_report(document)
+    raise ValueError(f"Report format {report_format.value} cannot be streamed")
+
+
+def _write_chunks(file_path: str, chunks: Iterable[str]) -> None:
+    """Write chunks to a file, only replacing it once complete"""
+    tmp_path = f"{file_path}.tmp"
+    with open(tmp_path, "w", newline="") as f:
+        for chunk in chunks:
+            f.write(chunk)
+    os.replace(tmp_path, file_path)
+
+
+# Helper functions for report generation
+
+def _generate_json_report(document: Dict[str, Any], file_path: str) -> None:
+    """Generate a JSON report"""
+    _write_chunks(file_path, iter_json_report(document))
+
+
+def _generate_csv_report(document: Dict[str, Any], file_path: str) -> None:
     """Generate a CSV report"""
-    # In a real implementation, this would generate a proper CSV report
-    # This is a simplified implementation that creates a basic CSV file
-    
-    # Create reports directory if it doesn't exist
-    reports_dir = os.path.join(os.getcwd(), "reports")
-    os.makedirs(reports_dir, exist_ok=True)
-    
-    # Create a file path
-    file_path = os.path.join(reports_dir, f"{report.id}.csv")
-    
-    # Generate a simple CSV with mock data
-    with open(file_path, "w") as f:
-        f.write("Category,Value,Description\n")
-        
-        # Add some mock data based on report type
-        if report.type.value == "market_analysis":
-            f.write(f"Total Market Size,{random.randint(1000000, 10000000)},Estimated total market size in THB\n")
-            f.write(f"Addressable Market,{random.randint(500000, 5000000)},Estimated addressable market in THB\n")
-            f.write(f"Market Growth Rate,{round(random.uniform(1.5, 7.5), 1)}%,Annual market growth rate\n")
-        elif report.type.value == "competitive_analysis":
-            f.write(f"Total Competitors,{random.randint(3, 15)},Number of direct competitors\n")
-            f.write(f"Average Competitor Rating,{round(random.uniform(3.0, 4.8), 1)},Average rating out of 5\n")
-            f.write(f"Market Saturation,{round(random.uniform(30.0, 90.0), 1)}%,Market saturation percentage\n")
-        elif report.type.value == "location_intelligence":
-            f.write(f"Location Score,{round(random.uniform(50.0, 95.0), 1)},Overall location score out of 100\n")
-            f.write(f"Foot Traffic,{random.randint(500, 5000)},Average daily foot traffic\n")
-            f.write(f"Visibility Score,{round(random.uniform(1.0, 5.0), 1)},Visibility score out of 5\n")
-        elif report.type.value == "demographic_analysis":
-            f.write(f"Population Density,{round(random.uniform(1000, 10000), 2)},People per square km\n")
-            f.write(f"Average Income,{random.randint(15000, 50000)},Average monthly income in THB\n")
-            f.write(f"Target Audience Match,{round(random.uniform(50.0, 95.0), 1)}%,Match with target audience\n")
-    
-    return file_path
+    _write_chunks(file_path, iter_csv_report(document))
 
 
-def _generate_excel_report(report: Report, research_project: models.ResearchProject) -> str:
+def _generate_excel_report(document: Dict[str, Any], file_path: str) -> None:
     """Generate an Excel report"""
-    # In a real implementation, this would generate a proper Excel report
-    # This is a simplified implementation that creates a mock Excel file
-    
-    # Create reports directory if it doesn't exist
-    reports_dir = os.path.join(os.getcwd(), "reports")
-    os.makedirs(reports_dir, exist_ok=True)
-    
-    # Create a file path
-    file_path = os.path.join(reports_dir, f"{report.id}.xlsx")
-    
-    # In a real implementation, we would use a library like openpyxl or pandas
-    # For this mock implementation, we'll just create an empty file
-    with open(file_path, "wb") as f:
-        f.write(b"Mock Excel file")
-    
-    return file_path
+    render_report("excel", document, file_path)
 
 
-def _generate_pdf_report(report: Report, research_project: models.ResearchProject) -> str:
+def _generate_pdf_report(document: Dict[str, Any], file_path: str) -> None:
     """Generate a PDF report"""
-    # In a real implementation, this would generate a proper PDF report
-    # This is a simplified implementation that creates a mock PDF file
-    
-    # Create reports directory if it doesn't exist
-    reports_dir = os.path.join(os.getcwd(), "reports")
-    os.makedirs(reports_dir, exist_ok=True)
-    
-    # Create a file path
-    file_path = os.path.join(reports_dir, f"{report.id}.pdf")
-    
-    # In a real implementation, we would use a library like ReportLab or WeasyPrint
-    # For this mock implementation, we'll just create an empty file
-    with open(file_path, "wb") as f:
-        f.write(b"Mock PDF file")
-    
-    return file_path
+    render_report("pdf", document, file_path)
@@ -0,0 +1,275 @@
+import multiprocessing
+import os
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+from app.core.config import settings
+
+# Sheet names can't contain these characters and are limited to 31 characters
+_INVALID_SHEET_CHARS = re.compile(r"[\[\]:*?/\\]")
+_MAX_CELL_TEXT = 200
+_PDF_TABLE_ROWS = 40
+
+
+def flatten_data(value: Any, prefix: str = "") -> Iterator[Tuple[str, Any]]:
+    """Flatten nested report data into `(metric, value)` pairs, e.g. `competitors[0].rating`"""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from flatten_data(item, f"{prefix}.{key}" if prefix else str(key))
+    elif isinstance(value, list):
+        for i, item in enumerate(value):
+            yield from flatten_data(item, f"{prefix}[{i}]")
+    else:
+        yield prefix, value
+
+
+def _is_table(value: Any) -> bool:
+    return (
+        isinstance(value, list)
+        and bool(value)
+        and all(isinstance(row, dict) for row in value)
+        and all(not isinstance(cell, (dict, list)) for row in value for cell in row.values())
+    )
+
+
+def split_tables(
+    data: Dict[str, Any], prefix: str = ""
+) -> Tuple[List[Tuple[str, Any]], List[Tuple[str, List[str], List[List[Any]]]]]:
+    """
+    Split report data into scalar metrics and tables.
+
+    Lists of flat records (e.g. competitors) become `(name, headers, rows)`
+    tables; everything else is flattened into `(metric, value)` pairs.
+    """
+    metrics: List[Tuple[str, Any]] = []
+    tables: List[Tuple[str, List[str], List[List[Any]]]] = []
+    for key, value in data.items():
+        name = f"{prefix}.{key}" if prefix else str(key)
+        if _is_table(value):
+            headers: List[str] = []
+            for row in value:
+                headers.extend(column for column in row if column not in headers)
+            tables.append((name, headers, [[row.get(column) for column in headers] for row in value]))
+        elif isinstance(value, dict):
+            nested_metrics, nested_tables = split_tables(value, name)
+            metrics.extend(nested_metrics)
+            tables.extend(nested_tables)
+        else:
+            metrics.extend(flatten_data(value, name))
+    return metrics, tables
+
+
+def _summary_rows(document: Dict[str, Any]) -> List[Tuple[str, Any]]:
+    project = document["research_project"]
+    return [
+        ("Report", document["report_name"]),
+        ("Type", document["report_type"]),
+        ("Research project", project["name"]),
+        ("Project status", project["status"]),
+        ("Results as of", document["results_as_of"]),
+    ]
+
+
+def _cell(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    return str(value)[:_MAX_CELL_TEXT]
+
+
+def _sheet_title(name: str, used: set) -> str:
+    title = _INVALID_SHEET_CHARS.sub("_", name)[:31] or "Sheet"
+    candidate, n = title, 1
+    while candidate.lower() in used:
+        n += 1
+        suffix = f" ({n})"
+        candidate = title[:31 - len(suffix)] + suffix
+    used.add(candidate.lower())
+    return candidate
+
+
+def render_excel_report(document: Dict[str, Any], file_path: str) -> None:
+    """
+    Render a report document as an XLSX workbook.
+
+    Uses openpyxl's write-only mode, which streams rows to disk instead of
+    keeping the whole sheet in memory.
+    """
+    from openpyxl import Workbook
+
+    metrics, tables = split_tables(document["data"])
+    workbook = Workbook(write_only=True)
+    used: set = set()
+
+    summary = workbook.create_sheet(_sheet_title("Summary", used))
+    for row in _summary_rows(document):
+        summary.append(row)
+    summary.append([])
+    summary.append(["Metric", "Value"])
+    for metric, value in metrics:
+        summary.append([metric, _cell(value)])
+
+    for name, headers, rows in tables:
+        sheet = workbook.create_sheet(_sheet_title(name, used))
+        sheet.append(headers)
+        for row in rows:
+            sheet.append([_cell(value) for value in row])
+
+    workbook.save(file_path)
+
+
+def render_pdf_report(document: Dict[str, Any], file_path: str) -> None:
+    """Render a report document as a PDF with a metrics table and one table per record list"""
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib.units import cm
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+    styles = getSampleStyleSheet()
+    table_style = TableStyle([
+        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#2f3e46")),
+        ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+        ("FONTSIZE", (0, 0), (-1, -1), 8),
+        ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
+        ("VALIGN", (0, 0), (-1, -1), "TOP"),
+    ])
+
+    def tables_for(headers: List[str], rows: List[List[Any]]) -> List[Table]:
+        # Many small tables lay out much faster than one long table that
+        # reportlab has to split across pages
+        flowables = []
+        for start in range(0, max(len(rows), 1), _PDF_TABLE_ROWS):
+            chunk = rows[start:start + _PDF_TABLE_ROWS]
+            flowable = Table(
+                [headers] + [[("" if value is None else str(_cell(value))) for value in row] for row in chunk]
+            )
+            flowable.setStyle(table_style)
+            flowables.append(flowable)
+        return flowables
+
+    metrics, tables = split_tables(document["data"])
+    # Paragraphs parse markup, so everything but the literal tags is escaped
+    story: List[Any] = [Paragraph(escape(document["report_name"]), styles["Title"])]
+    for label, value in _summary_rows(document):
+        story.append(Paragraph(f"<b>{escape(label)}:</b> {escape(str(value))}", styles["Normal"]))
+    story.append(Spacer(1, 0.5 * cm))
+
+    if metrics:
+        story.append(Paragraph("Metrics", styles["Heading2"]))
+        story.extend(tables_for(["Metric", "Value"], [[metric, value] for metric, value in metrics]))
+    for name, headers, rows in tables:
+        story.append(Paragraph(escape(name.replace("_", " ").title()), styles["Heading2"]))
+        story.extend(tables_for(headers, rows))
+
+    SimpleDocTemplate(
+        file_path,
+        pagesize=A4,
+        title=document["report_name"],
+        leftMargin=1.5 * cm,
+        rightMargin=1.5 * cm,
+    ).build(story)
+
+
+RENDERERS = {
+    "excel": render_excel_report,
+    "pdf": render_pdf_report,
+}
+
+
+def render_report_file(report_format: str, document: Dict[str, Any], file_path: str) -> int:
+    """
+    Render a report document to `file_path` and return its size in bytes.
+
+    The file is written next to its final path and only moved into place
+    once complete. Runs in the rendering pool's worker processes.
+    """
+    tmp_path = f"{file_path}.tmp"
+    RENDERERS[report_format](document, tmp_path)
+    os.replace(tmp_path, file_path)
+    return os.path.getsize(file_path)
+
+
+class RenderStats:
+    """
+    Per-format counters of rendered reports, for throughput monitoring.
+
+    `reports_per_second` is rendered reports over total render time, i.e.
+    the throughput of one pool worker.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def record(self, report_format: str, seconds: float, size: int = 0, error: bool = False) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(
+                report_format, {"rendered": 0, "errors": 0, "seconds": 0.0, "bytes": 0}
+            )
+            stats["errors" if error else "rendered"] += 1
+            stats["seconds"] += seconds
+            stats["bytes"] += size
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                report_format: dict(
+                    stats,
+                    seconds=round(stats["seconds"], 4),
+                    reports_per_second=round(stats["rendered"] / stats["seconds"], 2) if stats["seconds"] else 0.0,
+                )
+                for report_format, stats in self._stats.items()
+            }
+
+
+render_stats = RenderStats()
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> Optional[ProcessPoolExecutor]:
+    global _pool
+    if settings.REPORT_RENDER_WORKERS <= 0:
+        return None
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # Spawned workers don't inherit the server's threads or open connections
+                _pool = ProcessPoolExecutor(
+                    max_workers=settings.REPORT_RENDER_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _pool
+
+
+def render_report(report_format: str, document: Dict[str, Any], file_path: str) -> int:
+    """
+    Render a report file in the rendering process pool and wait for it.
+
+    CPU-heavy rendering runs in separate processes so it never holds the
+    API worker's GIL. With `REPORT_RENDER_WORKERS=0`, or where child
+    processes can't be started, the report is rendered in this process.
+    """
+    started = time.perf_counter()
+    # Daemonic processes (e.g. Celery prefork children) may not have children
+    pool = None if multiprocessing.current_process().daemon else _get_pool()
+    try:
+        if pool is None:
+            size = render_report_file(report_format, document, file_path)
+        else:
+            size = pool.submit(render_report_file, report_format, document, file_path).result()
+    except Exception:
+        render_stats.record(report_format, time.perf_counter() - started, error=True)
+        raise
+    render_stats.record(report_format, time.perf_counter() - started, size)
+    return size
+
+
+def get_render_stats() -> Dict[str, Dict[str, Any]]:
+    """Get per-format counts, bytes and reports-per-second of rendered reports"""
+    return render_stats.snapshot()
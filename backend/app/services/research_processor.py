@@ -1,24 +1,29 @@
 import time
 import random
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import uuid
 from datetime import datetime
 
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session
 
 from app import crud, models
 from app.models.research_project import ProjectStatus
 from app.models.report import ReportType, ReportFormat
 from app.schemas.report import ReportCreate
+from app.services.progress import ProgressReporter
+from app.services.stage_graph import Stage, StageGraph
 
 
 def process_research_project(db: Session, research_project_id: str, user_id: str) -> None:
     """
     Process a research project and generate results.
-    This is a background task that simulates the analysis process.
+    Runs inside the `app.worker.process_research_project` Celery task,
+    which owns `db`, and simulates the analysis process.
     
-    In a real implementation, this would call various analysis services
-    and integrate with external APIs.
+    The requested analysis stages run concurrently. Progress is published
+    as each stage finishes, and the results and reports are saved together
+    in a single transaction at the end.
     """
     try:
         # Get the research project
@@ -35,138 +40,120 @@ def process_research_project(db: Session, research_project_id: str, user_id: str
         
         # Initialize results
         results = {}
+        reports = []
         
-        # Update progress to 20%
-        crud.research_project.update_status(
-            db=db, db_obj=research_project, status=ProjectStatus.IN_PROGRESS, progress=20
-        )
-        
-        # Simulate processing time
-        time.sleep(2)
+        # Live progress goes to the progress broker; the row is only written once, at the end
+        reporter = ProgressReporter(research_project_id)
+        reporter.update(20)
         
-        # Process market sizing if requested
-        if research_project.market_sizing:
-            results["market_sizing"] = _process_market_sizing(restaurant_profile)
-            
-            # Create a report for market sizing
-            _create_report(
-                db=db,
-                research_project_id=research_project_id,
-                owner_id=user_id,
-                report_type=ReportType.MARKET_ANALYSIS,
-                data=results["market_sizing"]
-            )
+        user = crud.user.get(db=db, id=user_id)
+        graph = StageGraph(_build_stages(research_project, restaurant_profile, user))
         
-        # Update progress to 40%
-        crud.research_project.update_status(
-            db=db, db_obj=research_project, status=ProjectStatus.IN_PROGRESS, progress=40
-        )
+        def on_stage_complete(name: str, data: Dict[str, Any]) -> None:
+            results[name] = data
+            report_type = STAGE_REPORT_TYPES.get(name)
+            if report_type:
+                reports.append(_build_report(
+                    research_project_id=research_project_id,
+                    owner_id=user_id,
+                    report_type=report_type,
+                    data=data
+                ))
+            reporter.stage_completed(name, progress=20 + 70 * len(results) // len(graph))
         
-        # Simulate processing time
-        time.sleep(2)
+        graph.run(on_complete=on_stage_complete)
         
-        # Process demographic analysis if requested
-        if research_project.demographic_analysis:
-            results["demographics"] = _process_demographics(restaurant_profile)
-            
-            # Create a report for demographics
-            _create_report(
-                db=db,
-                research_project_id=research_project_id,
-                owner_id=user_id,
-                report_type=ReportType.DEMOGRAPHIC_ANALYSIS,
-                data=results["demographics"]
-            )
-        
-        # Update progress to 60%
-        crud.research_project.update_status(
-            db=db, db_obj=research_project, status=ProjectStatus.IN_PROGRESS, progress=60
+        # Save the results and reports and mark the project completed in one transaction
+        crud.research_project.complete_with_reports(
+            db=db, db_obj=research_project, results=results, reports=reports
         )
+        reporter.completed()
         
-        # Simulate processing time
-        time.sleep(2)
-        
-        # Process competitive analysis if requested
-        if research_project.competitive_analysis or research_project.local_competition:
-            results["competitors"] = _process_competitors(restaurant_profile)
-            
-            # Create a report for competitive analysis
-            _create_report(
-                db=db,
-                research_project_id=research_project_id,
-                owner_id=user_id,
-                report_type=ReportType.COMPETITIVE_ANALYSIS,
-                data=results["competitors"]
-            )
-        
-        # Update progress to 80%
-        crud.research_project.update_status(
-            db=db, db_obj=research_project, status=ProjectStatus.IN_PROGRESS, progress=80
-        )
-        
-        # Simulate processing time
-        time.sleep(2)
-        
-        # Process location intelligence if requested
-        if research_project.location_intelligence:
-            results["location"] = _process_location(restaurant_profile)
-            
-            # Create a report for location intelligence
-            _create_report(
-                db=db,
-                research_project_id=research_project_id,
-                owner_id=user_id,
-                report_type=ReportType.LOCATION_INTELLIGENCE,
-                data=results["location"]
+    except OperationalError:
+        # Lost database connection: let the Celery task retry the project
+        raise
+    except Exception as e:
+        print(f"Error processing research project {research_project_id}: {str(e)}")
+        mark_failed(db=db, research_project_id=research_project_id, user_id=user_id, error=str(e))
+
+
+def mark_failed(db: Session, research_project_id: str, user_id: str, error: str) -> None:
+    """
+    Record that a research project run failed.
+    Publishes the failed event and stores progress -1 on the project row.
+    """
+    ProgressReporter(research_project_id).failed(error)
+    # Try to update the project status to indicate an error
+    try:
+        db.rollback()
+        research_project = crud.research_project.get(db=db, id=research_project_id)
+        if research_project and research_project.owner_id == user_id:
+            crud.research_project.update_status(
+                db=db, db_obj=research_project, status=ProjectStatus.IN_PROGRESS, progress=-1
             )
+    except Exception as e:
+        print(f"Could not mark research project {research_project_id} as failed: {str(e)}")
+
+
+# Stages that also get a standalone report
+STAGE_REPORT_TYPES = {
+    "market_sizing": ReportType.MARKET_ANALYSIS,
+    "demographics": ReportType.DEMOGRAPHIC_ANALYSIS,
+    "competitors": ReportType.COMPETITIVE_ANALYSIS,
+    "location": ReportType.LOCATION_INTELLIGENCE,
+}
+
+
+def _build_stages(
+    research_project: models.ResearchProject,
+    restaurant_profile: models.RestaurantProfile,
+    user: models.User,
+) -> List[Stage]:
+    """Build the analysis stages requested by a research project"""
+    def simulated(seconds: float, func, *args):
+        def run(inputs: Dict[str, Any]) -> Dict[str, Any]:
+            # Simulate processing time
+            time.sleep(seconds)
+            return func(*args, **inputs)
+        return run
+    
+    stages = []
+    if research_project.market_sizing:
+        stages.append(Stage("market_sizing", simulated(2, _process_market_sizing, restaurant_profile)))
+    if research_project.demographic_analysis:
+        stages.append(Stage("demographics", simulated(2, _process_demographics, restaurant_profile)))
+    if research_project.competitive_analysis or research_project.local_competition:
+        stages.append(Stage("competitors", simulated(2, _process_competitors, restaurant_profile)))
+    if research_project.location_intelligence:
+        stages.append(Stage("location", simulated(2, _process_location, restaurant_profile)))
+    
+    # Process additional analyses based on subscription tier
+    if user and user.subscription_tier in ["pro", "enterprise"]:
+        if research_project.tourist_analysis:
+            stages.append(Stage("tourist_analysis", simulated(1, _process_tourist_analysis, restaurant_profile)))
         
-        # Update progress to 90%
-        crud.research_project.update_status(
-            db=db, db_obj=research_project, status=ProjectStatus.IN_PROGRESS, progress=90
-        )
-        
-        # Simulate processing time
-        time.sleep(1)
-        
-        # Process additional analyses based on subscription tier
-        user = crud.user.get(db=db, id=user_id)
-        if user.subscription_tier in ["pro", "enterprise"]:
-            if research_project.tourist_analysis:
-                results["tourist_analysis"] = _process_tourist_analysis(restaurant_profile)
-            
-            if research_project.pricing_strategy:
-                results["pricing_strategy"] = _process_pricing_strategy(restaurant_profile)
-            
-            if research_project.food_delivery_analysis:
-                results["food_delivery"] = _process_food_delivery(restaurant_profile)
-        
-        # Update the research project with results and mark as completed
-        crud.research_project.update_results(db=db, db_obj=research_project, results=results)
-        crud.research_project.update_status(
-            db=db, db_obj=research_project, status=ProjectStatus.COMPLETED
-        )
+        if research_project.pricing_strategy:
+            # Prices are compared against competitors when they are analysed
+            depends_on = ["competitors"] if any(stage.name == "competitors" for stage in stages) else []
+            stages.append(Stage(
+                "pricing_strategy",
+                simulated(1, _process_pricing_strategy, restaurant_profile),
+                depends_on=depends_on,
+            ))
         
-    except Exception as e:
-        print(f"Error processing research project {research_project_id}: {str(e)}")
-        # Try to update the project status to indicate an error
-        try:
-            research_project = crud.research_project.get(db=db, id=research_project_id)
-            if research_project and research_project.owner_id == user_id:
-                crud.research_project.update_status(
-                    db=db, db_obj=research_project, status=ProjectStatus.IN_PROGRESS, progress=-1
-                )
-        except Exception:
-            pass
+        if research_project.food_delivery_analysis:
+            stages.append(Stage("food_delivery", simulated(1, _process_food_delivery, restaurant_profile)))
+    
+    return stages
 
 
-def _create_report(
-    db: Session,
+def _build_report(
     research_project_id: str,
     owner_id: str,
     report_type: ReportType,
     data: Dict[str, Any]
-) -> None:
-    """Create a report for the research project"""
+) -> models.Report:
+    """Build a report for the research project"""
     report_create = ReportCreate(
         name=f"{report_type.value.replace('_', ' ').title()} Report",
         type=report_type,
@@ -174,8 +161,7 @@ def _create_report(
         research_project_id=research_project_id
     )
     
-    crud.report.create_with_owner(
-        db=db,
+    return crud.report.build_with_owner(
         obj_in=report_create,
         owner_id=owner_id,
         data=data
@@ -337,9 +323,27 @@ def _process_tourist_analysis(restaurant_profile: models.RestaurantProfile) -> D
     }
 
 
-def _process_pricing_strategy(restaurant_profile: models.RestaurantProfile) -> Dict[str, Any]:
+def _process_pricing_strategy(
+    restaurant_profile: models.RestaurantProfile, competitors: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
     """Process pricing strategy analysis"""
     # This is a simplified mock implementation
+    comparison = {
+        "below_market": random.randint(0, 30),
+        "at_market": random.randint(40, 70),
+        "above_market": random.randint(0, 30)
+    }
+    if competitors and competitors.get("competitors"):
+        # Compare against the price levels found by the competitive analysis
+        price_range = restaurant_profile.price_range or ""
+        own_level = len(price_range) if price_range and len(set(price_range)) == 1 else 2
+        levels = [c["price_level"] for c in competitors["competitors"]]
+        comparison = {
+            "below_market": round(100 * sum(level > own_level for level in levels) / len(levels)),
+            "at_market": round(100 * sum(level == own_level for level in levels) / len(levels)),
+            "above_market": round(100 * sum(level < own_level for level in levels) / len(levels))
+        }
+    
     return {
         "recommended_price_points": {
             "appetizers": {"min": random.randint(50, 150), "max": random.randint(150, 300)},
@@ -347,11 +351,7 @@ def _process_pricing_strategy(restaurant_profile: models.RestaurantProfile) -> D
             "desserts": {"min": random.randint(50, 100), "max": random.randint(100, 250)},
             "beverages": {"min": random.randint(30, 80), "max": random.randint(80, 200)}
         },
-        "competitor_price_comparison": {
-            "below_market": random.randint(0, 30),
-            "at_market": random.randint(40, 70),
-            "above_market": random.randint(0, 30)
-        },
+        "competitor_price_comparison": comparison,
         "price_sensitivity_analysis": {
             "elasticity": round(random.uniform(0.5, 2.0), 2),
             "optimal_price_increase": round(random.uniform(0, 15), 1)
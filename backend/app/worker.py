@@ -1,21 +1,32 @@
+from contextlib import contextmanager
+from typing import Iterator
+
 from celery import Celery
-import os
 from dotenv import load_dotenv
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
 
 # Load environment variables from .env file
 load_dotenv()
 
+from app.core.config import settings  # noqa: E402
+from app.db.session import SessionLocal  # noqa: E402
+
 # Configure Celery
-redis_host = os.getenv("REDIS_HOST", "localhost")
-redis_port = os.getenv("REDIS_PORT", "6379")
-redis_url = f"redis://{redis_host}:{redis_port}/0"
+if settings.CELERY_TASK_ALWAYS_EAGER:
+    # Tasks run inline, so no Redis is needed
+    broker_url = "memory://"
+    result_backend = "cache+memory://"
+else:
+    broker_url = f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}/0"
+    result_backend = broker_url
 
-celery_app = Celery("worker", broker=redis_url, backend=redis_url)
+celery_app = Celery("worker", broker=broker_url, backend=result_backend)
 
 # Configure Celery
 celery_app.conf.task_routes = {
     "app.worker.test_celery": "main-queue",
-    "app.services.research_processor.process_research_project": "research-queue",
+    "app.worker.process_research_project": "research-queue",
     "app.services.report_generator.generate_report": "report-queue",
     "app.services.integration_manager.sync_integration_data": "integration-queue",
 }
@@ -26,12 +37,63 @@ celery_app.conf.update(
     result_serializer="json",
     timezone="UTC",
     enable_utc=True,
+    task_default_queue="main-queue",
+    # Long-running tasks: only acknowledge once done and hand out one task
+    # at a time, so a lost worker's task is redelivered instead of dropped
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    worker_prefetch_multiplier=1,
+    task_always_eager=settings.CELERY_TASK_ALWAYS_EAGER,
+    task_eager_propagates=True,
 )
 
 
+@contextmanager
+def task_session() -> Iterator[Session]:
+    """
+    Database session owned by a single task run.
+    """
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
 @celery_app.task(acks_late=True)
 def test_celery(word: str) -> str:
     """
     Test Celery task.
     """
     return f"test task return {word}"
+
+
+@celery_app.task(
+    bind=True,
+    acks_late=True,
+    autoretry_for=(OperationalError,),
+    retry_backoff=True,
+    retry_backoff_max=settings.CELERY_TASK_RETRY_BACKOFF_MAX,
+    retry_jitter=True,
+    max_retries=settings.CELERY_TASK_MAX_RETRIES,
+)
+def process_research_project(self, research_project_id: str, user_id: str) -> None:
+    """
+    Run the analysis for a research project.
+    Database connection errors are retried with exponential backoff; once
+    the retries run out the project is marked as failed.
+    """
+    from app.services import research_processor
+
+    try:
+        with task_session() as db:
+            research_processor.process_research_project(
+                db=db, research_project_id=research_project_id, user_id=user_id
+            )
+    except OperationalError as e:
+        if self.request.retries >= self.max_retries:
+            with task_session() as db:
+                research_processor.mark_failed(
+                    db=db, research_project_id=research_project_id, user_id=user_id, error=str(e)
+                )
+        raise
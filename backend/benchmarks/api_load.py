@@ -0,0 +1,453 @@
+"""
+Load test the API end to end and check the results against a stored baseline.
+
+The app runs in-process over ASGI, against a temporary SQLite database by
+default or any database given with `--database-url` (e.g. a local
+Postgres). Research project analysis is queued on Celery's in-memory
+broker, and the chatbot answers from the stub LLM. Each scenario is
+driven at the given concurrency and reports throughput, p50/p95/p99
+latency and database queries per request, as medians over `--repeat`
+runs.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.api_load --requests 200 --concurrency 10
+    python -m benchmarks.api_load --check            # exit 1 on regressions
+    python -m benchmarks.api_load --update-baseline  # store these results
+
+Baselines are machine specific; refresh them when the benchmark box changes.
+Latency tolerances are wide because a shared box is noisy; queries per
+request are nearly deterministic and are held to 10%.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional
+
+import httpx
+import numpy as np
+
+# The chatbot must not need OpenAI credentials; its client is replaced below anyway
+os.environ.setdefault("CHATBOT_PROVIDER", "stub")
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from app import crud, schemas
+from app.api import deps
+from app.api.api_v1.endpoints import chatbot
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.db.async_session import create_async_db_engine
+from app.db.base import Base
+from app.db.session import create_db_engine
+from app.main import app
+from app.models.report import Report, ReportFormat, ReportType
+from app.models.research_project import ProjectStatus, ResearchProject
+from app.models.restaurant_profile import RestaurantProfile
+from app.models.user import User
+from app.services.chat_stub import StubChatClient
+from app.worker import celery_app
+from benchmarks.synthetic_data import decode, generate_dataset
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "api_load_baseline.json")
+API = settings.API_V1_STR
+
+
+class Scenario(NamedTuple):
+    name: str
+    method: str
+    path: Callable[[int], str]
+    body: Optional[Callable[[int], Dict[str, Any]]] = None
+    # Runs before each run of the scenario, outside the measurement
+    reset: Optional[Callable[[], None]] = None
+
+
+class QueryCounter:
+    """Counts statements executed on the engines it is attached to"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def attach(self, engine: Any) -> None:
+        event.listen(engine, "before_cursor_execute", self._count)
+
+    def detach(self, engine: Any) -> None:
+        event.remove(engine, "before_cursor_execute", self._count)
+
+    def _count(self, *args: Any) -> None:
+        with self._lock:
+            self.count += 1
+
+
+def seed(SessionLocal: Any, profiles: int, analyses: int, seed_value: int) -> Dict[str, Any]:
+    """
+    A pro user owning synthetic profiles, each with a project and reports,
+    plus `analyses` more projects for the analyze scenario to start.
+    """
+    dataset = generate_dataset(seed=seed_value, places=1000, profiles=profiles)
+    columns = dataset["tables"]["profiles"]
+    cuisines = decode(dataset, "cuisine", columns["cuisine"])
+    districts = decode(dataset, "district", columns["district"])
+    with SessionLocal() as db:
+        user = crud.user.create(db, obj_in=schemas.UserCreate(
+            email=f"bench-{uuid.uuid4().hex[:12]}@example.com",
+            password="benchmark",
+            full_name="Benchmark User",
+            subscription_tier="pro",
+        ))
+        profile_rows = crud.restaurant_profile.create_many(db, objs_in=[
+            {
+                "owner_id": user.id,
+                "restaurant_name": f"{cuisines[i]} Kitchen {i}",
+                "cuisine_type": cuisines[i],
+                "price_range": "$" * int(columns["price_level"][i]),
+                "business_type": "new" if columns["is_new_business"][i] else "existing",
+                "city": "Bangkok",
+                "district": districts[i],
+                "latitude": float(columns["lat"][i]),
+                "longitude": float(columns["lng"][i]),
+            }
+            for i in range(profiles)
+        ])
+        projects = crud.research_project.create_many(db, objs_in=[
+            {
+                "owner_id": user.id,
+                "restaurant_profile_id": profile.id,
+                "name": f"Research {profile.restaurant_name}",
+                "competitive_analysis": True,
+                "market_sizing": True,
+                "results": {"summary": "Synthetic results", "scores": list(range(50))},
+            }
+            for profile in profile_rows
+        ])
+        analysis_projects = crud.research_project.create_many(db, objs_in=[
+            {
+                "owner_id": user.id,
+                "restaurant_profile_id": profile_rows[i % profiles].id,
+                "name": f"Analysis {i}",
+                "competitive_analysis": True,
+                "market_sizing": True,
+            }
+            for i in range(analyses)
+        ])
+        reports = crud.report.create_many(db, objs_in=[
+            {
+                "owner_id": user.id,
+                "research_project_id": project.id,
+                "name": f"{report_type.value.replace('_', ' ').title()} Report",
+                "type": report_type,
+                "format": ReportFormat.JSON,
+                "data": {"summary": "Synthetic report", "values": list(range(100))},
+            }
+            for project in projects
+            for report_type in (ReportType.MARKET_ANALYSIS, ReportType.COMPETITIVE_ANALYSIS)
+        ])
+        return {
+            "user_id": user.id,
+            "profiles": [(p.id, p.latitude, p.longitude) for p in profile_rows],
+            "projects": [p.id for p in projects],
+            "analysis_projects": [p.id for p in analysis_projects],
+            "reports": [r.id for r in reports],
+        }
+
+
+def clean_up(SessionLocal: Any, user_id: str) -> None:
+    with SessionLocal() as db:
+        for model in (Report, ResearchProject, RestaurantProfile):
+            db.query(model).filter(model.owner_id == user_id).delete(synchronize_session=False)
+        db.query(User).filter(User.id == user_id).delete(synchronize_session=False)
+        db.commit()
+
+
+def build_scenarios(fixture: Dict[str, Any]) -> List[Scenario]:
+    profiles, reports = fixture["profiles"], fixture["reports"]
+    analysis_projects = fixture["analysis_projects"]
+
+    def point(i: int) -> str:
+        _, lat, lng = profiles[i % len(profiles)]
+        return f"latitude={lat}&longitude={lng}"
+
+    def profile_id(i: int) -> str:
+        return profiles[i % len(profiles)][0]
+
+    return [
+        Scenario("location_analyze", "GET", lambda i: f"{API}/location/analyze?{point(i)}&radius=1"),
+        Scenario("location_competitors", "GET", lambda i: f"{API}/location/competitors?{point(i)}&radius=1"),
+        Scenario("location_demographics", "GET", lambda i: f"{API}/location/demographics?{point(i)}&radius=1"),
+        Scenario("analytics_market_trends", "GET", lambda i: f"{API}/analytics/market-trends?cuisine_type=Thai"),
+        Scenario(
+            "analytics_competitor_analysis", "GET",
+            lambda i: f"{API}/analytics/competitor-analysis/{profile_id(i)}",
+        ),
+        Scenario(
+            "analytics_performance_forecast", "GET",
+            lambda i: f"{API}/analytics/performance-forecast/{profile_id(i)}?months=12",
+        ),
+        Scenario("reports_list", "GET", lambda i: f"{API}/reports/?limit=50"),
+        Scenario("reports_by_type", "GET", lambda i: f"{API}/reports/by-type/market_analysis?limit=50"),
+        Scenario("report_read", "GET", lambda i: f"{API}/reports/{reports[i % len(reports)]}"),
+        Scenario(
+            "research_project_analyze", "POST",
+            # One project per request: a project already in progress is refused
+            lambda i: f"{API}/research-projects/{analysis_projects[i % len(analysis_projects)]}/analyze",
+            reset=fixture["reset_analyses"],
+        ),
+        Scenario(
+            "chatbot_chat", "POST", lambda i: f"{API}/chatbot/chat",
+            # Distinct questions across runs, so the stub LLM is called rather than the completion cache
+            lambda i: {"messages": [{"role": "user", "content": f"How busy is Sukhumvit at lunch? {uuid.uuid4()}"}]},
+        ),
+    ]
+
+
+@contextmanager
+def benchmark_app(
+    database_url: Optional[str], profiles: int, analyses: int, llm_latency: float, seed_value: int
+) -> Iterator[Dict]:
+    """Point the app at the benchmark database, seed it, and undo everything afterwards"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        url = database_url or f"sqlite:///{os.path.join(tmp_dir, 'api_load.db')}"
+        engine = create_db_engine(url)
+        async_engine = create_async_db_engine(url)
+        SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+        AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+        Base.metadata.create_all(bind=engine)
+        fixture = seed(SessionLocal, profiles, analyses, seed_value)
+
+        def reset_analyses() -> None:
+            # Queued analyses never run here, so put the projects back by hand
+            with SessionLocal() as db:
+                db.query(ResearchProject).filter(ResearchProject.id.in_(fixture["analysis_projects"])).update(
+                    {"status": ProjectStatus.PENDING, "progress": 0}, synchronize_session=False
+                )
+                db.commit()
+
+        def get_db():
+            db = SessionLocal()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        async def get_async_db():
+            async with AsyncSessionLocal() as db:
+                yield db
+
+        overrides = dict(app.dependency_overrides)
+        app.dependency_overrides[deps.get_db] = get_db
+        app.dependency_overrides[deps.get_async_db] = get_async_db
+        chat_client, chatbot.client = chatbot.client, StubChatClient(latency=llm_latency)
+        # Queue analyses without running them; the worker isn't under test
+        celery_conf = {key: celery_app.conf[key] for key in ("task_always_eager", "broker_url", "result_backend")}
+        celery_app.conf.update(task_always_eager=False, broker_url="memory://", result_backend="cache+memory://")
+        counter = QueryCounter()
+        counter.attach(engine)
+        counter.attach(async_engine.sync_engine)
+        try:
+            yield dict(fixture, counter=counter, reset_analyses=reset_analyses)
+        finally:
+            counter.detach(engine)
+            counter.detach(async_engine.sync_engine)
+            celery_app.conf.update(celery_conf)
+            chatbot.client = chat_client
+            app.dependency_overrides.clear()
+            app.dependency_overrides.update(overrides)
+            if database_url:
+                clean_up(SessionLocal, fixture["user_id"])
+            engine.dispose()
+            asyncio.run(async_engine.dispose())
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    counter: QueryCounter,
+    requests: int,
+    concurrency: int,
+    warmup: int,
+) -> Dict[str, Any]:
+    async def send(i: int) -> httpx.Response:
+        body = scenario.body(i) if scenario.body else None
+        return await client.request(scenario.method, scenario.path(i), json=body)
+
+    if scenario.reset:
+        scenario.reset()
+    for i in range(warmup):
+        await send(requests + i)
+
+    indexes = iter(range(requests))
+    latencies: List[float] = []
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal errors
+        for i in indexes:
+            started = time.perf_counter()
+            response = await send(i)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    queries = counter.count
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+    return {
+        "requests": requests,
+        "errors": errors,
+        "throughput": round(requests / elapsed, 1),
+        "p50_ms": round(float(p50), 2),
+        "p95_ms": round(float(p95), 2),
+        "p99_ms": round(float(p99), 2),
+        "queries_per_request": round((counter.count - queries) / requests, 2),
+    }
+
+
+async def run_suite(
+    fixture: Dict[str, Any],
+    requests: int,
+    concurrency: int,
+    warmup: int = 5,
+    only: Optional[List[str]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    headers = {"Authorization": f"Bearer {create_access_token(fixture['user_id'])}"}
+    transport = httpx.ASGITransport(app=app)
+    results = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", headers=headers) as client:
+        for scenario in build_scenarios(fixture):
+            if only and scenario.name not in only:
+                continue
+            results[scenario.name] = await run_scenario(
+                client, scenario, fixture["counter"], requests, concurrency, warmup
+            )
+    return results
+
+
+def median_results(runs: List[Dict[str, Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+    """Per-metric medians of repeated runs, which are far steadier than any single run"""
+    results = {}
+    for name in runs[0]:
+        scenario_runs = [run[name] for run in runs]
+        results[name] = {
+            metric: round(float(np.median([run[metric] for run in scenario_runs])), 2)
+            for metric in ("throughput", "p50_ms", "p95_ms", "p99_ms", "queries_per_request")
+        }
+        results[name]["requests"] = sum(run["requests"] for run in scenario_runs)
+        results[name]["errors"] = sum(run["errors"] for run in scenario_runs)
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    latency_tolerance: float = 0.5,
+    tail_tolerance: float = 1.5,
+    query_tolerance: float = 0.1,
+) -> List[str]:
+    """Regressions of `results` against `baseline`, as readable messages"""
+    regressions = []
+    for name, result in results.items():
+        if result["errors"]:
+            regressions.append(f"{name}: {result['errors']} of {result['requests']} requests failed")
+        expected = baseline.get(name)
+        if not expected:
+            continue
+        if result["throughput"] < expected["throughput"] * (1 - latency_tolerance):
+            regressions.append(f"{name}: throughput {result['throughput']} < baseline {expected['throughput']} req/s")
+        for metric, tolerance in (("p50_ms", latency_tolerance), ("p95_ms", latency_tolerance), ("p99_ms", tail_tolerance)):
+            if result[metric] > expected[metric] * (1 + tolerance):
+                regressions.append(f"{name}: {metric} {result[metric]} > baseline {expected[metric]}")
+        # Query counts are nearly deterministic; allow a little for cache warm-up
+        if result["queries_per_request"] > expected["queries_per_request"] * (1 + query_tolerance) + 0.05:
+            regressions.append(
+                f"{name}: {result['queries_per_request']} queries per request > "
+                f"baseline {expected['queries_per_request']}"
+            )
+    return regressions
+
+
+async def run_repeated(fixture: Dict[str, Any], args: argparse.Namespace) -> List[Dict[str, Dict[str, Any]]]:
+    # One event loop for every run, so pooled async connections stay usable
+    return [
+        await run_suite(fixture, args.requests, args.concurrency, args.warmup, args.scenario)
+        for _ in range(args.repeat)
+    ]
+
+
+def print_results(results: Dict[str, Dict[str, Any]]) -> None:
+    print(f"{'scenario':<32} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'queries':>8} {'errors':>7}")
+    for name, result in results.items():
+        print(
+            f"{name:<32} {result['throughput']:8.1f} {result['p50_ms']:8.2f} {result['p95_ms']:8.2f} "
+            f"{result['p99_ms']:8.2f} {result['queries_per_request']:8.2f} {result['errors']:7d}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per scenario; medians are reported")
+    parser.add_argument("--profiles", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="stub LLM latency in seconds")
+    parser.add_argument("--scenario", action="append", help="run only these scenarios")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--check", action="store_true", help="exit 1 if results regress against the baseline")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--latency-tolerance", type=float, default=0.5, help="allowed throughput/p50/p95 change")
+    parser.add_argument("--tail-tolerance", type=float, default=1.5, help="allowed p99 increase")
+    parser.add_argument("--query-tolerance", type=float, default=0.1)
+    args = parser.parse_args()
+
+    config = {
+        "database": "sqlite" if not args.database_url else args.database_url.split(":")[0],
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "repeat": args.repeat,
+        "profiles": args.profiles,
+        "llm_latency": args.llm_latency,
+    }
+    analyses = args.requests + args.warmup
+    with benchmark_app(args.database_url, args.profiles, analyses, args.llm_latency, args.seed) as fixture:
+        results = median_results(asyncio.run(run_repeated(fixture, args)))
+    print_results(results)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump({"config": config, "results": results}, f, indent=2)
+            f.write("\n")
+        print(f"\nBaseline written to {args.baseline}")
+
+    if args.check:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline["config"] != config:
+            print(f"\nBaseline was recorded with {baseline['config']}, not {config}; rerun with those options")
+            sys.exit(2)
+        regressions = compare(
+            results, baseline["results"], args.latency_tolerance, args.tail_tolerance, args.query_tolerance
+        )
+        if regressions:
+            print("\nRegressions against the baseline:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("\nNo regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark report rendering throughput for projects with large results.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.report_rendering --reports 20 --competitors 5000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict
+
+from app.core.config import settings
+from app.services import report_rendering
+from app.services.report_generator import iter_csv_report, iter_json_report
+
+
+def make_document(competitors: int) -> Dict[str, Any]:
+    rng = random.Random(42)
+    return {
+        "report_name": "Competitive Analysis Report",
+        "report_type": "competitive_analysis",
+        "results_as_of": "2024-01-01T00:00:00",
+        "research_project": {"id": "benchmark", "name": "Benchmark", "status": "completed"},
+        "data": {
+            "total_competitors": competitors,
+            "average_competitor_rating": 4.1,
+            "market_saturation": 61.2,
+            "competitors": [
+                {
+                    "name": f"Competitor {i}",
+                    "distance": round(rng.uniform(0.1, 2.0), 1),
+                    "rating": round(rng.uniform(3.0, 4.8), 1),
+                    "price_level": rng.randint(1, 4),
+                    "cuisine": rng.choice(["Thai", "Italian", "Japanese", "Chinese"]),
+                    "estimated_monthly_customers": rng.randint(500, 5000),
+                }
+                for i in range(competitors)
+            ],
+        },
+    }
+
+
+def bench_streamed(name: str, render, document: Dict[str, Any], reports: int) -> None:
+    started = time.perf_counter()
+    size = 0
+    for _ in range(reports):
+        size = sum(len(chunk) for chunk in render(document))
+    elapsed = time.perf_counter() - started
+    print(f"{name:<6} {reports / elapsed:8.1f} reports/s  {size / 1024:8.0f} KiB each")
+
+
+def bench_rendered(report_format: str, document: Dict[str, Any], reports: int, workers: int) -> None:
+    settings.REPORT_RENDER_WORKERS = workers
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = [os.path.join(tmp_dir, f"{i}.{report_format}") for i in range(reports)]
+        # Warm up the pool so process start-up isn't measured
+        report_rendering.render_report(report_format, document, paths[0])
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+            sizes = list(executor.map(
+                lambda path: report_rendering.render_report(report_format, document, path), paths
+            ))
+        elapsed = time.perf_counter() - started
+    label = f"{report_format} ({'inline' if workers == 0 else f'{workers} procs'})"
+    print(f"{label:<18} {reports / elapsed:8.1f} reports/s  {sizes[0] / 1024:8.0f} KiB each")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--reports", type=int, default=10)
+    parser.add_argument("--competitors", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    args = parser.parse_args()
+
+    document = make_document(args.competitors)
+    print(f"{args.competitors} competitors per report, {args.reports} reports per run")
+    bench_streamed("json", iter_json_report, document, args.reports)
+    bench_streamed("csv", iter_csv_report, document, args.reports)
+    for report_format in ("excel", "pdf"):
+        bench_rendered(report_format, document, args.reports, workers=0)
+        bench_rendered(report_format, document, args.reports, workers=args.workers)
+    print()
+    for report_format, stats in report_rendering.get_render_stats().items():
+        print(f"{report_format}: {stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""
+Generate a seeded synthetic dataset of Bangkok places, competitors, restaurant profiles and research projects.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.synthetic_data --places 2000000 --profiles 500000 --out synthetic
+
+Every table is a directory of NumPy `.npy` column files; `dataset.json`
+holds the seed, row counts and the vocabularies of the coded columns
+(district, type, cuisine, status). The same seed and sizes always give
+the same data, and `load_dataset` memory-maps the columns so large
+datasets load instantly.
+
+The tables reference each other by row index: competitors are the
+restaurants and cafes among the places, projects belong to profiles and
+have the same owner. Coordinates cluster around the district centres.
+"""
+import argparse
+import json
+import os
+import time
+import zlib
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+KM_PER_DEGREE_LAT = 111.32
+DAY = 24 * 3600
+# 2024-01-01T00:00:00Z; timestamps are seconds since the epoch
+START = 1704067200
+
+# name, latitude, longitude, spread in km, share of places
+DISTRICTS = [
+    ("Sukhumvit", 13.7380, 100.5600, 2.0, 0.16),
+    ("Silom", 13.7262, 100.5290, 1.2, 0.11),
+    ("Pathum Wan", 13.7469, 100.5349, 1.5, 0.12),
+    ("Thonglor", 13.7320, 100.5780, 1.0, 0.08),
+    ("Ari", 13.7790, 100.5450, 1.0, 0.06),
+    ("Sathorn", 13.7190, 100.5290, 1.2, 0.08),
+    ("Chatuchak", 13.8020, 100.5530, 2.0, 0.09),
+    ("Bang Rak", 13.7300, 100.5170, 1.0, 0.07),
+    ("Ratchathewi", 13.7590, 100.5340, 1.3, 0.08),
+    ("Phra Nakhon", 13.7560, 100.4990, 1.5, 0.09),
+    ("Huai Khwang", 13.7760, 100.5730, 1.8, 0.06),
+]
+
+# type, share of places
+PLACE_TYPES = [
+    ("restaurant", 0.34),
+    ("cafe", 0.12),
+    ("shopping_mall", 0.04),
+    ("office", 0.14),
+    ("hotel", 0.06),
+    ("school", 0.05),
+    ("hospital", 0.02),
+    ("transit_station", 0.03),
+    ("park", 0.03),
+    ("tourist_attraction", 0.04),
+    ("residential", 0.13),
+]
+COMPETITOR_TYPES = ("restaurant", "cafe")
+
+# cuisine, share of restaurants
+CUISINES = [
+    ("Thai", 0.38),
+    ("Japanese", 0.14),
+    ("Chinese", 0.10),
+    ("Italian", 0.07),
+    ("Korean", 0.06),
+    ("Indian", 0.05),
+    ("Vietnamese", 0.04),
+    ("American", 0.05),
+    ("Mexican", 0.02),
+    ("Mediterranean", 0.03),
+    ("Fusion", 0.06),
+]
+
+# status, share of projects
+PROJECT_STATUSES = [("completed", 0.7), ("in_progress", 0.2), ("pending", 0.1)]
+RESEARCH_GOALS = [
+    "competitive_analysis", "market_sizing", "demographic_analysis", "location_intelligence",
+    "tourist_analysis", "local_competition", "pricing_strategy", "food_delivery_analysis",
+]
+
+
+def _names(choices: List[tuple]) -> List[str]:
+    return [choice[0] for choice in choices]
+
+
+def _shares(choices: List[tuple]) -> np.ndarray:
+    shares = np.array([choice[-1] for choice in choices], dtype=float)
+    return shares / shares.sum()
+
+
+def _rng(seed: int, table: str) -> np.random.Generator:
+    # One stream per table, so changing the size of one table leaves the others alone
+    return np.random.default_rng([seed, zlib.crc32(table.encode())])
+
+
+def _scatter(rng: np.random.Generator, district: np.ndarray, spread: float = 1.0) -> tuple:
+    """Coordinates normally distributed around the centres of `district`"""
+    lat0 = np.array([d[1] for d in DISTRICTS])[district]
+    lng0 = np.array([d[2] for d in DISTRICTS])[district]
+    km = np.array([d[3] for d in DISTRICTS])[district] * spread
+    lat = lat0 + rng.standard_normal(len(district)) * km / KM_PER_DEGREE_LAT
+    lng = lng0 + rng.standard_normal(len(district)) * km / (KM_PER_DEGREE_LAT * np.cos(np.radians(lat0)))
+    return lat.round(6), lng.round(6)
+
+
+def generate_places(seed: int, count: int) -> Dict[str, np.ndarray]:
+    rng = _rng(seed, "places")
+    district = rng.choice(len(DISTRICTS), size=count, p=_shares(DISTRICTS)).astype(np.int8)
+    lat, lng = _scatter(rng, district)
+    type_ = rng.choice(len(PLACE_TYPES), size=count, p=_shares(PLACE_TYPES)).astype(np.int8)
+    rating = np.clip(rng.normal(4.0, 0.45, count), 1.0, 5.0).round(1).astype(np.float32)
+    # Heavy-tailed popularity; better rated places get more reviews
+    reviews = (rng.lognormal(4.0, 1.2, count) * (rating / 4.0) ** 3).astype(np.int32)
+    return {"district": district, "lat": lat, "lng": lng, "type": type_, "rating": rating, "reviews": reviews}
+
+
+def generate_competitors(seed: int, places: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    rng = _rng(seed, "competitors")
+    type_codes = [_names(PLACE_TYPES).index(name) for name in COMPETITOR_TYPES]
+    place = np.flatnonzero(np.isin(places["type"], type_codes))
+    count = len(place)
+    cuisine = rng.choice(len(CUISINES), size=count, p=_shares(CUISINES)).astype(np.int8)
+    price_level = rng.choice(4, size=count, p=[0.35, 0.4, 0.18, 0.07]).astype(np.int8) + 1
+    reviews = places["reviews"][place]
+    return {
+        "place": place,
+        "district": places["district"][place],
+        "lat": places["lat"][place],
+        "lng": places["lng"][place],
+        "cuisine": cuisine,
+        "price_level": price_level,
+        "rating": places["rating"][place],
+        "reviews": reviews,
+        # Roughly one review per 20 customers
+        "monthly_customers": (reviews * rng.uniform(15, 25, count) / 12 + 300).astype(np.int32),
+        "popular_dishes": rng.integers(2, 6, count, dtype=np.int8),
+    }
+
+
+def generate_profiles(seed: int, count: int, profiles_per_user: int) -> Dict[str, np.ndarray]:
+    rng = _rng(seed, "profiles")
+    district = rng.choice(len(DISTRICTS), size=count, p=_shares(DISTRICTS)).astype(np.int8)
+    lat, lng = _scatter(rng, district, spread=0.5)
+    return {
+        "owner": np.arange(count, dtype=np.int64) // profiles_per_user,
+        "district": district,
+        "lat": lat,
+        "lng": lng,
+        "cuisine": rng.choice(len(CUISINES), size=count, p=_shares(CUISINES)).astype(np.int8),
+        "price_level": rng.choice(4, size=count, p=[0.3, 0.4, 0.2, 0.1]).astype(np.int8) + 1,
+        "is_new_business": rng.random(count) < 0.6,
+        "is_local_brand": rng.random(count) < 0.7,
+        "created_at": START + rng.integers(0, 365 * DAY, count),
+    }
+
+
+def generate_projects(seed: int, profiles: Dict[str, np.ndarray], projects_per_profile: int) -> Dict[str, np.ndarray]:
+    rng = _rng(seed, "projects")
+    profile = np.repeat(np.arange(len(profiles["owner"]), dtype=np.int64), projects_per_profile)
+    count = len(profile)
+    created_at = profiles["created_at"][profile] + rng.exponential(30 * DAY, count).astype(np.int64)
+    status = rng.choice(len(PROJECT_STATUSES), size=count, p=_shares(PROJECT_STATUSES)).astype(np.int8)
+    completed = status == _names(PROJECT_STATUSES).index("completed")
+    in_progress = status == _names(PROJECT_STATUSES).index("in_progress")
+    progress = np.where(completed, 100, np.where(in_progress, rng.integers(5, 95, count), 0)).astype(np.int8)
+    completed_at = np.where(completed, created_at + rng.exponential(2 * DAY, count).astype(np.int64), -1)
+    projects = {
+        "profile": profile,
+        "owner": profiles["owner"][profile],
+        "status": status,
+        "progress": progress,
+        "created_at": created_at,
+        "completed_at": completed_at,
+    }
+    for goal in RESEARCH_GOALS:
+        projects[goal] = rng.random(count) < 0.6
+    return projects
+
+
+def generate_dataset(
+    seed: int = 0,
+    places: int = 100_000,
+    profiles: int = 10_000,
+    profiles_per_user: int = 2,
+    projects_per_profile: int = 3,
+) -> Dict[str, Any]:
+    """Generate all tables; returns `{"meta": ..., "tables": {table: {column: array}}}`"""
+    place_table = generate_places(seed, places)
+    profile_table = generate_profiles(seed, profiles, profiles_per_user)
+    tables = {
+        "places": place_table,
+        "competitors": generate_competitors(seed, place_table),
+        "profiles": profile_table,
+        "projects": generate_projects(seed, profile_table, projects_per_profile),
+    }
+    meta = {
+        "seed": seed,
+        "profiles_per_user": profiles_per_user,
+        "projects_per_profile": projects_per_profile,
+        "rows": {name: len(next(iter(columns.values()))) for name, columns in tables.items()},
+        "vocabularies": {
+            "district": _names(DISTRICTS),
+            "type": _names(PLACE_TYPES),
+            "cuisine": _names(CUISINES),
+            "status": _names(PROJECT_STATUSES),
+        },
+    }
+    return {"meta": meta, "tables": tables}
+
+
+def save_dataset(dataset: Dict[str, Any], path: str) -> None:
+    for table, columns in dataset["tables"].items():
+        os.makedirs(os.path.join(path, table), exist_ok=True)
+        for column, values in columns.items():
+            np.save(os.path.join(path, table, f"{column}.npy"), values)
+    with open(os.path.join(path, "dataset.json"), "w") as f:
+        json.dump(dataset["meta"], f, indent=2)
+
+
+def load_dataset(path: str, tables: Optional[List[str]] = None, mmap: bool = True) -> Dict[str, Any]:
+    """Load a saved dataset, or only some of its tables, memory-mapping the columns"""
+    with open(os.path.join(path, "dataset.json")) as f:
+        meta = json.load(f)
+    loaded = {}
+    for table in tables or meta["rows"]:
+        directory = os.path.join(path, table)
+        loaded[table] = {
+            name[:-len(".npy")]: np.load(os.path.join(directory, name), mmap_mode="r" if mmap else None)
+            for name in sorted(os.listdir(directory))
+            if name.endswith(".npy")
+        }
+    return {"meta": meta, "tables": loaded}
+
+
+def decode(dataset: Dict[str, Any], vocabulary: str, codes: Any) -> Any:
+    """Names for the codes of a coded column, e.g. `decode(dataset, "cuisine", competitors["cuisine"])`"""
+    return np.asarray(dataset["meta"]["vocabularies"][vocabulary], dtype=object)[np.asarray(codes)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--places", type=int, default=1_000_000)
+    parser.add_argument("--profiles", type=int, default=100_000)
+    parser.add_argument("--profiles-per-user", type=int, default=2)
+    parser.add_argument("--projects-per-profile", type=int, default=3)
+    parser.add_argument("--out", default="synthetic")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    dataset = generate_dataset(
+        args.seed, args.places, args.profiles, args.profiles_per_user, args.projects_per_profile
+    )
+    generated = time.perf_counter() - started
+    save_dataset(dataset, args.out)
+    rows = dataset["meta"]["rows"]
+    print(f"{sum(rows.values())} rows generated in {generated:.1f}s, saved to {args.out}")
+    for table, count in rows.items():
+        print(f"  {table:<12} {count:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from app.api.api_v1.endpoints import chatbot
+from app.core.config import settings
+from app.services.chat_cache import ChatCompletionCache
+from app.services.chat_stub import StubChatClient
+
+
+def _use_stub(monkeypatch) -> StubChatClient:
+    stub = StubChatClient()
+    monkeypatch.setattr(chatbot, "client", stub)
+    monkeypatch.setattr(chatbot, "chat_completion_cache", ChatCompletionCache())
+    chatbot.chat_completion_cache._store.clear()
+    return stub
+
+
+def test_chat(client: TestClient, normal_user_token_headers: dict, monkeypatch) -> None:
+    stub = _use_stub(monkeypatch)
+    for content in ("Hi", "  hi "):
+        response = client.post(
+            f"{settings.API_V1_STR}/chatbot/chat",
+            headers=normal_user_token_headers,
+            json={"messages": [{"role": "user", "content": content}]},
+        )
+        assert response.status_code == 200
+        assert response.json()["response"] == "BiteBase AI (stub) answering: Hi"
+    # The normalized repeat is served from the cache
+    assert stub.chat.completions.calls == 1
+
+
+def test_chat_stream(client: TestClient, normal_user_token_headers: dict, monkeypatch) -> None:
+    stub = _use_stub(monkeypatch)
+    expected = [
+        'data: {"content": "BiteBase AI"}',
+        'data: {"content": " (stub)"}',
+        'data: {"content": " answering: Hi"}',
+        'data: {"content": "[DONE]"}',
+    ]
+    for _ in range(2):
+        response = client.post(
+            f"{settings.API_V1_STR}/chatbot/chat/stream",
+            headers=normal_user_token_headers,
+            json={"messages": [{"role": "user", "content": "Hi"}]},
+        )
+        assert response.status_code == 200
+        assert [line for line in response.text.split("\n\n") if line] == expected
+    assert stub.chat.completions.calls == 1
+    assert stub.chat.completions.streams[0].closed
+
+
+def test_semantic_cache_matches_rephrasing() -> None:
+    cache = ChatCompletionCache(semantic=True, threshold=0.8)
+    cache._store.clear()
+    params = {"model": "gpt-4"}
+    context = [{"role": "system", "content": "You are helpful."}]
+    cache.set(
+        context + [{"role": "user", "content": "What are your opening hours?"}],
+        params,
+        ["9 to 5"],
+    )
+
+    assert cache.get(context + [{"role": "user", "content": "what are your opening hours"}], params) == ["9 to 5"]
+    assert cache.get(context + [{"role": "user", "content": "Suggest a menu price"}], params) is None
+    # A different conversation context never shares entries
+    other = [{"role": "system", "content": "Something else."}]
+    assert cache.get(other + [{"role": "user", "content": "What are your opening hours?"}], params) is None
+    assert cache.stats()["semantic_hits"] == 1
+
+
+def test_stub_keeps_only_recent_streams() -> None:
+    completions = StubChatClient().chat.completions
+
+    async def stream_many():
+        for i in range(50):
+            await completions.create(messages=[{"role": "user", "content": f"Hi {i}"}], stream=True)
+
+    asyncio.run(stream_many())
+    assert completions.calls == 50
+    assert len(completions.streams) == completions.streams.maxlen
@@ -0,0 +1,19 @@
+import pytest
+
+from app.api.downloads import parse_range
+
+
+def test_parse_range() -> None:
+    assert parse_range("bytes=0-99", 1000) == (0, 99)
+    assert parse_range("bytes=900-", 1000) == (900, 999)
+    assert parse_range("bytes=-100", 1000) == (900, 999)
+    assert parse_range("bytes=990-2000", 1000) == (990, 999)
+    # Multiple ranges fall back to the whole file
+    assert parse_range("bytes=0-1,5-6", 1000) is None
+    with pytest.raises(ValueError):
+        parse_range("bytes=1000-", 1000)
+    with pytest.raises(ValueError):
+        parse_range("bytes=20-10", 1000)
+    for header in ("bytes=-10", "bytes=0-", "bytes=0-0"):
+        with pytest.raises(ValueError):
+            parse_range(header, 0)
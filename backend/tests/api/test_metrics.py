@@ -0,0 +1,14 @@
+from typing import Dict
+
+from fastapi.testclient import TestClient
+
+
+def test_metrics_requires_superuser(
+    client: TestClient, superuser_token_headers: Dict[str, str], normal_user_token_headers: Dict[str, str]
+) -> None:
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers=normal_user_token_headers).status_code == 400
+
+    r = client.get("/metrics", headers=superuser_token_headers)
+    assert r.status_code == 200
+    assert "db_pool" in r.json()
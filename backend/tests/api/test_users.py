@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 
 from app import crud
 from app.core.config import settings
+from app.core.principal_cache import principal_cache
 from app.tests.utils.user import create_random_user
 from app.tests.utils.utils import random_email, random_lower_string
 
@@ -42,6 +43,37 @@ def test_update_user_me(
     assert current_user["full_name"] == full_name
 
 
+def test_current_user_is_cached_until_updated(
+    client: TestClient, normal_user_token_headers: dict, db: Session
+) -> None:
+    url = f"{settings.API_V1_STR}/users/me"
+    client.get(url, headers=normal_user_token_headers)
+    hits = principal_cache.local.hits
+    r = client.get(url, headers=normal_user_token_headers)
+    assert r.status_code == 200
+    assert principal_cache.local.hits == hits + 1
+
+    # Updating the user drops the cached copy, so the change shows at once
+    user = crud.user.get_by_email(db, email=settings.EMAIL_TEST_USER)
+    crud.user.update(db, db_obj=user, obj_in={"full_name": "Renamed User"})
+    assert principal_cache.local.get(user.id) is None
+    r = client.get(url, headers=normal_user_token_headers)
+    assert r.json()["full_name"] == "Renamed User"
+
+    crud.user.update(db, db_obj=user, obj_in={"is_active": False})
+    r = client.get(url, headers=normal_user_token_headers)
+    assert r.status_code == 400
+    crud.user.update(db, db_obj=user, obj_in={"is_active": True})
+
+    # Bulk updates drop the cached copies too
+    client.get(url, headers=normal_user_token_headers)
+    crud.user.bulk_update(db, rows=[{"id": user.id, "is_active": False}])
+    assert principal_cache.local.get(user.id) is None
+    r = client.get(url, headers=normal_user_token_headers)
+    assert r.status_code == 400
+    crud.user.bulk_update(db, rows=[{"id": user.id, "is_active": True}])
+
+
 def test_get_user_by_id(
     client: TestClient, superuser_token_headers: dict, db: Session
 ) -> None:
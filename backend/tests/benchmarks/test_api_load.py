@@ -0,0 +1,56 @@
+import asyncio
+
+from app.api.api_v1.endpoints import chatbot
+from app.main import app
+from app.worker import celery_app
+from benchmarks.api_load import benchmark_app, build_scenarios, compare, median_results, run_suite
+
+
+def result(**metrics) -> dict:
+    return dict(
+        {"requests": 100, "errors": 0, "throughput": 100.0, "p50_ms": 10.0, "p95_ms": 20.0, "p99_ms": 30.0,
+         "queries_per_request": 2.0},
+        **metrics,
+    )
+
+
+def test_suite_drives_every_scenario() -> None:
+    overrides, chat_client = dict(app.dependency_overrides), chatbot.client
+    eager = celery_app.conf.task_always_eager
+
+    with benchmark_app(None, profiles=3, analyses=5, llm_latency=0, seed_value=0) as fixture:
+        results = asyncio.run(run_suite(fixture, requests=4, concurrency=2, warmup=1))
+
+    assert set(results) == {scenario.name for scenario in build_scenarios(fixture)}
+    for name, scenario_result in results.items():
+        assert scenario_result["errors"] == 0, name
+        assert scenario_result["throughput"] > 0
+        assert scenario_result["p50_ms"] <= scenario_result["p95_ms"] <= scenario_result["p99_ms"]
+    assert results["reports_list"]["queries_per_request"] >= 1
+    # The app is left as it was found
+    assert app.dependency_overrides == overrides
+    assert chatbot.client is chat_client
+    assert celery_app.conf.task_always_eager == eager
+
+
+def test_compare_flags_regressions() -> None:
+    baseline = {"reports_list": result()}
+
+    assert compare({"reports_list": result(p95_ms=25.0, throughput=80.0)}, baseline) == []
+    assert compare({"new_scenario": result()}, baseline) == []
+    regressions = compare(
+        {"reports_list": result(throughput=40.0, p95_ms=35.0, queries_per_request=3.0, errors=2)}, baseline
+    )
+    assert len(regressions) == 4
+    assert regressions[0] == "reports_list: 2 of 100 requests failed"
+    assert any("queries per request" in regression for regression in regressions)
+
+
+def test_median_results() -> None:
+    runs = [{"a": result(p99_ms=30.0)}, {"a": result(p99_ms=300.0, errors=1)}, {"a": result(p99_ms=35.0)}]
+
+    merged = median_results(runs)["a"]
+
+    assert merged["p99_ms"] == 35.0
+    assert merged["requests"] == 300
+    assert merged["errors"] == 1
@@ -0,0 +1,44 @@
+import numpy as np
+
+from benchmarks.synthetic_data import COMPETITOR_TYPES, decode, generate_dataset, load_dataset, save_dataset
+
+
+def test_dataset_is_reproducible() -> None:
+    first = generate_dataset(seed=7, places=5000, profiles=500)
+    second = generate_dataset(seed=7, places=5000, profiles=500)
+    other = generate_dataset(seed=8, places=5000, profiles=500)
+
+    for table, columns in first["tables"].items():
+        for column, values in columns.items():
+            np.testing.assert_array_equal(values, second["tables"][table][column])
+    assert not np.array_equal(first["tables"]["places"]["lat"], other["tables"]["places"]["lat"])
+
+
+def test_tables_are_coherent() -> None:
+    dataset = generate_dataset(seed=1, places=20000, profiles=1000, profiles_per_user=2, projects_per_profile=3)
+    places, competitors = dataset["tables"]["places"], dataset["tables"]["competitors"]
+    profiles, projects = dataset["tables"]["profiles"], dataset["tables"]["projects"]
+
+    assert set(decode(dataset, "type", places["type"][competitors["place"]])) == set(COMPETITOR_TYPES)
+    np.testing.assert_array_equal(competitors["rating"], places["rating"][competitors["place"]])
+    assert 13.5 < places["lat"].min() and places["lat"].max() < 14.0
+    assert 100.3 < places["lng"].min() and places["lng"].max() < 100.8
+
+    assert len(projects["profile"]) == 3 * len(profiles["owner"])
+    np.testing.assert_array_equal(projects["owner"], profiles["owner"][projects["profile"]])
+    assert (projects["created_at"] >= profiles["created_at"][projects["profile"]]).all()
+    completed = decode(dataset, "status", projects["status"]) == "completed"
+    assert (projects["completed_at"][completed] >= projects["created_at"][completed]).all()
+    assert (projects["progress"][completed] == 100).all()
+
+
+def test_save_and_load(tmp_path) -> None:
+    dataset = generate_dataset(seed=3, places=2000, profiles=100)
+    save_dataset(dataset, str(tmp_path))
+
+    loaded = load_dataset(str(tmp_path), tables=["profiles"])
+
+    assert loaded["meta"] == dataset["meta"]
+    assert list(loaded["tables"]) == ["profiles"]
+    for column, values in dataset["tables"]["profiles"].items():
+        np.testing.assert_array_equal(loaded["tables"]["profiles"][column], values)
@@ -4,13 +4,20 @@ from typing import Dict, Generator
 
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 
+# Run Celery tasks inline instead of sending them to Redis
+os.environ.setdefault("CELERY_TASK_ALWAYS_EAGER", "true")
+
+from app import worker
 from app.db.base import Base
+from app.db.async_session import get_async_db
 from app.db.session import get_db
 from app.main import app
 from app.core.config import settings
+from app.services import artifact_store
 from app.tests.utils.user import authentication_token_from_email
 from app.tests.utils.utils import get_superuser_token_headers
 
@@ -23,6 +30,21 @@ engine = create_engine(
     poolclass=StaticPool,
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Async endpoints read the same database file; NullPool because each test
+# request may run on a different event loop
+async_engine = create_async_engine("sqlite+aiosqlite:///./test.db", poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def artifact_store_path(tmp_path_factory) -> Generator:
+    # Keep rendered report artifacts out of the working tree
+    path = settings.ARTIFACT_STORE_PATH
+    settings.ARTIFACT_STORE_PATH = str(tmp_path_factory.mktemp("reports"))
+    artifact_store._store = None
+    yield settings.ARTIFACT_STORE_PATH
+    settings.ARTIFACT_STORE_PATH = path
+    artifact_store._store = None
 
 
 @pytest.fixture(scope="session")
@@ -30,6 +52,9 @@ def db() -> Generator:
     # Create the database and tables
     Base.metadata.create_all(bind=engine)
     
+    # Tasks open their own sessions against the test database
+    worker.SessionLocal = TestingSessionLocal
+
     # Run the tests
     db = TestingSessionLocal()
     try:
@@ -50,7 +75,12 @@ def client(db) -> Generator:
         finally:
             pass
     
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as async_db:
+            yield async_db
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     
     with TestClient(app) as c:
         yield c
@@ -0,0 +1,82 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app import crud
+from app.models.report import Report, ReportFormat, ReportType
+
+
+@pytest.fixture
+def database(database_path, db):
+    start = datetime(2024, 1, 1)
+    for i in range(5):
+        db.add(Report(
+            id=f"report-{i}",
+            owner_id="owner",
+            research_project_id="project",
+            name=f"Report {i}",
+            type=ReportType.CUSTOM,
+            format=ReportFormat.JSON,
+            data={"i": i},
+            created_at=start + timedelta(minutes=i),
+        ))
+    db.commit()
+    return database_path, db
+
+
+def run(path, query):
+    async def main():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+                return await query(db)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(main())
+
+
+def test_async_get_page_matches_sync(database) -> None:
+    path, db = database
+    filters = {"owner_id": "owner"}
+
+    rows, cursor = run(path, lambda adb: crud.aio.report.get_page(adb, filters=filters, limit=2))
+    expected, expected_cursor = crud.report.get_page(db, filters=filters, limit=2)
+    assert [r.id for r in rows] == [r.id for r in expected] == ["report-4", "report-3"]
+    assert cursor == expected_cursor
+
+    rows, cursor = run(
+        path,
+        lambda adb: crud.aio.report.get_page(adb, filters=filters, cursor=cursor, limit=2, columns=["id", "name"]),
+    )
+    assert [(r.id, r.name) for r in rows] == [("report-2", "Report 2"), ("report-1", "Report 1")]
+
+
+def test_cursor_survives_deleted_row(database) -> None:
+    _, db = database
+    filters = {"owner_id": "owner"}
+    _, cursor = crud.report.get_page(db, filters=filters, limit=2)
+
+    crud.report.remove(db, id="report-3")
+
+    rows, _ = crud.report.get_page(db, filters=filters, cursor=cursor, limit=2)
+    assert [r.id for r in rows] == ["report-2", "report-1"]
+
+
+def test_async_update_and_remove(database) -> None:
+    path, db = database
+
+    async def update(adb):
+        report = await crud.aio.report.get(adb, "report-0")
+        return await crud.aio.report.update(adb, db_obj=report, obj_in={"name": "Renamed"})
+
+    assert run(path, update).name == "Renamed"
+
+    async def remove(adb):
+        await crud.aio.report.remove(adb, id="report-0")
+        return await crud.aio.report.get(adb, "report-0")
+
+    assert run(path, remove) is None
+    assert crud.report.get(db, id="report-1") is not None
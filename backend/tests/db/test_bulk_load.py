@@ -0,0 +1,75 @@
+import importlib.util
+import os
+
+import pytest
+from app.models.integration import Integration, IntegrationType
+from app.models.report import Report, ReportFormat
+from app.models.research_project import ProjectStatus, ResearchProject
+
+pytest.importorskip("psycopg2")
+pytest.importorskip("sqlalchemy_utils")
+
+SCRIPT = os.path.join(os.path.dirname(__file__), "..", "..", "..", "initialize_database.py")
+
+
+@pytest.fixture(scope="module")
+def initialize_database():
+    spec = importlib.util.spec_from_file_location("initialize_database", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_bulk_rows_load_through_the_orm(engine, db, initialize_database) -> None:
+    counts = initialize_database.BulkCounts(2, 1, 2, 2)
+    generators = {
+        "integration": initialize_database.generate_integrations,
+        "researchproject": initialize_database.generate_research_projects,
+        "report": initialize_database.generate_reports,
+    }
+    with engine.begin() as conn:
+        for table, generate in generators.items():
+            # Timestamps are left to the server default; they are written as
+            # ISO strings for COPY, which SQLite can't parse back
+            columns = [c for c in initialize_database.BULK_COLUMNS[table] if not c.endswith("_at")]
+            indexes = [initialize_database.BULK_COLUMNS[table].index(c) for c in columns]
+            conn.exec_driver_sql(
+                f'INSERT INTO "{table}" ({", ".join(columns)}) VALUES ({", ".join("?" for _ in columns)})',
+                [tuple(row[i] for i in indexes) for row in generate(counts, 0, 1)],
+            )
+
+    projects = db.query(ResearchProject).all()
+    reports = db.query(Report).all()
+    integrations = db.query(Integration).all()
+
+    assert len(projects) == 4 and len(reports) == 8 and len(integrations) == 2
+    assert {project.status for project in projects} <= {ProjectStatus.COMPLETED, ProjectStatus.PENDING}
+    assert {report.format for report in reports} == {ReportFormat.JSON}
+    assert all(isinstance(report.data, dict) for report in reports)
+    assert {integration.type for integration in integrations} == {IntegrationType.GOOGLE_PLACES}
+
+
+def test_copy_stream_encodes_rows_lazily(initialize_database) -> None:
+    rows = [(i, f"name {i}") for i in range(5)]
+    lines = [f"{i},name {i}\n" for i in range(5)]  # 9 characters each
+
+    stream = initialize_database.CopyStream(iter(rows), batch_size=2)
+    assert stream.read(4) == lines[0][:4]
+    # Only the first batch has been encoded so far
+    assert stream.rows == 2
+
+    # A read crossing the end of a batch encodes the next one
+    assert stream.read(15) == lines[0][4:] + lines[1] + lines[2][:1]
+    assert stream.rows == 4
+
+    assert stream.read(-1) == lines[2][1:] + "".join(lines[3:])
+    assert stream.rows == 5
+    assert stream.read(10) == ""
+
+
+def test_copy_stream_writes_null_for_none(initialize_database) -> None:
+    stream = initialize_database.CopyStream([("a", None, 1), (None, "b, c", 2.5)])
+
+    # COPY ... FORMAT csv reads an unquoted empty field as NULL
+    assert stream.read() == 'a,,1\n,"b, c",2.5\n'
+    assert stream.rows == 2
@@ -0,0 +1,75 @@
+import pytest
+
+from app import crud
+from app.core.security import verify_password
+from app.models.report import ReportFormat, ReportType
+from app.schemas.report import ReportCreate
+from app.schemas.user import UserCreate
+
+
+def report_in(i: int) -> dict:
+    return dict(
+        ReportCreate(
+            name=f"Report {i}", type=ReportType.CUSTOM, format=ReportFormat.JSON, research_project_id="project"
+        ).dict(),
+        owner_id="owner",
+        data={"i": i},
+    )
+
+
+def test_create_many_is_one_statement(db, statements) -> None:
+    reports = crud.report.create_many(db, objs_in=[report_in(i) for i in range(50)])
+
+    assert statements[0].startswith("INSERT INTO report")
+    assert len({report.id for report in reports}) == 50
+    # Returned objects stay loaded after the commit
+    assert [report.data["i"] for report in reports] == list(range(50))
+    assert all(report.created_at is not None for report in reports)
+    assert len(statements) == 1
+    assert crud.report.create_many(db, objs_in=[]) == []
+
+
+def test_create_many_rejects_unknown_columns(db) -> None:
+    with pytest.raises(ValueError):
+        crud.report.create_many(db, objs_in=[{"name": "Report", "unknown": 1}])
+
+
+def test_create_many_users_hashes_passwords(db) -> None:
+    users = crud.user.create_many(db, objs_in=[
+        UserCreate(email="first@example.com", password="secret", full_name="First"),
+        {"email": "second@example.com", "password": "other", "full_name": "Second"},
+    ])
+
+    assert [user.email for user in users] == ["first@example.com", "second@example.com"]
+    assert verify_password("secret", users[0].hashed_password)
+    assert verify_password("other", users[1].hashed_password)
+
+
+def test_upsert_many(db, statements) -> None:
+    first, second = crud.report.create_many(db, objs_in=[report_in(1), report_in(2)])
+    del statements[:]
+
+    upserted = crud.report.upsert_many(db, objs_in=[
+        {**report_in(1), "id": first.id, "name": "Renamed"},
+        report_in(3),
+    ])
+
+    assert len(statements) == 1
+    assert "ON CONFLICT (id) DO UPDATE" in statements[0]
+    assert sorted(report.name for report in upserted) == ["Renamed", "Report 3"]
+    # The object already in the session is updated in place
+    assert first in upserted and first.name == "Renamed"
+    assert first.updated_at is not None
+    assert second.name == "Report 2"
+
+
+def test_upsert_many_without_updates_skips_existing_rows(db) -> None:
+    existing = crud.report.create_many(db, objs_in=[report_in(1)])[0]
+
+    inserted = crud.report.upsert_many(
+        db, objs_in=[{**report_in(1), "id": existing.id, "name": "Renamed"}, report_in(2)], update_columns=[]
+    )
+
+    assert [report.name for report in inserted] == ["Report 2"]
+    db.expire_all()
+    assert crud.report.get(db, id=existing.id).name == "Report 1"
@@ -0,0 +1,95 @@
+import pytest
+from fastapi.encoders import jsonable_encoder
+
+from app import crud
+from app.models.research_project import ProjectStatus, ResearchProject
+
+
+def add_project(db, id: str, competitors: int = 0) -> ResearchProject:
+    project = ResearchProject(
+        id=id,
+        owner_id="owner",
+        restaurant_profile_id="profile",
+        name=f"Project {id}",
+        status=ProjectStatus.PENDING,
+        progress=0,
+        results={"competitors": [{"name": f"Competitor {i}", "rating": 4.2} for i in range(competitors)]},
+    )
+    db.add(project)
+    db.commit()
+    return crud.research_project.get(db, id=id)
+
+
+def test_update_issues_one_statement(db, statements) -> None:
+    project = add_project(db, "p1")
+    del statements[:]
+
+    crud.research_project.update(db, db_obj=project, obj_in={"progress": 40, "unknown": 1})
+
+    assert statements[0].startswith("UPDATE researchproject SET progress=")
+    assert statements[0].endswith("RETURNING updated_at")
+    # Attributes stay loaded, including the generated updated_at
+    assert project.progress == 40
+    assert project.updated_at is not None
+    assert len(statements) == 1
+
+
+def test_update_skips_unchanged_values(db, statements) -> None:
+    project = add_project(db, "p1")
+    del statements[:]
+
+    crud.research_project.update(db, db_obj=project, obj_in={"name": project.name, "progress": 0})
+
+    assert statements == []
+
+
+def test_bulk_update(db) -> None:
+    for i in range(3):
+        add_project(db, f"p{i}")
+
+    updated = crud.research_project.bulk_update(db, rows=[
+        {"id": "p0", "progress": 10},
+        {"id": "p1", "progress": 20},
+        {"id": "p2", "status": ProjectStatus.IN_PROGRESS},
+    ])
+
+    assert updated == 3
+    db.expire_all()
+    projects = {p.id: p for p in db.query(ResearchProject)}
+    assert [projects[id].progress for id in ("p0", "p1", "p2")] == [10, 20, 0]
+    assert projects["p2"].status == ProjectStatus.IN_PROGRESS
+    with pytest.raises(ValueError):
+        crud.research_project.bulk_update(db, rows=[{"progress": 1}])
+    with pytest.raises(ValueError):
+        crud.research_project.bulk_update(db, rows=[{"id": "p0", "unknown": 1}])
+
+
+def legacy_update(db, db_obj, obj_in):
+    """The former CRUDBase.update: encode the whole object, commit and refresh"""
+    obj_data = jsonable_encoder(db_obj)
+    for field in obj_data:
+        if field in obj_in:
+            setattr(db_obj, field, obj_in[field])
+    db.add(db_obj)
+    db.commit()
+    db.refresh(db_obj)
+    return db_obj
+
+
+def test_status_ticks_skip_the_reload(db, statements) -> None:
+    ticks = 20
+    legacy_project = add_project(db, "legacy", competitors=5000)
+    project = add_project(db, "targeted", competitors=5000)
+    del statements[:]
+
+    for progress in range(1, ticks + 1):
+        legacy_update(db, legacy_project, {"progress": progress})
+    legacy_statements = len(statements)
+
+    del statements[:]
+    for progress in range(1, ticks + 1):
+        crud.research_project.update(db, db_obj=project, obj_in={"progress": progress})
+
+    assert len(statements) == ticks
+    # The legacy path reloads the row (and its results) after every tick
+    assert legacy_statements > 1.5 * ticks
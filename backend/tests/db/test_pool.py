@@ -0,0 +1,115 @@
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db.async_session import create_async_db_engine
+from app.db.pool import InstrumentedQueuePool, install_pool_hooks
+from app.db.session import create_db_engine
+
+
+@pytest.fixture
+def pooled_engine(database_path):
+    # A small instrumented pool instead of the shared `engine`
+    engine = create_engine(
+        f"sqlite:///{database_path}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.1,
+    )
+    yield engine
+    engine.dispose()
+
+
+def test_unused_session_does_not_check_out(pooled_engine) -> None:
+    SessionLocal = sessionmaker(bind=pooled_engine)
+    db = SessionLocal()
+    db.close()
+    assert pooled_engine.pool.stats()["checkouts"] == 0
+
+
+def test_checkouts_and_usage_are_counted(pooled_engine) -> None:
+    SessionLocal = sessionmaker(bind=pooled_engine)
+    db = SessionLocal()
+    db.execute(text("SELECT 1"))
+    stats = pooled_engine.pool.stats()
+    assert stats["checkouts"] == 1
+    assert stats["in_use"] == 1
+
+    other = SessionLocal()
+    other.execute(text("SELECT 1"))
+    assert pooled_engine.pool.stats()["overflow"] == 1
+
+    db.close()
+    other.close()
+    stats = pooled_engine.pool.stats()
+    assert stats["in_use"] == 0
+    assert stats["checkouts"] == 2
+    assert stats["max_wait_seconds"] >= 0
+
+
+def test_timeouts_are_counted(pooled_engine) -> None:
+    held = [pooled_engine.connect(), pooled_engine.connect()]
+    with pytest.raises(PoolTimeoutError):
+        pooled_engine.connect()
+    for connection in held:
+        connection.close()
+    assert pooled_engine.pool.stats()["timeouts"] == 1
+
+
+def test_saturated_checkouts_are_counted(pooled_engine) -> None:
+    install_pool_hooks(pooled_engine)
+    first = pooled_engine.connect()
+    second = pooled_engine.connect()
+    stats = pooled_engine.pool.stats()
+    assert stats["peak_in_use"] == 2
+    assert stats["saturated_checkouts"] == 1
+    first.close()
+    second.close()
+
+
+def test_idle_connections_are_pinged_and_replaced(pooled_engine) -> None:
+    install_pool_hooks(pooled_engine, idle_ping=0)
+    with pooled_engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        dbapi_connection = connection.connection.dbapi_connection
+    # Simulate the server dropping the idle connection
+    dbapi_connection.close()
+
+    with pooled_engine.connect() as connection:
+        assert connection.execute(text("SELECT 1")).scalar() == 1
+    stats = pooled_engine.pool.stats()
+    assert stats["ping_failures"] == 1
+
+
+def test_engine_pool_is_configured_from_settings(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 3)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 2)
+    monkeypatch.setattr(settings, "DB_POOL_PRE_PING", "idle")
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'settings.db'}")
+    assert isinstance(engine.pool, InstrumentedQueuePool)
+    assert engine.pool.size() == 3
+    assert engine.pool.stats()["max_overflow"] == 2
+    engine.dispose()
+
+    monkeypatch.setattr(settings, "DB_POOL_PRE_PING", "sometimes")
+    with pytest.raises(ValueError):
+        create_db_engine(f"sqlite:///{tmp_path / 'settings.db'}")
+
+
+def test_async_pool_is_sized_separately(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 3)
+    monkeypatch.setattr(settings, "DB_ASYNC_MAX_OVERFLOW", 4)
+    engine = create_async_db_engine(f"sqlite:///{tmp_path / 'settings.db'}")
+    assert engine.pool.size() == 3
+    assert engine.pool.stats()["max_overflow"] == 4
+    asyncio.run(engine.dispose())
+
+    monkeypatch.setattr(settings, "DB_ASYNC_POOL_SIZE", 1)
+    engine = create_async_db_engine(f"sqlite:///{tmp_path / 'settings.db'}")
+    assert engine.pool.size() == 1
+    asyncio.run(engine.dispose())
@@ -75,3 +75,48 @@ def test_get_demographics(
     assert "population" in content
     assert "age_distribution" in content
     assert "income_levels" in content
+
+
+def test_read_cache_stats(
+    client: TestClient, superuser_token_headers: dict, user_token_headers: dict
+) -> None:
+    params = {
+        "latitude": 13.7563,
+        "longitude": 100.5018,
+        "radius": 1.0,
+    }
+    client.get(
+        f"{settings.API_V1_STR}/location/demographics",
+        headers=user_token_headers,
+        params=params,
+    )
+    response = client.get(
+        f"{settings.API_V1_STR}/location/cache/stats",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert "location" in content
+    assert content["location"]["hits"] + content["location"]["misses"] > 0
+
+
+def test_analyze_locations_batch(
+    client: TestClient, user_token_headers: dict, db: Session
+) -> None:
+    data = {
+        "radius": 1.0,
+        "locations": [
+            {"latitude": 13.7563, "longitude": 100.5018},
+            {"latitude": 13.7469, "longitude": 100.5349},
+        ],
+    }
+    response = client.post(
+        f"{settings.API_V1_STR}/location/analyze/batch",
+        headers=user_token_headers,
+        json=data,
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert len(content["results"]) == 2
+    assert "location_score" in content["results"][0]
+    assert "accessibility" in content["results"][0]
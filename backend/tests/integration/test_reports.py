@@ -1,7 +1,10 @@
+import base64
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 
+from app import crud
 from app.core.config import settings
 from app.tests.utils.user import authentication_token_from_email
 from app.tests.utils.utils import random_lower_string
@@ -97,3 +100,138 @@ def test_get_reports_by_type(
     # Check if our report is in the list
     report_ids = [r["id"] for r in content]
     assert report["id"] in report_ids
+
+
+def test_get_reports_by_type_paginated(
+    client: TestClient, user_token_headers: dict, db: Session
+) -> None:
+    project = test_create_research_project(client, user_token_headers, db)
+    created = []
+    for _ in range(3):
+        response = client.post(
+            f"{settings.API_V1_STR}/reports/",
+            headers=user_token_headers,
+            json={
+                "name": f"Test Report {random_lower_string()}",
+                "type": "location_intelligence",
+                "format": "json",
+                "research_project_id": project["id"],
+            },
+        )
+        created.append(response.json()["id"])
+
+    url = f"{settings.API_V1_STR}/reports/by-type/location_intelligence"
+    params = {"research_project_id": project["id"], "limit": 2}
+    first = client.get(url, headers=user_token_headers, params=params)
+    assert first.status_code == 200
+    assert len(first.json()) == 2
+    cursor = first.headers["X-Next-Cursor"]
+
+    second = client.get(url, headers=user_token_headers, params={**params, "cursor": cursor})
+    assert second.status_code == 200
+    assert len(second.json()) == 1
+    assert "X-Next-Cursor" not in second.headers
+
+    pages = [r["id"] for r in first.json() + second.json()]
+    assert sorted(pages) == sorted(created)
+
+    response = client.get(url, headers=user_token_headers, params={"cursor": "%%%"})
+    assert response.status_code == 400
+    # A cursor must carry the row's timestamp as well as its id
+    id_only = base64.urlsafe_b64encode(created[0].encode()).decode().rstrip("=")
+    response = client.get(url, headers=user_token_headers, params={"cursor": id_only})
+    assert response.status_code == 400
+
+
+def test_download_report(
+    client: TestClient, user_token_headers: dict, db: Session
+) -> None:
+    report = test_create_report(client, user_token_headers, db)
+
+    response = client.get(
+        f"{settings.API_V1_STR}/reports/{report['id']}/download",
+        headers=user_token_headers,
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/json")
+    content = response.json()
+    assert content["report_type"] == "market_analysis"
+    assert content["research_project"]["id"] == report["research_project_id"]
+
+
+def test_identical_reports_share_an_artifact(
+    client: TestClient, user_token_headers: dict, db: Session
+) -> None:
+    report = test_create_report(client, user_token_headers, db)
+    data = {
+        "name": report["name"],
+        "type": report["type"],
+        "format": report["format"],
+        "research_project_id": report["research_project_id"],
+    }
+    same = client.post(
+        f"{settings.API_V1_STR}/reports/", headers=user_token_headers, json=data
+    ).json()
+    data["name"] = f"Another Report {random_lower_string()}"
+    renamed = client.post(
+        f"{settings.API_V1_STR}/reports/", headers=user_token_headers, json=data
+    ).json()
+
+    first, second, third = (crud.report.get(db=db, id=r["id"]) for r in (report, same, renamed))
+    for db_obj in (first, second, third):
+        db.refresh(db_obj)
+    assert first.file_path
+    assert first.file_path == second.file_path
+    # The report name is part of the rendered document
+    assert third.file_path != first.file_path
+
+
+def test_download_report_streams_before_generation(
+    client: TestClient, user_token_headers: dict, db: Session
+) -> None:
+    report = test_create_report(client, user_token_headers, db)
+    db_obj = crud.report.get(db=db, id=report["id"])
+    crud.report.update(db=db, db_obj=db_obj, obj_in={"file_path": None, "format": "csv"})
+
+    response = client.get(
+        f"{settings.API_V1_STR}/reports/{report['id']}/download",
+        headers=user_token_headers,
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.text.startswith("Metric,Value\n")
+
+
+def test_download_report_caching_and_ranges(
+    client: TestClient, user_token_headers: dict, db: Session
+) -> None:
+    report = test_create_report(client, user_token_headers, db)
+    url = f"{settings.API_V1_STR}/reports/{report['id']}/download"
+
+    response = client.get(url, headers={**user_token_headers, "Accept-Encoding": "identity"})
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+    etag = response.headers["etag"]
+    body = response.content
+
+    # Repeat downloads are answered without a body
+    response = client.get(
+        url, headers={**user_token_headers, "Accept-Encoding": "identity", "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+
+    response = client.get(url, headers={**user_token_headers, "Range": "bytes=10-19"})
+    assert response.status_code == 206
+    assert response.headers["content-range"] == f"bytes 10-19/{len(body)}"
+    assert response.content == body[10:20]
+
+    response = client.get(url, headers={**user_token_headers, "Range": f"bytes={len(body)}-"})
+    assert response.status_code == 416
+
+    # JSON reports have a precompressed variant with its own validator
+    response = client.get(url, headers={**user_token_headers, "Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] != etag
+    assert response.content == body
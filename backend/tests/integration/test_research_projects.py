@@ -1,10 +1,16 @@
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session
 
+from app import crud
 from app.core.config import settings
+from app.models.research_project import ProjectStatus
+from app.services.progress import ProgressReporter
+from app.services import research_processor
 from app.tests.utils.user import authentication_token_from_email
 from app.tests.utils.utils import random_lower_string
+from app.worker import process_research_project
 from tests.integration.test_restaurant_profiles import test_create_restaurant_profile
 
 
@@ -82,8 +88,11 @@ def test_update_research_project(
 
 
 def test_analyze_research_project(
-    client: TestClient, user_token_headers: dict, db: Session
+    client: TestClient, user_token_headers: dict, db: Session, monkeypatch
 ) -> None:
+    # Skip the simulated processing time
+    monkeypatch.setattr(research_processor.time, "sleep", lambda seconds: None)
+
     # First create a research project
     project = test_create_research_project(client, user_token_headers, db)
     
@@ -96,3 +105,147 @@ def test_analyze_research_project(
     assert content["id"] == project["id"]
     assert content["status"] == "in_progress"
     assert content["progress"] > 0
+
+    # Tasks run eagerly in tests, so the analysis has finished
+    response = client.get(
+        f"{settings.API_V1_STR}/research-projects/{project['id']}",
+        headers=user_token_headers,
+    )
+    assert response.json()["status"] == "completed"
+    assert response.json()["progress"] == 100
+    assert response.json()["results"]
+
+
+def test_analyze_research_project_already_in_progress(
+    client: TestClient, user_token_headers: dict, db: Session
+) -> None:
+    project = test_create_research_project(client, user_token_headers, db)
+    db_obj = crud.research_project.get(db=db, id=project["id"])
+    crud.research_project.update_status(
+        db=db, db_obj=db_obj, status=ProjectStatus.IN_PROGRESS, progress=10
+    )
+
+    response = client.post(
+        f"{settings.API_V1_STR}/research-projects/{project['id']}/analyze",
+        headers=user_token_headers,
+    )
+    assert response.status_code == 409
+
+
+def test_analyze_research_project_broker_down(
+    client: TestClient, user_token_headers: dict, db: Session, monkeypatch
+) -> None:
+    project = test_create_research_project(client, user_token_headers, db)
+
+    def broker_down(**kwargs):
+        raise ConnectionError("broker unreachable")
+
+    monkeypatch.setattr(process_research_project, "delay", broker_down)
+    with pytest.raises(ConnectionError):
+        client.post(
+            f"{settings.API_V1_STR}/research-projects/{project['id']}/analyze",
+            headers=user_token_headers,
+        )
+
+    db_obj = crud.research_project.get(db=db, id=project["id"])
+    db.refresh(db_obj)
+    assert db_obj.progress == -1
+
+    # The failed project can be analyzed again once the broker is back
+    monkeypatch.undo()
+    monkeypatch.setattr(research_processor.time, "sleep", lambda seconds: None)
+    response = client.post(
+        f"{settings.API_V1_STR}/research-projects/{project['id']}/analyze",
+        headers=user_token_headers,
+    )
+    assert response.status_code == 200
+
+
+def test_read_research_projects_leaves_out_results(
+    client: TestClient, user_token_headers: dict, db: Session
+) -> None:
+    project = test_create_research_project(client, user_token_headers, db)
+    db_obj = crud.research_project.get(db=db, id=project["id"])
+    crud.research_project.update(db=db, db_obj=db_obj, obj_in={"results": {"market_sizing": {"tam": 1}}})
+
+    url = f"{settings.API_V1_STR}/research-projects/"
+    response = client.get(url, headers=user_token_headers)
+    assert response.status_code == 200
+    listed = {p["id"]: p for p in response.json()}
+    assert listed[project["id"]]["name"] == project["name"]
+    assert "results" not in listed[project["id"]]
+
+    response = client.get(url, headers=user_token_headers, params={"include": "results"})
+    listed = {p["id"]: p for p in response.json()}
+    assert listed[project["id"]]["results"] == {"market_sizing": {"tam": 1}}
+
+    response = client.get(url, headers=user_token_headers, params={"include": "owner"})
+    assert response.status_code == 400
+
+
+def test_read_research_project_live_progress(
+    client: TestClient, user_token_headers: dict, db: Session
+) -> None:
+    project = test_create_research_project(client, user_token_headers, db)
+    db_obj = crud.research_project.get(db=db, id=project["id"])
+    crud.research_project.update_status(
+        db=db, db_obj=db_obj, status=ProjectStatus.IN_PROGRESS, progress=10
+    )
+    ProgressReporter(project["id"]).stage_completed("market_sizing", progress=55)
+
+    response = client.get(
+        f"{settings.API_V1_STR}/research-projects/{project['id']}",
+        headers=user_token_headers,
+    )
+    assert response.status_code == 200
+    assert response.json()["progress"] == 55
+    # The row itself is not rewritten by progress updates
+    db.refresh(db_obj)
+    assert db_obj.progress == 10
+
+
+def test_research_project_events(
+    client: TestClient, user_token_headers: dict, db: Session, monkeypatch
+) -> None:
+    monkeypatch.setattr(research_processor.time, "sleep", lambda seconds: None)
+    project = test_create_research_project(client, user_token_headers, db)
+    client.post(
+        f"{settings.API_V1_STR}/research-projects/{project['id']}/analyze",
+        headers=user_token_headers,
+    )
+
+    # A finished analysis sends its final state and closes the stream
+    response = client.get(
+        f"{settings.API_V1_STR}/research-projects/{project['id']}/events",
+        headers=user_token_headers,
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text.startswith("event: snapshot\n")
+    assert '"status": "completed"' in response.text
+
+
+def test_analysis_fails_when_retries_run_out(
+    client: TestClient, user_token_headers: dict, db: Session, monkeypatch
+) -> None:
+    project = test_create_research_project(client, user_token_headers, db)
+
+    def lost_connection(**kwargs):
+        raise OperationalError("SELECT 1", {}, Exception("connection lost"))
+
+    monkeypatch.setattr(research_processor, "process_research_project", lost_connection)
+    with pytest.raises(OperationalError):
+        process_research_project.apply(
+            kwargs={"research_project_id": project["id"], "user_id": project["owner_id"]},
+            retries=process_research_project.max_retries,
+        )
+
+    db_obj = crud.research_project.get(db=db, id=project["id"])
+    db.refresh(db_obj)
+    assert db_obj.progress == -1
+    # Listeners get the failure instead of waiting forever
+    response = client.get(
+        f"{settings.API_V1_STR}/research-projects/{project['id']}/events",
+        headers=user_token_headers,
+    )
+    assert '"progress": -1' in response.text
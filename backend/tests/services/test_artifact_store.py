@@ -0,0 +1,86 @@
+import io
+
+from app.services import artifact_store, report_generator
+from app.services.artifact_store import LocalArtifactStore, S3ArtifactStore, artifact_key
+from app.models.report import ReportFormat
+
+DOCUMENT = {
+    "report_name": "Market Analysis Report",
+    "report_type": "market_analysis",
+    "results_as_of": None,
+    "research_project": {"id": "project-1", "name": "Project", "status": "completed"},
+    "data": {"total_market_size": 1000000},
+}
+
+
+class FakeS3Client:
+    """In-memory stand-in for a boto3 S3 client (MinIO-style)"""
+
+    class NotFound(Exception):
+        response = {"Error": {"Code": "404"}}
+
+    def __init__(self):
+        self.objects = {}
+
+    def head_object(self, Bucket, Key):
+        if (Bucket, Key) not in self.objects:
+            raise self.NotFound()
+        return {"ContentLength": len(self.objects[(Bucket, Key)])}
+
+    def upload_file(self, Filename, Bucket, Key):
+        with open(Filename, "rb") as f:
+            self.objects[(Bucket, Key)] = f.read()
+
+    def get_object(self, Bucket, Key, Range=None):
+        data = self.objects[(Bucket, Key)]
+        if Range:
+            start, end = Range[len("bytes="):].split("-")
+            data = data[int(start):int(end) + 1 if end else None]
+        return {"Body": io.BytesIO(data)}
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop((Bucket, Key), None)
+
+
+def test_artifact_key_is_content_addressed() -> None:
+    changed = dict(DOCUMENT, data={"total_market_size": 2000000})
+
+    assert artifact_key(DOCUMENT, "json") == artifact_key(dict(DOCUMENT), "json")
+    assert artifact_key(DOCUMENT, "json") != artifact_key(DOCUMENT, "csv")
+    assert artifact_key(DOCUMENT, "json") != artifact_key(changed, "json")
+    assert artifact_key(DOCUMENT, "pdf").endswith(".pdf")
+
+
+def test_stores_round_trip(tmp_path) -> None:
+    source = tmp_path / "source.bin"
+    source.write_bytes(b"0123456789" * 10000)
+
+    for store in (LocalArtifactStore(str(tmp_path / "artifacts")), S3ArtifactStore("reports", client=FakeS3Client())):
+        assert not store.exists("abc.pdf")
+        store.put_file("abc.pdf", str(source))
+        assert store.exists("abc.pdf")
+        assert store.size("abc.pdf") == 100000
+        assert b"".join(store.iter_bytes("abc.pdf")) == source.read_bytes()
+        assert b"".join(store.iter_bytes("abc.pdf", start=5, end=14)) == b"5678901234"
+        store.delete("abc.pdf")
+        assert not store.exists("abc.pdf")
+
+
+def test_identical_reports_are_rendered_once(tmp_path, monkeypatch) -> None:
+    store = S3ArtifactStore("reports", client=FakeS3Client())
+    monkeypatch.setattr(artifact_store, "_store", store)
+    renders = []
+    original = report_generator._generate_csv_report
+
+    def counting_render(document, file_path):
+        renders.append(file_path)
+        original(document, file_path)
+
+    monkeypatch.setattr(report_generator, "_generate_csv_report", counting_render)
+
+    first = report_generator.store_report_artifact(ReportFormat.CSV, DOCUMENT)
+    second = report_generator.store_report_artifact(ReportFormat.CSV, dict(DOCUMENT))
+
+    assert first == second
+    assert len(renders) == 1
+    assert b"".join(store.iter_bytes(first)).startswith(b"Metric,Value\n")
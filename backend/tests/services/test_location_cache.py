@@ -0,0 +1,48 @@
+import time
+
+from app.core.cache import TTLCache
+from app.services import location_cache
+
+
+def test_ttl_cache_evicts_least_recently_used() -> None:
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 3
+    assert stats["misses"] == 1
+
+
+def test_ttl_cache_expires_entries() -> None:
+    cache = TTLCache(maxsize=10, ttl=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_jittered_requests_share_cached_response() -> None:
+    location_cache._location_cache().clear()
+    calls = []
+
+    def compute(latitude: float, longitude: float, radius: float) -> dict:
+        calls.append((latitude, longitude, radius))
+        return {"calls": len(calls)}
+
+    first = location_cache.cached_location_call("test", compute, 13.75631, 100.50181, 1.0)
+    # A few meters away and a slightly different radius
+    second = location_cache.cached_location_call("test", compute, 13.75634, 100.50183, 1.05)
+    other = location_cache.cached_location_call("test", compute, 13.80, 100.50181, 1.0)
+
+    assert first == second == {"calls": 1}
+    assert other == {"calls": 2}
+    assert len(calls) == 2
+    # Responses are computed for the tile center, not the raw request coordinate
+    assert calls[0] == location_cache.quantize_location(13.75631, 100.50181, 1.0)
@@ -0,0 +1,125 @@
+import threading
+import time
+
+from app.services import location_intelligence
+
+
+def test_place_details_batch_is_concurrent_and_cached(monkeypatch) -> None:
+    calls = []
+    lock = threading.Lock()
+
+    def fake_get_place_details(place_id: str) -> dict:
+        with lock:
+            calls.append(place_id)
+        time.sleep(0.05)
+        return {"status": "OK", "result": {"reviews": []}}
+
+    monkeypatch.setattr(location_intelligence, "_get_place_details", fake_get_place_details)
+    location_intelligence._place_details_cache.clear()
+
+    place_ids = [f"place-{i}" for i in range(8)]
+    start = time.monotonic()
+    details = location_intelligence._get_place_details_batch(place_ids + place_ids[:2])
+    elapsed = time.monotonic() - start
+
+    assert set(details) == set(place_ids)
+    assert sorted(calls) == sorted(place_ids)
+    # 8 lookups of 50ms each must not run one after another
+    assert elapsed < 0.05 * len(place_ids)
+
+    calls.clear()
+    details = location_intelligence._get_place_details_batch(place_ids)
+    assert set(details) == set(place_ids)
+    assert calls == []
+
+
+def test_place_details_batch_skips_failures(monkeypatch) -> None:
+    def fake_get_place_details(place_id: str) -> dict:
+        if place_id == "bad":
+            raise ValueError("boom")
+        return {"status": "OK", "result": {}}
+
+    monkeypatch.setattr(location_intelligence, "_get_place_details", fake_get_place_details)
+    location_intelligence._place_details_cache.clear()
+
+    details = location_intelligence._get_place_details_batch(["good", "bad"])
+    assert list(details) == ["good"]
+
+
+def test_score_locations_matches_single_site_scoring(monkeypatch) -> None:
+    import random
+
+    from app.services.place_index import PlaceIndex
+
+    rng = random.Random(7)
+    types = [["restaurant"], ["store"], ["bus_station"], ["parking"], ["shopping_mall"]]
+    index = PlaceIndex()
+    index.bulk_load(
+        {
+            "place_id": str(i),
+            "name": f"Place {i}",
+            "types": rng.choice(types),
+            "rating": rng.uniform(3, 5),
+            "user_ratings_total": rng.randint(0, 500),
+            "geometry": {"location": {"lat": 13.70 + rng.random() * 0.1, "lng": 100.45 + rng.random() * 0.1}},
+        }
+        for i in range(3000)
+    )
+    monkeypatch.setattr(location_intelligence, "get_place_index", lambda: index)
+
+    sites = [(13.72 + rng.random() * 0.06, 100.47 + rng.random() * 0.06) for _ in range(25)]
+    sites.append((14.5, 101.5))  # no places nearby
+    results = location_intelligence.score_locations(sites, 0.5)
+
+    assert len(results) == len(sites)
+    for (latitude, longitude), result in zip(sites, results):
+        places = [place for place, _ in index.query_radius(latitude, longitude, 0.5)]
+        assert result["nearby_places_count"] == len(places)
+        assert result["location_score"] == location_intelligence._calculate_location_score(places)
+        assert result["visibility"] == location_intelligence._calculate_visibility(places)
+        assert result["accessibility"]["walking"] == location_intelligence._calculate_accessibility(places)["walking"]
+
+
+def _google_place(place_id: str, name: str, types: list) -> dict:
+    location = {"lat": 13.7, "lng": 100.5}
+    return {"place_id": place_id, "name": name, "types": types, "geometry": {"location": location}}
+
+
+def _fake_google(monkeypatch, results: list):
+    from app.core.config import settings
+    from app.services.place_index import PlaceIndex
+
+    class Response:
+        def json(self):
+            return {"status": "OK", "results": results}
+
+    index = PlaceIndex()
+    monkeypatch.setattr(settings, "GOOGLE_PLACES_API_KEY", "key")
+    monkeypatch.setattr(location_intelligence, "get_place_index", lambda: index)
+    monkeypatch.setattr(location_intelligence._http_session, "get", lambda *args, **kwargs: Response())
+    monkeypatch.setattr(location_intelligence, "_get_place_details_batch", lambda place_ids: {})
+    return index
+
+
+def test_google_competitors_keep_keyword_matches(monkeypatch) -> None:
+    results = [
+        _google_place("a", "Baan Somtum", ["restaurant", "food"]),
+        _google_place("b", "Thai Spa", ["spa"]),
+    ]
+    _fake_google(monkeypatch, results)
+
+    data = location_intelligence._get_google_places_competitors(13.7, 100.5, 1, cuisine_type="Thai")
+
+    assert [competitor["name"] for competitor in data["competitors"]] == ["Baan Somtum"]
+
+
+def test_google_results_are_not_kept_between_searches(monkeypatch) -> None:
+    results = [_google_place("a", "Old Burger Bar", ["restaurant", "food"])]
+    index = _fake_google(monkeypatch, results)
+    location_intelligence._get_google_places_data(13.7, 100.5, 1)
+    location_intelligence._get_google_places_competitors(13.7, 100.5, 1)
+    assert len(index) == 0
+
+    results[:] = [_google_place("b", "Baan Somtum", ["restaurant", "food"])]
+    data = location_intelligence._get_google_places_data(13.7, 100.5, 1)
+    assert [place["name"] for place in data["nearby_places"]] == ["Baan Somtum"]
@@ -0,0 +1,65 @@
+import random
+
+from app.services.place_index import PlaceIndex, haversine_km
+
+
+def _place(place_id: str, lat: float, lng: float, types=None) -> dict:
+    return {
+        "place_id": place_id,
+        "name": f"Place {place_id}",
+        "types": types or ["restaurant"],
+        "geometry": {"location": {"lat": lat, "lng": lng}},
+    }
+
+
+def test_query_radius_matches_brute_force() -> None:
+    rng = random.Random(42)
+    places = [
+        _place(str(i), 13.70 + rng.random() * 0.15, 100.45 + rng.random() * 0.15)
+        for i in range(5000)
+    ]
+    index = PlaceIndex()
+    index.bulk_load(places)
+
+    latitude, longitude, radius = 13.7563, 100.5018, 1.5
+    result = index.query_radius(latitude, longitude, radius)
+
+    expected = {
+        p["place_id"] for p in places
+        if haversine_km(
+            latitude, longitude,
+            p["geometry"]["location"]["lat"], p["geometry"]["location"]["lng"]
+        ) <= radius
+    }
+    assert {p["place_id"] for p, _ in result} == expected
+    distances = [d for _, d in result]
+    assert distances == sorted(distances)
+
+
+def test_add_replaces_existing_place() -> None:
+    index = PlaceIndex()
+    index.add(_place("a", 13.7563, 100.5018))
+    index.add(_place("a", 13.80, 100.60))
+
+    assert len(index) == 1
+    assert index.query_radius(13.7563, 100.5018, 0.5) == []
+    assert len(index.query_radius(13.80, 100.60, 0.5)) == 1
+
+
+def test_covers_only_bulk_loaded_area() -> None:
+    index = PlaceIndex()
+    index.add(_place("api", 13.7563, 100.5018))
+    assert not index.covers(13.7563, 100.5018, 1.0)
+
+    rng = random.Random(3)
+    index.bulk_load(_place(str(i), 13.70 + rng.random() * 0.1, 100.45 + rng.random() * 0.1) for i in range(2000))
+    assert index.covers(13.75, 100.50, 1.0)
+    assert not index.covers(13.71, 100.46, 5.0)
+
+
+def test_covers_skips_gaps_between_loaded_areas() -> None:
+    index = PlaceIndex()
+    index.bulk_load([_place("sw", 13.60, 100.40), _place("ne", 13.90, 100.70)])
+
+    assert index.covers(13.605, 100.405, 0.1)
+    assert not index.covers(13.7563, 100.5018, 1.0)
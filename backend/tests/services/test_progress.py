@@ -0,0 +1,88 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.core.config import Settings
+from app.services import progress
+from app.services.progress import MemoryProgressBroker, ProgressReporter
+
+
+class RecordingBroker(MemoryProgressBroker):
+    def __init__(self):
+        super().__init__()
+        self.events = []
+
+    def publish(self, project_id, state, event):
+        super().publish(project_id, state, event)
+        self.events.append(event)
+
+
+def test_progress_updates_are_coalesced() -> None:
+    broker = RecordingBroker()
+    reporter = ProgressReporter("project-1", broker=broker, min_interval=60)
+
+    reporter.update(20)
+    reporter.update(30)
+    reporter.update(40)
+    assert [event["type"] for event in broker.events] == ["progress"]
+    assert broker.get_state("project-1")["progress"] == 20
+
+    # Stage and completion events are never dropped
+    reporter.stage_completed("market_sizing", progress=55)
+    reporter.completed()
+    assert [event["type"] for event in broker.events] == ["progress", "stage_completed", "completed"]
+    assert broker.events[1]["stage"] == "market_sizing"
+    assert broker.get_state("project-1") == {
+        "status": "completed",
+        "progress": 100,
+        "stages_completed": ["market_sizing"],
+    }
+
+
+def test_failed_run_is_published() -> None:
+    broker = RecordingBroker()
+    ProgressReporter("project-2", broker=broker).failed("boom")
+
+    assert broker.events[-1]["type"] == "failed"
+    assert broker.events[-1]["error"] == "boom"
+    assert broker.get_state("project-2")["progress"] == -1
+
+
+def test_progress_events_relay_published_events(monkeypatch) -> None:
+    broker = MemoryProgressBroker()
+    monkeypatch.setattr(progress, "_broker", broker)
+
+    async def not_disconnected() -> bool:
+        return False
+
+    async def collect():
+        events = []
+        async for event in progress.progress_events(
+            "project-3", {"status": "in_progress", "progress": 10}, not_disconnected
+        ):
+            events.append(event)
+            if len(events) == 1:
+                # Publish from another thread, as the stage graph does
+                reporter = ProgressReporter("project-3", broker=broker)
+                threading.Thread(target=lambda: (
+                    reporter.stage_completed("location", progress=55), reporter.completed()
+                )).start()
+        return events
+
+    events = asyncio.run(collect())
+    assert [event.split("\n")[0] for event in events] == [
+        "event: snapshot",
+        "event: stage_completed",
+        "event: completed",
+    ]
+    assert '"progress": 10' in events[0]
+    assert '"stage": "location"' in events[1]
+
+
+def test_progress_backend_follows_celery_mode() -> None:
+    assert Settings(CELERY_TASK_ALWAYS_EAGER=True, PROGRESS_BACKEND=None).PROGRESS_BACKEND == "memory"
+    assert Settings(CELERY_TASK_ALWAYS_EAGER=False, PROGRESS_BACKEND=None).PROGRESS_BACKEND == "redis"
+    # Out-of-process workers could never reach an in-memory broker
+    with pytest.raises(ValueError):
+        Settings(CELERY_TASK_ALWAYS_EAGER=False, PROGRESS_BACKEND="memory")
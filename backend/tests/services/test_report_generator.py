@@ -0,0 +1,60 @@
+import csv
+import io
+import json
+from types import SimpleNamespace
+
+from app.models.report import ReportFormat, ReportType
+from app.models.research_project import ProjectStatus
+from app.services.report_generator import build_report_document, iter_csv_report, iter_json_report
+
+
+def _document(report_type: ReportType = ReportType.COMPETITIVE_ANALYSIS) -> dict:
+    competitors = [
+        {"name": f"Competitor {i}", "rating": 4.0, "price_level": 2} for i in range(2000)
+    ]
+    report = SimpleNamespace(
+        id="report-1", name="Competitors Report", type=report_type, format=ReportFormat.JSON
+    )
+    research_project = SimpleNamespace(
+        id="project-1",
+        name="Project",
+        status=ProjectStatus.COMPLETED,
+        completed_at=None,
+        updated_at=None,
+        created_at=None,
+        results={
+            "competitors": {"total_competitors": 2000, "competitors": competitors},
+            "market_sizing": {"total_market_size": 1000000},
+        },
+    )
+    return build_report_document(report, research_project)
+
+
+def test_json_report_is_streamed_in_chunks() -> None:
+    document = _document()
+    chunks = list(iter_json_report(document, chunk_size=4096))
+
+    assert len(chunks) > 1
+    assert all(len(chunk) < 2 * 4096 for chunk in chunks)
+    parsed = json.loads("".join(chunks))
+    assert parsed["data"]["total_competitors"] == 2000
+    assert "market_sizing" not in parsed["data"]
+
+
+def test_csv_report_flattens_report_data() -> None:
+    chunks = list(iter_csv_report(_document(), chunk_size=4096))
+
+    assert len(chunks) > 1
+    rows = list(csv.reader(io.StringIO("".join(chunks))))
+    assert rows[0] == ["Metric", "Value"]
+    assert ["total_competitors", "2000"] in rows
+    assert ["competitors[1999].name", "Competitor 1999"] in rows
+
+
+def test_custom_report_covers_all_results() -> None:
+    document = _document(ReportType.CUSTOM)
+    assert set(document["data"]) == {"competitors", "market_sizing"}
+
+
+def test_document_keeps_the_report_name() -> None:
+    assert _document()["report_name"] == "Competitors Report"
@@ -0,0 +1,75 @@
+from openpyxl import load_workbook
+
+from app.core.config import settings
+from app.services import report_rendering
+from app.services.report_rendering import RenderStats, render_report, split_tables
+
+
+def _document() -> dict:
+    return {
+        "report_name": "Competitive Analysis Report",
+        "report_type": "competitive_analysis",
+        "results_as_of": "2024-01-01T00:00:00",
+        "research_project": {"id": "project-1", "name": "Project", "status": "completed"},
+        "data": {
+            "total_competitors": 300,
+            "market_saturation": 55.5,
+            "competitors": [
+                {"name": f"Competitor {i}", "rating": 4.2, "price_level": 2} for i in range(300)
+            ],
+            "competitive_advantage_opportunities": ["Unique menu offerings", "Better service"],
+        },
+    }
+
+
+def test_split_tables() -> None:
+    metrics, tables = split_tables(_document()["data"])
+
+    assert ("total_competitors", 300) in metrics
+    assert ("competitive_advantage_opportunities[1]", "Better service") in metrics
+    assert len(tables) == 1
+    name, headers, rows = tables[0]
+    assert (name, headers) == ("competitors", ["name", "rating", "price_level"])
+    assert rows[299] == ["Competitor 299", 4.2, 2]
+
+
+def test_render_excel_and_pdf(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "REPORT_RENDER_WORKERS", 0)
+    monkeypatch.setattr(report_rendering, "render_stats", RenderStats())
+
+    xlsx_path = str(tmp_path / "report.xlsx")
+    assert render_report("excel", _document(), xlsx_path) > 0
+    workbook = load_workbook(xlsx_path, read_only=True)
+    assert workbook.sheetnames == ["Summary", "competitors"]
+    rows = list(workbook["competitors"].iter_rows(values_only=True))
+    assert rows[0] == ("name", "rating", "price_level")
+    assert len(rows) == 301
+
+    pdf_path = str(tmp_path / "report.pdf")
+    render_report("pdf", _document(), pdf_path)
+    with open(pdf_path, "rb") as f:
+        assert f.read(5) == b"%PDF-"
+
+    stats = report_rendering.get_render_stats()
+    assert stats["excel"]["rendered"] == 1
+    assert stats["pdf"]["rendered"] == 1
+    assert stats["pdf"]["reports_per_second"] > 0
+
+
+def test_render_pdf_escapes_markup(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "REPORT_RENDER_WORKERS", 0)
+    document = _document()
+    document["report_name"] = "Sales <Q1> & more"
+    document["research_project"]["name"] = "a<b"
+    document["data"]["<odd> & list"] = [{"name": "<b>"}]
+
+    pdf_path = str(tmp_path / "report.pdf")
+    assert render_report("pdf", document, pdf_path) > 0
+
+
+def test_render_in_process_pool(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "REPORT_RENDER_WORKERS", 1)
+    path = str(tmp_path / "report.xlsx")
+
+    assert render_report("excel", _document(), path) > 0
+    assert load_workbook(path, read_only=True).sheetnames == ["Summary", "competitors"]
@@ -0,0 +1,60 @@
+import threading
+import time
+
+import pytest
+
+from app.services.stage_graph import Stage, StageGraph
+
+
+def test_independent_stages_run_concurrently() -> None:
+    def slow(value):
+        def run(inputs):
+            time.sleep(0.2)
+            return value
+        return run
+
+    graph = StageGraph([Stage(name, slow(name)) for name in ("a", "b", "c", "d")])
+    started = time.perf_counter()
+    results = graph.run()
+    elapsed = time.perf_counter() - started
+
+    assert results == {"a": "a", "b": "b", "c": "c", "d": "d"}
+    assert elapsed < 0.6
+
+
+def test_dependencies_receive_results_in_order() -> None:
+    completed = []
+    caller = threading.get_ident()
+    callback_threads = set()
+
+    def on_complete(name, result):
+        callback_threads.add(threading.get_ident())
+        completed.append(name)
+
+    graph = StageGraph([
+        Stage("total", lambda inputs: inputs["a"] + inputs["b"], depends_on=["a", "b"]),
+        Stage("a", lambda inputs: 1),
+        Stage("b", lambda inputs: 2),
+    ])
+    results = graph.run(on_complete=on_complete)
+
+    assert results["total"] == 3
+    assert completed[-1] == "total"
+    assert callback_threads == {caller}
+
+
+def test_invalid_graphs_and_failures() -> None:
+    with pytest.raises(ValueError):
+        StageGraph([Stage("a", lambda inputs: 1, depends_on=["missing"])])
+    with pytest.raises(ValueError):
+        StageGraph([
+            Stage("a", lambda inputs: 1, depends_on=["b"]),
+            Stage("b", lambda inputs: 1, depends_on=["a"]),
+        ])
+
+    def fail(inputs):
+        raise RuntimeError("stage failed")
+
+    graph = StageGraph([Stage("a", fail), Stage("b", lambda inputs: 1, depends_on=["a"])])
+    with pytest.raises(RuntimeError):
+        graph.run()
@@ -7,6 +7,11 @@ It creates all necessary tables and populates them with initial data.
 
 Usage:
     python initialize_database.py
+    python initialize_database.py --bulk-users 100000 --workers 8
+
+With --bulk-users it also bulk loads synthetic users, restaurant profiles,
+research projects, reports and integrations through COPY FROM STDIN,
+for standing up staging databases.
 
 Requirements:
     - PostgreSQL server running
@@ -14,11 +19,18 @@ Requirements:
 """
 
 import os
+import io
 import sys
+import csv
+import time
 import uuid
+import random
 import logging
+import argparse
 import datetime
-from typing import Dict, List, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Any, Optional, Tuple
 import json
 
 # Try to import required packages, install if missing
@@ -550,8 +562,370 @@ def insert_sample_data(conn):
         logger.error(f"Error inserting sample data: {str(e)}")
         return False
 
+# Bulk loading
+#
+# Rows come from generators and are streamed to COPY FROM STDIN as CSV, so
+# nothing is materialized in memory. Tables are loaded level by level in
+# foreign key order; tables in the same level, and shards of each table,
+# are loaded in parallel on separate connections. Keys and indexes are
+# dropped before the load and built afterwards, which is much faster than
+# maintaining them row by row.
+
+BULK_PASSWORD = "bulkpassword"
+
+# Tables in foreign key order; tables in the same level don't reference each other
+BULK_LOAD_LEVELS = [
+    ["user"],
+    ["restaurantprofile", "integration"],
+    ["researchproject"],
+    ["report"],
+]
+BULK_LOAD_ORDER = [table for level in BULK_LOAD_LEVELS for table in level]
+BULK_EPOCH = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+
+BULK_COLUMNS = {
+    "user": [
+        "id", "email", "full_name", "hashed_password", "subscription_tier",
+        "is_active", "is_superuser", "created_at",
+    ],
+    "restaurantprofile": [
+        "id", "owner_id", "restaurant_name", "concept_description", "cuisine_type",
+        "target_audience", "price_range", "business_type", "is_local_brand", "city",
+        "district", "latitude", "longitude", "research_goals", "created_at",
+    ],
+    "integration": ["id", "owner_id", "name", "type", "status", "config", "created_at"],
+    "researchproject": [
+        "id", "owner_id", "restaurant_profile_id", "name", "status", "progress",
+        "competitive_analysis", "market_sizing", "demographic_analysis",
+        "location_intelligence", "created_at", "completed_at",
+    ],
+    "report": ["id", "owner_id", "research_project_id", "name", "type", "format", "data", "created_at"],
+}
+
+# Dropped before a bulk load and recreated afterwards, in this order
+BULK_CONSTRAINTS = [
+    ('"user"', "user_pkey", "PRIMARY KEY (id)"),
+    ('"user"', "user_email_key", "UNIQUE (email)"),
+    ("restaurantprofile", "restaurantprofile_pkey", "PRIMARY KEY (id)"),
+    ("integration", "integration_pkey", "PRIMARY KEY (id)"),
+    ("researchproject", "researchproject_pkey", "PRIMARY KEY (id)"),
+    ("report", "report_pkey", "PRIMARY KEY (id)"),
+    ("restaurantprofile", "restaurantprofile_owner_id_fkey", 'FOREIGN KEY (owner_id) REFERENCES "user"(id)'),
+    ("integration", "integration_owner_id_fkey", 'FOREIGN KEY (owner_id) REFERENCES "user"(id)'),
+    ("researchproject", "researchproject_owner_id_fkey", 'FOREIGN KEY (owner_id) REFERENCES "user"(id)'),
+    (
+        "researchproject", "researchproject_restaurant_profile_id_fkey",
+        "FOREIGN KEY (restaurant_profile_id) REFERENCES restaurantprofile(id)",
+    ),
+    ("report", "report_owner_id_fkey", 'FOREIGN KEY (owner_id) REFERENCES "user"(id)'),
+    (
+        "report", "report_research_project_id_fkey",
+        "FOREIGN KEY (research_project_id) REFERENCES researchproject(id)",
+    ),
+]
+
+# Listing indexes of the application models, built after a bulk load
+BULK_INDEXES = [
+    ("ix_report_owner_type_created", "report (owner_id, type, created_at, id)"),
+    ("ix_report_owner_created", "report (owner_id, created_at, id)"),
+    ("ix_report_project_created", "report (research_project_id, created_at, id)"),
+    ("ix_researchproject_owner_created", "researchproject (owner_id, created_at, id)"),
+    ("ix_restaurantprofile_owner_created", "restaurantprofile (owner_id, created_at, id)"),
+]
+
+BULK_CUISINES = ["Thai", "Japanese", "Italian", "Chinese", "Indian", "Korean", "Vietnamese", "Mexican"]
+BULK_DISTRICTS = ["Sukhumvit", "Silom", "Pathum Wan", "Thonglor", "Ari", "Sathorn", "Chatuchak", "Bang Rak"]
+BULK_REPORT_TYPES = ["market_analysis", "competitive_analysis", "location_intelligence", "demographic_analysis"]
+
+
+def enum_name(value: str) -> str:
+    """What the application stores for an enum value: SQLAlchemy's Enum columns hold member names"""
+    return value.upper()
+
+
+class BulkCounts:
+    """How many rows of each table a bulk load generates"""
+
+    def __init__(self, users: int, profiles_per_user: int, projects_per_profile: int, reports_per_project: int):
+        self.profiles_per_user = profiles_per_user
+        self.projects_per_profile = projects_per_profile
+        self.reports_per_project = reports_per_project
+        self.tables = {
+            "user": users,
+            "restaurantprofile": users * profiles_per_user,
+            "integration": users,
+            "researchproject": users * profiles_per_user * projects_per_profile,
+            "report": users * profiles_per_user * projects_per_profile * reports_per_project,
+        }
+
+
+def bulk_id(table: str, i: int) -> str:
+    """Deterministic UUID-shaped id of the i-th bulk row of a table, so children can reference parents"""
+    return f"{BULK_LOAD_ORDER.index(table) + 1:08x}-0000-4000-8000-{i:012x}"
+
+
+def bulk_created_at(rng: random.Random) -> str:
+    return (BULK_EPOCH + datetime.timedelta(seconds=rng.randrange(365 * 24 * 3600))).isoformat()
+
+
+def generate_users(counts: BulkCounts, shard: int, shards: int, password_hash: str) -> Iterator[Tuple]:
+    rng = random.Random(shard)
+    tiers = ["free", "basic", "pro", "franchise"]
+    for i in range(shard, counts.tables["user"], shards):
+        yield (
+            bulk_id("user", i), f"user{i}@bulk.example.com", f"Bulk User {i}", password_hash,
+            rng.choice(tiers), True, False, bulk_created_at(rng),
+        )
+
+
+def generate_restaurant_profiles(counts: BulkCounts, shard: int, shards: int) -> Iterator[Tuple]:
+    rng = random.Random(shard)
+    for i in range(shard, counts.tables["restaurantprofile"], shards):
+        cuisine = rng.choice(BULK_CUISINES)
+        yield (
+            bulk_id("restaurantprofile", i), bulk_id("user", i // counts.profiles_per_user),
+            f"{cuisine} Kitchen {i}", f"{cuisine} restaurant concept #{i}", cuisine,
+            "Young professionals", rng.choice(["$", "$$", "$$$"]), rng.choice(["new", "existing"]),
+            rng.random() < 0.7, "Bangkok", rng.choice(BULK_DISTRICTS),
+            round(13.70 + rng.random() * 0.12, 6), round(100.48 + rng.random() * 0.12, 6),
+            json.dumps(["market_analysis", "competitor_analysis"]), bulk_created_at(rng),
+        )
+
+
+def generate_integrations(counts: BulkCounts, shard: int, shards: int) -> Iterator[Tuple]:
+    rng = random.Random(shard)
+    for i in range(shard, counts.tables["integration"], shards):
+        yield (
+            bulk_id("integration", i), bulk_id("user", i), "Google Places API", enum_name("google_places"),
+            enum_name(rng.choice(["connected", "disconnected"])), json.dumps({"enabled": True}),
+            bulk_created_at(rng),
+        )
+
+
+def generate_research_projects(counts: BulkCounts, shard: int, shards: int) -> Iterator[Tuple]:
+    rng = random.Random(shard)
+    per_user = counts.profiles_per_user * counts.projects_per_profile
+    for i in range(shard, counts.tables["researchproject"], shards):
+        completed = rng.random() < 0.8
+        created_at = bulk_created_at(rng)
+        yield (
+            bulk_id("researchproject", i), bulk_id("user", i // per_user),
+            bulk_id("restaurantprofile", i // counts.projects_per_profile), f"Research Project {i}",
+            enum_name("completed" if completed else "pending"), 100 if completed else 0,
+            True, True, rng.random() < 0.5, rng.random() < 0.5,
+            created_at, created_at if completed else None,
+        )
+
+
+def generate_reports(counts: BulkCounts, shard: int, shards: int) -> Iterator[Tuple]:
+    rng = random.Random(shard)
+    per_user = counts.profiles_per_user * counts.projects_per_profile * counts.reports_per_project
+    for i in range(shard, counts.tables["report"], shards):
+        report_type = rng.choice(BULK_REPORT_TYPES)
+        yield (
+            bulk_id("report", i), bulk_id("user", i // per_user),
+            bulk_id("researchproject", i // counts.reports_per_project),
+            f"{report_type.replace('_', ' ').title()} Report", enum_name(report_type), enum_name("json"),
+            json.dumps({"summary": f"Synthetic {report_type} report", "score": round(rng.random() * 10, 1)}),
+            bulk_created_at(rng),
+        )
+
+
+class CopyStream:
+    """
+    Read-only file object serving rows from an iterator as CSV, for COPY FROM STDIN.
+
+    Rows are encoded in batches as the server asks for more data, so the
+    generator is consumed lazily. `None` becomes NULL.
+    """
+
+    def __init__(self, rows: Iterable[Tuple], batch_size: int = 1000):
+        self._rows = iter(rows)
+        self._batch_size = batch_size
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, lineterminator="\n")
+        self._pending = ""
+        self.rows = 0
+
+    def _fill(self, size: int) -> None:
+        while size < 0 or len(self._pending) < size:
+            batch = list(islice(self._rows, self._batch_size))
+            if not batch:
+                return
+            self._writer.writerows(batch)
+            self.rows += len(batch)
+            self._pending += self._buffer.getvalue()
+            self._buffer.seek(0)
+            self._buffer.truncate()
+
+    def read(self, size: int = -1) -> str:
+        self._fill(size)
+        if size < 0:
+            data, self._pending = self._pending, ""
+        else:
+            data, self._pending = self._pending[:size], self._pending[size:]
+        return data
+
+
+def copy_rows(table: str, rows: Iterable[Tuple]) -> int:
+    """COPY rows into a table on a connection of its own; returns the number of rows"""
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        # Losing the tail of a staging load on a crash is fine
+        cursor.execute("SET synchronous_commit = off")
+        stream = CopyStream(rows)
+        columns = ", ".join(BULK_COLUMNS[table])
+        cursor.copy_expert(
+            f'COPY "{table}" ({columns}) FROM STDIN WITH (FORMAT csv)', stream, size=1 << 20
+        )
+        conn.commit()
+        return stream.rows
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def drop_bulk_constraints(conn) -> None:
+    cursor = conn.cursor()
+    # Foreign keys first, as they depend on the primary keys
+    for table, name, _ in reversed(BULK_CONSTRAINTS):
+        cursor.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {name}")
+    for name, _ in BULK_INDEXES:
+        cursor.execute(f"DROP INDEX IF EXISTS {name}")
+    conn.commit()
+
+
+def build_bulk_constraints(conn) -> None:
+    cursor = conn.cursor()
+    for table, name, definition in BULK_CONSTRAINTS:
+        started = time.perf_counter()
+        cursor.execute(f"ALTER TABLE {table} ADD CONSTRAINT {name} {definition}")
+        logger.info(f"Built {name} in {time.perf_counter() - started:.1f}s")
+    for name, definition in BULK_INDEXES:
+        started = time.perf_counter()
+        cursor.execute(f"CREATE INDEX {name} ON {definition}")
+        logger.info(f"Built {name} in {time.perf_counter() - started:.1f}s")
+    cursor.execute("ANALYZE")
+    conn.commit()
+
+
+def find_bulk_rows(conn) -> Optional[str]:
+    """Describe rows left by an earlier bulk load, whose ids or emails a new load would duplicate"""
+    cursor = conn.cursor()
+    for table in BULK_LOAD_ORDER:
+        # A range over the primary key, so this is an index lookup even on huge tables
+        cursor.execute(
+            f'SELECT 1 FROM "{table}" WHERE id BETWEEN %s AND %s LIMIT 1',
+            (bulk_id(table, 0), bulk_id(table, 16 ** 12 - 1)),
+        )
+        if cursor.fetchone():
+            return f"{table} already holds bulk-loaded rows"
+    cursor.execute("""SELECT 1 FROM "user" WHERE email LIKE '%@bulk.example.com' LIMIT 1""")
+    if cursor.fetchone():
+        return "user already holds bulk-loaded emails"
+    return None
+
+
+def rebuild_bulk_constraints(conn) -> bool:
+    try:
+        started = time.perf_counter()
+        build_bulk_constraints(conn)
+        logger.info(f"Built keys and indexes in {time.perf_counter() - started:.1f}s")
+        return True
+    except Exception as e:
+        conn.rollback()
+        logger.error(
+            f"Error rebuilding keys and indexes: {str(e)}. The tables are left without primary keys, "
+            "foreign keys and the unique email constraint; rerun with --truncate to reload them, "
+            "or remove the offending rows and rerun to rebuild the keys"
+        )
+        return False
+
+
+def bulk_load(conn, counts: BulkCounts, workers: int = 4, truncate: bool = False) -> bool:
+    """
+    Bulk load synthetic rows into every table with COPY.
+
+    Without `truncate` the tables must not hold rows of an earlier bulk
+    load, as their ids would clash when the primary keys are rebuilt; this
+    is checked before anything is dropped. Keys and indexes are rebuilt
+    even if the load fails.
+    """
+    try:
+        if truncate:
+            cursor = conn.cursor()
+            cursor.execute('TRUNCATE "user", restaurantprofile, integration, researchproject, report')
+            conn.commit()
+        else:
+            clash = find_bulk_rows(conn)
+            if clash:
+                logger.error(f"Not bulk loading: {clash}. Rerun with --truncate to replace them")
+                return False
+        drop_bulk_constraints(conn)
+    except Exception as e:
+        conn.rollback()
+        logger.error(f"Error preparing bulk load: {str(e)}")
+        return False
+
+    loaded = False
+    try:
+        password_hash = get_password_hash(BULK_PASSWORD)
+        generators: Dict[str, Callable[[int, int], Iterator[Tuple]]] = {
+            "user": lambda shard, shards: generate_users(counts, shard, shards, password_hash),
+            "restaurantprofile": lambda shard, shards: generate_restaurant_profiles(counts, shard, shards),
+            "integration": lambda shard, shards: generate_integrations(counts, shard, shards),
+            "researchproject": lambda shard, shards: generate_research_projects(counts, shard, shards),
+            "report": lambda shard, shards: generate_reports(counts, shard, shards),
+        }
+
+        load_started = time.perf_counter()
+        total = 0
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for level in BULK_LOAD_LEVELS:
+                # Split the level's workers between its tables, in proportion to their size
+                level_rows = sum(counts.tables[table] for table in level) or 1
+                futures = {}
+                started = time.perf_counter()
+                for table in level:
+                    shards = max(1, round(workers * counts.tables[table] / level_rows))
+                    futures[table] = [
+                        executor.submit(copy_rows, table, generators[table](shard, shards))
+                        for shard in range(shards)
+                    ]
+                for table, table_futures in futures.items():
+                    rows = sum(future.result() for future in table_futures)
+                    elapsed = time.perf_counter() - started
+                    total += rows
+                    logger.info(
+                        f"Loaded {rows} rows into {table} in {elapsed:.1f}s "
+                        f"({rows / elapsed if elapsed else 0:.0f} rows/s, {len(table_futures)} connections)"
+                    )
+        elapsed = time.perf_counter() - load_started
+        logger.info(f"Loaded {total} rows in {elapsed:.1f}s ({total / elapsed if elapsed else 0:.0f} rows/s)")
+        loaded = True
+    except Exception as e:
+        conn.rollback()
+        logger.error(f"Error bulk loading data: {str(e)}")
+    finally:
+        # Never leave the tables without their keys, even if the load failed
+        rebuilt = rebuild_bulk_constraints(conn)
+    return loaded and rebuilt
+
+
 def main():
     """Main function to initialize the database."""
+    parser = argparse.ArgumentParser(description="Initialize the BiteBase database")
+    parser.add_argument("--bulk-users", type=int, default=0, help="bulk load this many synthetic users")
+    parser.add_argument("--profiles-per-user", type=int, default=2)
+    parser.add_argument("--projects-per-profile", type=int, default=3)
+    parser.add_argument("--reports-per-project", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4, help="parallel COPY connections")
+    parser.add_argument("--truncate", action="store_true", help="empty all tables before bulk loading")
+    args = parser.parse_args()
+
     logger.info("Starting database initialization")
     
     # Create database if it doesn't exist
@@ -568,6 +942,17 @@ def main():
         conn.close()
         sys.exit(1)
     
+    # Bulk load synthetic data; this rebuilds keys, so it goes before the
+    # regular inserts, which rely on them
+    if args.bulk_users:
+        counts = BulkCounts(
+            args.bulk_users, args.profiles_per_user, args.projects_per_profile, args.reports_per_project
+        )
+        if not bulk_load(conn, counts, workers=args.workers, truncate=args.truncate):
+            logger.error("Failed to bulk load data. Exiting.")
+            conn.close()
+            sys.exit(1)
+    
     # Insert initial users
     if not insert_initial_users(conn):
         logger.error("Failed to insert initial users. Exiting.")